@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark des contraintes d'effectif commun: cliques AtMostOne contre contraintes par paire.
+
+Construit et résout le même modèle avec les deux encodages de _add_shared_roster_constraints:
+- cliques: une contrainte AtMostOne par clique maximale et par date (encodage actuel);
+- paires: sum(e1) + sum(e2) <= 1 par paire et par date (encodage d'origine, reproduit ici).
+Affiche le nombre de contraintes d'effectif commun, la taille du modèle, le temps de
+construction et le résultat CP-SAT de chaque encodage.
+
+Sans --snapshot, deux ligues synthétiques m/f/mo de 130 équipes (voir synthetic_league.py):
+la ligue par défaut et une ligue où les effectifs communs sont 4 fois plus fréquents.
+
+Usage:
+    python benchmark_cliques.py --snapshot=snapshot_m_f_mo.json.gz --time=120   # Données m/f/mo
+    python benchmark_cliques.py --time=60                                       # Ligues synthétiques
+"""
+
+import sys
+import time
+import types
+
+from ortools.sat.python import cp_model
+
+from data_sources import SnapshotSource
+from run_logging import quiet
+from run_report import start_report
+from solve_callbacks import ObjectiveStopCallback
+from solver_profiles import parse_solver_args
+from synthetic_league import LeagueSpec, synthetic_scheduler
+from ufolep_mysql_final import UfolepMySQLScheduler
+
+
+def add_pairwise_shared_roster_constraints(self, model: cp_model.CpModel, index) -> None:
+    """Encodage d'origine: une contrainte par paire à effectif commun et par date."""
+    candidates = index.candidates
+    team_index = {team.id: i for i, team in enumerate(candidates.teams)}
+    for e1_id, e2_id, _, _ in self.db_loader.get_equipes_avec_effectif_commun():
+        e1_dates = index.by_team.get(team_index.get(e1_id), {})
+        e2_dates = index.by_team.get(team_index.get(e2_id), {})
+        for date_idx in e1_dates.keys() & e2_dates.keys():
+            model.Add(cp_model.LinearExpr.Sum(candidates.vars_at(e1_dates[date_idx]))
+                      + cp_model.LinearExpr.Sum(candidates.vars_at(e2_dates[date_idx])) <= 1)
+
+
+def _count_constraints(scheduler) -> list:
+    """Remplace _add_shared_roster_constraints par une version qui compte ses contraintes."""
+    counts = []
+    add_constraints = scheduler._add_shared_roster_constraints
+
+    def counting(model, index):
+        before = len(model.Proto().constraints)
+        add_constraints(model, index)
+        counts.append(len(model.Proto().constraints) - before)
+
+    scheduler._add_shared_roster_constraints = counting
+    return counts
+
+
+def _schedulers(snapshot_file: str):
+    """(nom, fabrique de scheduler) des jeux de données mesurés."""
+    if snapshot_file:
+        snapshot = SnapshotSource(snapshot_file)
+        with quiet():
+            snapshot.connect()
+        codes = snapshot.competition_codes
+        return [(f"snapshot {'/'.join(codes)}", lambda: UfolepMySQLScheduler(codes, data_source=snapshot))]
+    return [
+        ("synthétique", lambda: synthetic_scheduler(LeagueSpec())),
+        ("synthétique x4", lambda: synthetic_scheduler(LeagueSpec(shared_roster_pairs_per_team=0.56))),
+    ]
+
+
+def main(snapshot_file: str, profile, solve: bool):
+    """Mesure les deux encodages pour chaque jeu de données."""
+    print("BENCHMARK EFFECTIF COMMUN - cliques AtMostOne / contraintes par paire")
+    print("=" * 112)
+    print(f"{'Données':<18} | {'Encodage':<8} | {'Paires':>6} | {'Cliques':>7} | {'Contr. effectif':>15} | "
+          f"{'Contr. total':>12} | {'Modèle (s)':>10} | {'CP-SAT':>20}")
+    print("-" * 112)
+    for name, make_scheduler in _schedulers(snapshot_file):
+        for encoding in ('cliques', 'paires'):
+            report = start_report()
+            scheduler = make_scheduler()
+            if encoding == 'paires':
+                scheduler._add_shared_roster_constraints = types.MethodType(
+                    add_pairwise_shared_roster_constraints, scheduler)
+            counts = _count_constraints(scheduler)
+            with quiet():
+                scheduler.load_data()
+                start = time.perf_counter()
+                model, _, index = scheduler.build_model()
+                model_seconds = time.perf_counter() - start
+            n_pairs = len(scheduler.db_loader.get_equipes_avec_effectif_commun())
+            n_cliques = len(scheduler.db_loader.get_cliques_effectif_commun())
+
+            solved = "-"
+            if solve:
+                target = len(index.by_match)
+                solver = profile.create_solver()
+                status = solver.Solve(model, ObjectiveStopCallback(target, profile.target_gap))
+                objective = int(solver.ObjectiveValue()) if status in (cp_model.OPTIMAL, cp_model.FEASIBLE) else 0
+                solved = f"{objective}/{target} {solver.StatusName(status)[:4]} {solver.WallTime():.1f}s"
+
+            print(f"{name:<18} | {encoding:<8} | {n_pairs:>6} | {n_cliques:>7} | {sum(counts):>15} | "
+                  f"{report.model['constraints']:>12} | {model_seconds:>10.2f} | {solved:>20}")
+
+
+if __name__ == "__main__":
+    args, profile, _ = parse_solver_args(sys.argv[1:])
+    snapshot_file = next((arg.partition('=')[2] for arg in args if arg.startswith('--snapshot=')), None)
+    solve = any(arg.startswith('--time=') for arg in sys.argv[1:])
+    main(snapshot_file, profile, solve)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark du calcul des paires à effectif commun sur des ligues synthétiques.
+
+Compare _calculate_effectif_commun (index inversé joueur -> équipes, seuil vectorisé) au
+parcours de toutes les paires d'équipes (intersections d'ensembles, O(équipes²)) et vérifie
+que les deux donnent les mêmes paires, dans le même ordre.
+
+Usage:
+    python benchmark_effectif_commun.py                # 130, 500, 2000 et 5000 équipes
+    python benchmark_effectif_commun.py 130 2000
+"""
+
+import sys
+import time
+from functools import partial
+
+from run_logging import quiet
+from synthetic_league import LeagueSpec, SyntheticDatabaseLoader
+
+SIZES = [130, 500, 2000, 5000]
+
+
+def pairwise_effectif_commun(loader, seuil_ratio: float = 0.5) -> list:
+    """Référence: intersection des effectifs de chaque paire d'équipes valides."""
+    equipes_valides = {equipe_id: joueurs for equipe_id, joueurs in loader.equipes_joueurs.items()
+                       if loader._is_effectif_complet(equipe_id)}
+    equipes_ids = list(equipes_valides.keys())
+    paires = []
+    for i in range(len(equipes_ids)):
+        for j in range(i + 1, len(equipes_ids)):
+            joueurs_e1 = equipes_valides[equipes_ids[i]]
+            joueurs_e2 = equipes_valides[equipes_ids[j]]
+            nb_communs = len(joueurs_e1 & joueurs_e2)
+            if nb_communs > 0:
+                ratio = nb_communs / min(len(joueurs_e1), len(joueurs_e2))
+                if ratio >= seuil_ratio:
+                    paires.append((equipes_ids[i], equipes_ids[j], nb_communs, ratio))
+    return paires
+
+
+def _best_of(function, repeat: int = 3) -> float:
+    """Meilleur temps de function() sur repeat exécutions."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(sizes):
+    """Mesure les deux calculs pour chaque taille de ligue et affiche un tableau récapitulatif."""
+    print(f"BENCHMARK EFFECTIF COMMUN - ligues synthétiques {sizes}")
+    print("=" * 84)
+    print(f"{'Équipes':>7} | {'Paires testées':>14} | {'Paires':>6} | {'Toutes paires (ms)':>18} | "
+          f"{'Index (ms)':>10} | {'Gain':>6} | {'Identique':>9}")
+    print("-" * 84)
+    for n_teams in sizes:
+        loader = SyntheticDatabaseLoader(LeagueSpec(n_teams=n_teams))
+        with quiet():
+            loader.load_all_data()
+            pairwise_seconds = _best_of(partial(pairwise_effectif_commun, loader))
+            index_seconds = _best_of(loader._calculate_effectif_commun)
+        identical = pairwise_effectif_commun(loader) == loader.equipes_effectif_commun
+        n_valid = sum(1 for equipe_id in loader.equipes_joueurs if loader._is_effectif_complet(equipe_id))
+        print(f"{n_teams:>7} | {n_valid * (n_valid - 1) // 2:>14} | {len(loader.equipes_effectif_commun):>6} | "
+              f"{pairwise_seconds * 1000:>18.1f} | {index_seconds * 1000:>10.1f} | "
+              f"{pairwise_seconds / index_seconds:>5.0f}x | {'oui' if identical else 'NON':>9}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or SIZES)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark du passage à l'échelle sur des ligues synthétiques (voir synthetic_league.py).
+
+Pour chaque nombre d'équipes: génération et conversion des données, construction du
+modèle CP-SAT (variables, contraintes, temps), aperçu glouton et, avec --time=S, résolution
+CP-SAT limitée à S secondes.
+
+Usage:
+    python benchmark_scale.py                      # 130, 500 et 2000 équipes
+    python benchmark_scale.py 130 500 --time=60    # Avec résolution de 60 s par taille
+"""
+
+import sys
+import time
+
+from greedy import greedy_schedule
+from run_logging import quiet
+from run_report import start_report
+from solve_callbacks import ObjectiveStopCallback
+from solver_profiles import parse_solver_args
+from synthetic_league import LeagueSpec, synthetic_scheduler
+
+SIZES = [130, 500, 2000]
+
+
+def main(sizes, profile, solve: bool):
+    """Mesure chaque taille de ligue et affiche un tableau récapitulatif."""
+    print(f"BENCHMARK PASSAGE À L'ÉCHELLE - ligues synthétiques {sizes}")
+    print("=" * 104)
+    print(f"{'Équipes':>7} | {'Matchs':>6} | {'Données (s)':>11} | {'Variables':>9} | {'Contraintes':>11} | "
+          f"{'Modèle (s)':>10} | {'Glouton':>11} | {'CP-SAT':>20}")
+    print("-" * 104)
+    for n_teams in sizes:
+        report = start_report()
+        scheduler = synthetic_scheduler(LeagueSpec(n_teams=n_teams))
+        with quiet():
+            start = time.perf_counter()
+            scheduler.load_data()
+            data_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            model, candidates, index = scheduler.build_model()
+            model_seconds = time.perf_counter() - start
+            target = len(index.by_match)
+            greedy = f"{len(greedy_schedule(scheduler, candidates))}/{target}"
+
+        solved = "-"
+        if solve:
+            solver = profile.create_solver()
+            status = solver.Solve(model, ObjectiveStopCallback(target, profile.target_gap))
+            objective = int(solver.ObjectiveValue()) if solver.StatusName(status) in ('OPTIMAL', 'FEASIBLE') else 0
+            solved = f"{objective}/{target} {solver.StatusName(status)[:4]} {solver.WallTime():.0f}s"
+
+        print(f"{n_teams:>7} | {target:>6} | {data_seconds:>11.2f} | {report.model['variables']:>9} | "
+              f"{report.model['constraints']:>11} | {model_seconds:>10.2f} | {greedy:>11} | {solved:>20}")
+
+
+if __name__ == "__main__":
+    args, profile, _ = parse_solver_args(sys.argv[1:])
+    solve = any(arg.startswith('--time=') for arg in sys.argv[1:])
+    main([int(arg) for arg in args] or SIZES, profile, solve)
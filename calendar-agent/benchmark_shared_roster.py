@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark du temps de construction du modèle selon le nombre de paires à effectif commun.
+
+Construit une ligue synthétique (sans BDD) puis, pour un nombre croissant de paires
+d'équipes partageant leur effectif, mesure le temps de la famille 'shared_roster' et
+le temps total de construction du modèle CP-SAT (sans résolution).
+
+Usage:
+    python benchmark_shared_roster.py              # 130 équipes (taille actuelle m/f/mo)
+    python benchmark_shared_roster.py 500          # Ligue régionale élargie
+"""
+
+import random
+import sys
+import time
+from datetime import date, time as dt_time
+
+from db_loader_real import GymnaseData
+from run_logging import quiet
+from ufolep_mysql_final import UfolepMySQLScheduler, Team, TimeSlot, Division
+
+PAIRS_STEPS = [0, 18, 50, 100, 200, 400, 800]
+
+
+def build_scheduler(n_teams: int, seed: int = 0) -> UfolepMySQLScheduler:
+    """Crée un scheduler peuplé d'une ligue synthétique (divisions de 8, 1 à 2 créneaux par équipe)."""
+    rnd = random.Random(seed)
+    scheduler = UfolepMySQLScheduler(['m'])
+    scheduler.start_date = date(2026, 3, 2)
+    scheduler.end_date = date(2026, 5, 29)
+
+    n_gyms = max(1, n_teams // 3)
+    for g in range(n_gyms):
+        scheduler.db_loader.gymnases[str(g)] = GymnaseData(
+            id=str(g), nom=f"Gymnase {g}", adresse='', nb_terrains=rnd.choice([1, 2])
+        )
+
+    for div_num in range((n_teams + 7) // 8):
+        division = Division(id=f"m_{div_num + 1}", nom=f"Division m {div_num + 1}",
+                            code_competition='m', division_num=div_num + 1, teams=[])
+        for _ in range(min(8, n_teams - len(scheduler.teams))):
+            team_id = str(len(scheduler.teams) + 1)
+            time_slots = [
+                TimeSlot(id=f"{team_id}_{k}", equipe_id=team_id, gymnase_id=str(rnd.randrange(n_gyms)),
+                         jour_semaine=rnd.randint(1, 5), heure_debut=dt_time(20, 30), club_id=team_id)
+                for k in range(rnd.choice([1, 1, 2]))
+            ]
+            team = Team(id=team_id, nom=f"Equipe {team_id}", club_id=team_id, division_id=division.id,
+                        code_competition='m', time_slots=time_slots)
+            scheduler.teams.append(team)
+            scheduler.time_slots.extend(time_slots)
+            division.teams.append(team)
+        scheduler.divisions.append(division)
+    return scheduler
+
+
+def main(n_teams: int):
+    """Mesure la construction du modèle pour chaque nombre de paires de PAIRS_STEPS."""
+    scheduler = build_scheduler(n_teams)
+    rnd = random.Random(1)
+    team_ids = [team.id for team in scheduler.teams]
+    all_pairs = [tuple(rnd.sample(team_ids, 2)) + (6, 0.75) for _ in range(max(PAIRS_STEPS))]
+
+    print(f"BENCHMARK EFFECTIF COMMUN - {n_teams} équipes, {len(scheduler.divisions)} divisions")
+    print("=" * 60)
+    print(f"{'Paires':>7} | {'Contraintes':>11} | {'shared_roster (s)':>17} | {'Modèle (s)':>10}")
+    print("-" * 60)
+    for n_pairs in PAIRS_STEPS:
+        scheduler.db_loader.equipes_effectif_commun = all_pairs[:n_pairs]
+        start = time.perf_counter()
+        with quiet():
+            _, _, index = scheduler.build_model()
+        total = time.perf_counter() - start
+        print(f"{n_pairs:>7} | {index.constraint_counts.get('shared_roster', 0):>11} | "
+              f"{index.timings.get('shared_roster', 0.0):>17.4f} | {total:>10.3f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 130)
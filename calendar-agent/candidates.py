@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+Énumération vectorisée des candidats (match, date, créneau) pour le scheduler UFOLEP.
+
+La matrice (créneau × date) des disponibilités est calculée une seule fois avec NumPy :
+jour de la semaine du créneau == jour de la date ET gymnase non blacklisté ce jour-là.
+Les candidats de chaque match sont ensuite obtenus en bloc par indexation, sans boucle
+Python sur le produit cartésien paires × dates × créneaux.
+
+Les candidats sont stockés dans une CandidateTable: une colonne d'entiers par attribut
+(match, équipes, date, semaine, créneau, gymnase, variable) au lieu d'une liste de dicts.
+"""
+
+from dataclasses import dataclass, field, replace
+from datetime import date
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+
+def group_rows(keys: Tuple[np.ndarray, ...], rows: np.ndarray) -> Dict:
+    """Regroupe des lignes de candidats par clé composite d'entiers.
+
+    Args:
+        keys: Colonnes de clé (même longueur que rows), entiers positifs
+        rows: Index de ligne associé à chaque clé
+
+    Returns:
+        {clé: array des lignes}, la clé est un int pour une seule colonne, un tuple sinon
+    """
+    if len(rows) == 0:
+        return {}
+    dims = tuple(int(k.max()) + 1 for k in keys)
+    codes = np.ravel_multi_index(keys, dims)
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+    bounds = np.flatnonzero(np.diff(sorted_codes)) + 1
+    starts = np.concatenate(([0], bounds))
+    unique_keys = np.unravel_index(sorted_codes[starts], dims)
+    if len(keys) == 1:
+        group_keys = unique_keys[0].tolist()
+    else:
+        group_keys = list(zip(*(k.tolist() for k in unique_keys)))
+    return dict(zip(group_keys, np.split(rows[order], bounds)))
+
+
+@dataclass
+class CandidateTable:
+    """Candidats (match, date, créneau) stockés en colonnes d'entiers (struct-of-arrays).
+
+    Les objets (dates, équipes, créneaux, gymnases) ne sont référencés que par leur index
+    dans les listes de correspondance; var_index pointe dans la liste des BoolVars.
+    """
+    match_id: np.ndarray
+    home: np.ndarray
+    away: np.ndarray
+    date_idx: np.ndarray
+    week_idx: np.ndarray
+    slot: np.ndarray
+    gym: np.ndarray
+    var_index: np.ndarray
+    dates: List[date]
+    weeks: List[Tuple[int, int]]
+    teams: list
+    slots: list
+    gym_ids: List[str]
+    variables: list = field(default_factory=list)
+    proto_index: np.ndarray = None
+
+    def __len__(self) -> int:
+        return len(self.match_id)
+
+    @property
+    def rows(self) -> np.ndarray:
+        """Index de toutes les lignes."""
+        return np.arange(len(self), dtype=np.int64)
+
+    def create_variables(self, model) -> None:
+        """Crée une BoolVar par candidat (sans nom, pour limiter le coût Python)."""
+        self.variables = [model.NewBoolVar('') for _ in range(len(self))]
+        self.var_index = np.arange(len(self), dtype=np.int64)
+        self.proto_index = np.array([var.Index() for var in self.variables], dtype=np.int64)
+
+    def select(self, rows: np.ndarray) -> 'CandidateTable':
+        """Sous-table des lignes demandées (mêmes correspondances et mêmes variables)."""
+        return replace(
+            self,
+            match_id=self.match_id[rows],
+            home=self.home[rows],
+            away=self.away[rows],
+            date_idx=self.date_idx[rows],
+            week_idx=self.week_idx[rows],
+            slot=self.slot[rows],
+            gym=self.gym[rows],
+            var_index=self.var_index[rows]
+        )
+
+    def vars_at(self, rows: np.ndarray) -> list:
+        """BoolVars des lignes demandées."""
+        variables = self.variables
+        return [variables[i] for i in self.var_index[rows].tolist()]
+
+    def selected_rows(self, solver) -> np.ndarray:
+        """Lignes dont la variable vaut 1 dans la solution du solver."""
+        return self.rows_from_solution(solver.ResponseProto().solution)
+
+    def rows_from_solution(self, solution) -> np.ndarray:
+        """Lignes dont la variable vaut 1 dans une solution CP-SAT (valeurs par variable du modèle)."""
+        if len(self) == 0:
+            return np.zeros(0, dtype=np.int64)
+        values = np.asarray(solution, dtype=np.int64)
+        return np.flatnonzero(values[self.proto_index[self.var_index]] == 1)
+
+
+class CandidateMatrix:
+    """Matrice de disponibilité (créneau × date) et index des candidats par équipe qui reçoit."""
+
+    def __init__(self, dates: List[date], teams: list, blacklist_gymnases: Dict[str, Set[date]]):
+        """Construit la matrice de disponibilité.
+
+        Args:
+            dates: Dates valides de la période (index de date = position dans cette liste)
+            teams: Équipes du scheduler (index d'équipe = position dans cette liste)
+            blacklist_gymnases: {gymnase_id: set(dates)} dates d'indisponibilité des gymnases
+        """
+        self.dates = list(dates)
+        self.teams = list(teams)
+
+        # Créneaux à plat, regroupés par équipe (les créneaux d'une équipe sont contigus)
+        self.slots = [ts for team in self.teams for ts in team.time_slots]
+        slots_per_team = np.array([len(team.time_slots) for team in self.teams], dtype=np.int64)
+        slot_team = np.repeat(np.arange(len(self.teams), dtype=np.int64), slots_per_team)
+
+        # Semaine ISO de chaque date (index dense)
+        iso_weeks = [tuple(d.isocalendar())[:2] for d in self.dates]
+        self.weeks = sorted(set(iso_weeks))
+        week_index = {week: i for i, week in enumerate(self.weeks)}
+        self.date_week = np.array([week_index[week] for week in iso_weeks], dtype=np.int64)
+
+        # Disponibilité des gymnases par date
+        self.gym_ids = sorted({ts.gymnase_id for ts in self.slots})
+        gym_index = {gym_id: i for i, gym_id in enumerate(self.gym_ids)}
+        date_index = {d: i for i, d in enumerate(self.dates)}
+        self.gym_available = np.ones((len(self.gym_ids), len(self.dates)), dtype=bool)
+        for gym_id, closed_dates in blacklist_gymnases.items():
+            if gym_id not in gym_index:
+                continue
+            for closed_date in closed_dates:
+                if closed_date in date_index:
+                    self.gym_available[gym_index[gym_id], date_index[closed_date]] = False
+
+        # Matrice (créneau × date): bon jour de semaine et gymnase disponible
+        date_weekdays = np.array([d.weekday() + 1 for d in self.dates], dtype=np.int8)
+        self.slot_weekday = np.array([ts.jour_semaine for ts in self.slots], dtype=np.int8)
+        self.slot_gym = np.array([gym_index[ts.gymnase_id] for ts in self.slots], dtype=np.int64)
+        self.slot_date_ok = ((self.slot_weekday[:, None] == date_weekdays[None, :])
+                             & self.gym_available[self.slot_gym])
+
+        # Candidats (créneau, date) de chaque équipe qui reçoit, au format CSR trié par équipe
+        cand_slot, cand_date = np.nonzero(self.slot_date_ok)
+        self._cand_slot = cand_slot.astype(np.int64)
+        self._cand_date = cand_date.astype(np.int64)
+        self._team_ptr = np.searchsorted(slot_team[self._cand_slot],
+                                         np.arange(len(self.teams) + 1, dtype=np.int64))
+
+    def candidates_per_team(self) -> np.ndarray:
+        """Nombre de candidats (créneau, date) de chaque équipe quand elle reçoit."""
+        return np.diff(self._team_ptr)
+
+    def enumerate(self, match_ids: np.ndarray, homes: np.ndarray, aways: np.ndarray) -> CandidateTable:
+        """Génère en bloc les candidats de chaque match orienté (domicile, extérieur).
+
+        Args:
+            match_ids: Index du match pour chaque orientation
+            homes: Index de l'équipe qui reçoit pour chaque orientation
+            aways: Index de l'équipe qui se déplace pour chaque orientation
+
+        Returns:
+            CandidateTable triée par match puis date (variables non encore créées)
+        """
+        match_ids = np.asarray(match_ids, dtype=np.int64)
+        homes = np.asarray(homes, dtype=np.int64)
+        aways = np.asarray(aways, dtype=np.int64)
+
+        starts = self._team_ptr[homes]
+        counts = self._team_ptr[homes + 1] - starts
+        total = int(counts.sum())
+
+        # Indices à plat dans les candidats CSR: start de l'équipe + rang dans son bloc
+        offsets = np.repeat(np.cumsum(counts) - counts, counts)
+        flat = np.repeat(starts, counts) + (np.arange(total, dtype=np.int64) - offsets)
+
+        match_idx = np.repeat(match_ids, counts)
+        home_idx = np.repeat(homes, counts)
+        away_idx = np.repeat(aways, counts)
+        date_idx = self._cand_date[flat]
+        slot_idx = self._cand_slot[flat]
+
+        # Même ordre que l'ancienne énumération: par match, puis par date
+        order = np.lexsort((date_idx, match_idx))
+        date_idx = date_idx[order]
+        slot_idx = slot_idx[order]
+        return CandidateTable(
+            match_id=match_idx[order],
+            home=home_idx[order],
+            away=away_idx[order],
+            date_idx=date_idx,
+            week_idx=self.date_week[date_idx],
+            slot=slot_idx,
+            gym=self.slot_gym[slot_idx],
+            var_index=np.arange(total, dtype=np.int64),
+            dates=self.dates,
+            weeks=self.weeks,
+            teams=self.teams,
+            slots=self.slots,
+            gym_ids=self.gym_ids
+        )
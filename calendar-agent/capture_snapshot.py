@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Capture des données du loader dans un snapshot compressé (voir data_sources.py).
+
+Exécute toutes les requêtes de UfolepDatabaseLoader sur la base de production et enregistre
+leurs lignes: generate_calendar.py --snapshot=<fichier> reproduit ensuite la génération à
+l'identique, sans base de données (hors ligne, CI, benchmarks).
+
+Usage:
+    python capture_snapshot.py m f mo                            # snapshot_m_f_mo.json.gz
+    python capture_snapshot.py c kh --output=coupes.json.gz
+    python capture_snapshot.py m f mo --sqlite=ufolep_13volley.db    # Depuis une copie SQLite
+"""
+
+import logging
+import os
+import sys
+
+from data_sources import MySQLSource, RecordingSource, SQLiteSource
+from db_loader_real import UfolepDatabaseLoader
+
+logger = logging.getLogger(__name__)
+
+
+def capture(competition_codes, filename: str, source=None) -> bool:
+    """Charge les données des compétitions et écrit le snapshot."""
+    recording = RecordingSource(source or MySQLSource())
+    loader = UfolepDatabaseLoader(competition_codes, recording)
+    if not loader.load_all_data():
+        logger.error("[ERREUR] Chargement impossible, snapshot non écrit")
+        return False
+    recording.write_snapshot(filename, competition_codes)
+    n_rows = sum(len(rows) for rows in recording.rows.values())
+    logger.info(f"[OK] Snapshot écrit: {filename} ({len(recording.rows)} requêtes, {n_rows} lignes, "
+                f"{os.path.getsize(filename) / 1024:.0f} Ko)")
+    return True
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    args = sys.argv[1:]
+    output = next((arg.partition('=')[2] for arg in args if arg.startswith('--output=')), None)
+    sqlite_file = next((arg.partition('=')[2] for arg in args if arg.startswith('--sqlite=')), None)
+    codes = [arg for arg in args if not arg.startswith('--')] or ['m', 'f', 'mo']
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    filename = output or os.path.join(script_dir, f"snapshot_{'_'.join(codes)}.json.gz")
+    ok = capture(codes, filename, SQLiteSource(sqlite_file) if sqlite_file else None)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Index de regroupement des candidats partagé par toutes les familles de contraintes.
+
+Les regroupements (match), (équipe, date), (équipe, semaine), (gymnase, date),
+(équipe à domicile), (équipe à l'extérieur), (match, équipe à domicile) et l'index
+{équipe: {date: lignes}} sont construits une seule fois à partir de la CandidateTable,
+puis réutilisés par chaque méthode _add_*_constraints du scheduler. L'index mesure aussi
+le temps et le nombre de contraintes de chaque famille pour identifier celle qui domine
+la construction du modèle.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, Tuple
+
+import numpy as np
+
+from candidates import CandidateTable, group_rows
+
+logger = logging.getLogger(__name__)
+
+
+class ConstraintIndex:
+    """Regroupements des lignes de la CandidateTable et statistiques par famille de contraintes."""
+
+    def __init__(self, candidates: CandidateTable):
+        """Construit tous les regroupements en une passe sur les colonnes de la table."""
+        self.candidates = candidates
+        self.timings: Dict[str, float] = {}
+        self.constraint_counts: Dict[str, int] = {}
+
+        start = time.perf_counter()
+        rows = candidates.rows
+
+        # Chaque candidat occupe ses deux équipes: colonnes (équipe, date, semaine) doublées
+        both_rows = np.concatenate((rows, rows))
+        both_teams = np.concatenate((candidates.home, candidates.away))
+        both_dates = np.concatenate((candidates.date_idx, candidates.date_idx))
+        both_weeks = np.concatenate((candidates.week_idx, candidates.week_idx))
+
+        self.by_match: Dict[int, np.ndarray] = group_rows((candidates.match_id,), rows)
+        self.by_team_date: Dict[Tuple[int, int], np.ndarray] = group_rows((both_teams, both_dates), both_rows)
+        self.by_team_week: Dict[Tuple[int, int], np.ndarray] = group_rows((both_teams, both_weeks), both_rows)
+        self.by_gym_date: Dict[Tuple[int, int], np.ndarray] = group_rows((candidates.gym, candidates.date_idx), rows)
+        self.by_home: Dict[int, np.ndarray] = group_rows((candidates.home,), rows)
+        self.by_away: Dict[int, np.ndarray] = group_rows((candidates.away,), rows)
+        self.by_match_home: Dict[Tuple[int, int], np.ndarray] = group_rows((candidates.match_id, candidates.home), rows)
+
+        # Index par équipe: {équipe: {date: lignes}} (mêmes tableaux que by_team_date)
+        self.by_team: Dict[int, Dict[int, np.ndarray]] = {}
+        for (team, date_idx), team_rows in self.by_team_date.items():
+            self.by_team.setdefault(team, {})[date_idx] = team_rows
+
+        self.timings['index'] = time.perf_counter() - start
+
+    @contextmanager
+    def timed(self, family: str, model=None):
+        """Mesure le temps (et le nombre de contraintes ajoutées si model est fourni) d'une famille."""
+        start = time.perf_counter()
+        n_before = len(model.Proto().constraints) if model is not None else 0
+        try:
+            yield
+        finally:
+            self.timings[family] = self.timings.get(family, 0.0) + time.perf_counter() - start
+            if model is not None:
+                added = len(model.Proto().constraints) - n_before
+                self.constraint_counts[family] = self.constraint_counts.get(family, 0) + added
+
+    def print_timings(self):
+        """Affiche le temps de construction par famille, de la plus coûteuse à la moins coûteuse."""
+        total = sum(self.timings.values())
+        logger.info(f"[INFO] Construction du modèle: {total:.3f}s")
+        for family, seconds in sorted(self.timings.items(), key=lambda item: item[1], reverse=True):
+            count = self.constraint_counts.get(family)
+            count_str = f", {count} contraintes" if count is not None else ""
+            logger.info(f"       - {family}: {seconds:.3f}s{count_str}")
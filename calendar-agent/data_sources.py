@@ -0,0 +1,458 @@
+# -*- coding: utf-8 -*-
+"""
+Sources de données du loader UFOLEP: MySQL, SQLite ou snapshot compressé.
+
+UfolepDatabaseLoader nomme chacune de ses requêtes (clubs, gymnases, equipes...) et en
+demande les lignes à sa source sous forme de dictionnaires colonne -> valeur:
+- MySQLSource exécute les requêtes sur la base de production (DB_CONFIG), en parallèle sur
+  plusieurs connexions qui lisent chacune un instantané cohérent (transaction en lecture seule);
+- SQLiteSource exécute les mêmes requêtes sur une copie SQLite de la base (le schéma
+  ufolep_13volley est attaché sous ce nom, les requêtes restent inchangées);
+- SnapshotSource relit les lignes capturées par capture_snapshot.py (JSON compressé gzip):
+  génération hors ligne, en CI ou en benchmark, reproduisant exactement une exécution;
+- CachedSource garde les lignes d'une autre source dans data_cache/ (même format que les
+  snapshots) et les relit tant que l'empreinte des tables sources (date de dernière modification
+  et prochain AUTO_INCREMENT sous MySQL) n'a pas changé. Le cache est facultatif (option
+  --data-cache de generate_calendar.py, generate_huitiemes.py et generate_calendar_new_team.py):
+  par défaut le loader lit directement la base.
+"""
+
+import gzip
+import json
+import logging
+import os
+import queue
+import sqlite3
+import time as timer
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+import mysql.connector
+
+from db_config import DB_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# À incrémenter quand le format des snapshots change
+SNAPSHOT_VERSION = 1
+
+# Tables lues par les requêtes du loader (empreinte du cache)
+SOURCE_TABLES = ['clubs', 'equipes', 'classements', 'gymnase', 'creneau', 'register', 'competitions',
+                 'dates_limite', 'matches', 'joueur_equipe', 'joueurs', 'blacklist_gymnase']
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data_cache')
+
+
+class DataSource:
+    """Source des lignes des requêtes du loader."""
+
+    description = "source"
+
+    def connect(self) -> bool:
+        """Ouvre la source (connexion, fichier). Retourne False en cas d'échec."""
+        return True
+
+    def close(self) -> None:
+        """Ferme la source."""
+
+    def fetch(self, name: str, query: str) -> List[Dict]:
+        """Lignes de la requête name (query: SQL exécuté par les sources SQL)."""
+        raise NotImplementedError
+
+    def fetch_all(self, queries: Dict[str, str]) -> Dict[str, List[Dict]]:
+        """Lignes de plusieurs requêtes indépendantes {name: query} (en séquence par défaut)."""
+        return {name: self.fetch(name, query) for name, query in queries.items()}
+
+    def probe(self) -> Optional[Dict]:
+        """Empreinte bon marché des tables sources (source ouverte), None si non disponible."""
+        return None
+
+
+class MySQLSource(DataSource):
+    """Base MySQL de production (requêtes exécutées telles quelles).
+
+    fetch_all répartit les requêtes sur jusqu'à workers connexions, ouvertes à la demande et
+    fermées par close(). Chaque connexion ouvre une transaction START TRANSACTION WITH
+    CONSISTENT SNAPSHOT avant la première requête. MySQL ne permet pas de partager un instantané
+    entre connexions: avec plusieurs connexions, les instantanés sont pris à quelques
+    millisecondes d'intervalle et une écriture de l'interface web peut tomber entre deux.
+    Avec workers=1, toutes les requêtes lisent le même instantané, l'une après l'autre.
+    """
+
+    def __init__(self, config: Dict = None, workers: int = 4):
+        self.config = config or DB_CONFIG
+        self.workers = max(1, workers)
+        self.connection = None
+        self.connections = []  # Toutes les connexions ouvertes, la principale en premier
+        self.description = f"MySQL {self.config['database']}"
+
+    def connect(self) -> bool:
+        try:
+            self.connection = mysql.connector.connect(**self.config)
+            self.connections = [self.connection]
+            logger.info(f"[OK] Connexion reussie a la base {self.config['database']} "
+                        f"(jusqu'à {self.workers} connexions)")
+            return True
+        except mysql.connector.Error as err:
+            logger.error(f"[ERREUR] Erreur de connexion MySQL: {err}")
+            return False
+
+    def close(self) -> None:
+        if not self.connections:
+            return
+        for connection in self.connections:
+            try:
+                connection.close()
+            except mysql.connector.Error as err:
+                logger.warning(f"[ATTENTION] Fermeture d'une connexion MySQL impossible: {err}")
+        self.connections = []
+        self.connection = None
+        logger.info("[INFO] Connexion MySQL fermee")
+
+    def fetch(self, name: str, query: str) -> List[Dict]:
+        return self._execute(self.connection, query)
+
+    def fetch_all(self, queries: Dict[str, str]) -> Dict[str, List[Dict]]:
+        # Connexions supplémentaires ouvertes à la demande, gardées jusqu'à close()
+        try:
+            while len(self.connections) < min(self.workers, len(queries)):
+                self.connections.append(mysql.connector.connect(**self.config))
+        except mysql.connector.Error as err:
+            logger.warning(f"[ATTENTION] Connexion MySQL supplémentaire impossible, "
+                           f"requêtes sur {len(self.connections)} connexion(s): {err}")
+        connections = self.connections[:max(1, min(self.workers, len(queries)))]
+        for connection in connections:
+            connection.rollback()
+            connection.start_transaction(consistent_snapshot=True, readonly=True)
+        available = queue.Queue()
+        for connection in connections:
+            available.put(connection)
+
+        def run(query: str) -> List[Dict]:
+            connection = available.get()
+            try:
+                return self._execute(connection, query)
+            finally:
+                available.put(connection)
+
+        try:
+            with ThreadPoolExecutor(max_workers=len(connections)) as executor:
+                futures = {name: executor.submit(run, query) for name, query in queries.items()}
+                return {name: future.result() for name, future in futures.items()}
+        finally:
+            for connection in connections:
+                connection.rollback()
+
+    @staticmethod
+    def _execute(connection, query: str) -> List[Dict]:
+        cursor = connection.cursor(dictionary=True)
+        try:
+            cursor.execute(query)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def probe(self) -> Optional[Dict]:
+        # Métadonnées de information_schema plutôt que CHECKSUM TABLE (lecture complète de chaque
+        # table; l'option QUICK ne répond que pour les tables MyISAM à checksum permanent)
+        cursor = self.connection.cursor()
+        try:
+            try:
+                # MySQL 8 garde ces statistiques en cache 24 h par défaut
+                cursor.execute("SET SESSION information_schema_stats_expiry = 0")
+            except mysql.connector.Error:
+                pass  # MySQL 5.7, MariaDB: statistiques toujours à jour
+            cursor.execute("SELECT TABLE_NAME, UPDATE_TIME, AUTO_INCREMENT FROM information_schema.TABLES "
+                           "WHERE TABLE_SCHEMA = %s AND TABLE_NAME IN (" + ", ".join(["%s"] * len(SOURCE_TABLES)) + ")",
+                           [self.config['database']] + SOURCE_TABLES)
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+        if any(update_time is None for _, update_time, _ in rows):
+            # Date de modification inconnue (moteur, redémarrage du serveur): changement indétectable
+            return None
+        return {table: [str(update_time), auto_increment] for table, update_time, auto_increment in rows}
+
+
+class SQLiteSource(DataSource):
+    """Copie SQLite de la base (mêmes tables et colonnes que MySQL)."""
+
+    def __init__(self, filename: str, schema: str = None):
+        self.filename = filename
+        self.schema = schema or DB_CONFIG['database']
+        self.connection = None
+        self.description = f"SQLite {filename}"
+
+    def connect(self) -> bool:
+        if not os.path.exists(self.filename):
+            logger.error(f"[ERREUR] Base SQLite introuvable: {self.filename}")
+            return False
+        try:
+            self.connection = sqlite3.connect(':memory:')
+            # Les requêtes préfixent certaines tables par le nom du schéma MySQL
+            self.connection.execute("ATTACH DATABASE ? AS " + self.schema, (self.filename,))
+            self.connection.row_factory = sqlite3.Row
+            logger.info(f"[OK] Base SQLite ouverte: {self.filename}")
+            return True
+        except sqlite3.Error as err:
+            logger.error(f"[ERREUR] Impossible d'ouvrir la base SQLite {self.filename}: {err}")
+            return False
+
+    def close(self) -> None:
+        if self.connection is not None:
+            self.connection.close()
+        self.connection = None
+
+    def fetch(self, name: str, query: str) -> List[Dict]:
+        return [dict(row) for row in self.connection.execute(query)]
+
+    def probe(self) -> Optional[Dict]:
+        # Pas de CHECKSUM TABLE sous SQLite: nombre de lignes, rowid maximal et date du fichier
+        fingerprint = {'mtime_ns': os.stat(self.filename).st_mtime_ns}
+        for table in SOURCE_TABLES:
+            try:
+                count, max_rowid = self.connection.execute(
+                    f"SELECT COUNT(*), MAX(rowid) FROM {self.schema}.{table}").fetchone()
+                fingerprint[table] = [count, max_rowid]
+            except sqlite3.Error:
+                fingerprint[table] = None
+        return fingerprint
+
+
+def _encode(value):
+    """Valeur JSON d'une colonne, en gardant le type des dates, heures et décimaux."""
+    if isinstance(value, datetime):
+        return {'$datetime': value.isoformat()}
+    if isinstance(value, date):
+        return {'$date': value.isoformat()}
+    if isinstance(value, time):
+        return {'$time': value.isoformat()}
+    if isinstance(value, timedelta):
+        return {'$timedelta': value.total_seconds()}
+    if isinstance(value, Decimal):
+        return {'$decimal': str(value)}
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode('utf-8')
+    return value
+
+
+def _decode(value):
+    """Inverse de _encode."""
+    if isinstance(value, dict) and len(value) == 1:
+        (tag, raw), = value.items()
+        if tag == '$datetime':
+            return datetime.fromisoformat(raw)
+        if tag == '$date':
+            return date.fromisoformat(raw)
+        if tag == '$time':
+            return time.fromisoformat(raw)
+        if tag == '$timedelta':
+            return timedelta(seconds=raw)
+        if tag == '$decimal':
+            return Decimal(raw)
+    return value
+
+
+def _normalize(query: str) -> str:
+    """Requête SQL sans différences d'espacement."""
+    return " ".join(query.split())
+
+
+def _read_snapshot(filename: str) -> Dict:
+    """Contenu d'un snapshot (OSError, ValueError si illisible ou d'une autre version)."""
+    with gzip.open(filename, 'rt', encoding='utf-8') as f:
+        snapshot = json.load(f)
+    if snapshot.get('version') != SNAPSHOT_VERSION:
+        raise ValueError(f"version {snapshot.get('version')} (attendue {SNAPSHOT_VERSION})")
+    return snapshot
+
+
+class SnapshotSource(DataSource):
+    """Lignes capturées depuis la production (voir capture_snapshot.py)."""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.rows: Optional[Dict[str, List[Dict]]] = None
+        self.queries: Dict[str, str] = {}
+        self.competition_codes: List[str] = []
+        self.fingerprint: Optional[Dict] = None
+        self.description = f"snapshot {filename}"
+
+    def _load(self, snapshot: Dict) -> None:
+        """Décode les lignes d'un snapshot lu par _read_snapshot."""
+        self.competition_codes = snapshot['competition_codes']
+        self.fingerprint = snapshot.get('fingerprint')
+        self.queries = {name: captured['query'] for name, captured in snapshot['queries'].items()}
+        self.rows = {
+            name: [{column: _decode(value) for column, value in row.items()} for row in captured['rows']]
+            for name, captured in snapshot['queries'].items()
+        }
+
+    def has(self, name: str, query: str) -> bool:
+        """La requête name a été capturée avec ce texte SQL."""
+        return name in self.rows and _normalize(self.queries[name]) == _normalize(query)
+
+    def connect(self) -> bool:
+        if self.rows is not None:
+            return True
+        try:
+            snapshot = _read_snapshot(self.filename)
+        except (OSError, ValueError) as e:
+            logger.error(f"[ERREUR] Impossible de lire le snapshot {self.filename}: {e}, recapturer le snapshot")
+            return False
+        self._load(snapshot)
+        logger.info(f"[OK] Snapshot {self.filename} du {snapshot['captured_at']} "
+                    f"({', '.join(self.competition_codes)})")
+        return True
+
+    def fetch(self, name: str, query: str) -> List[Dict]:
+        # La requête doit être celle de la capture (mêmes compétitions, même loader)
+        if not self.has(name, query):
+            raise KeyError(f"requête '{name}' absente ou différente dans le snapshot {self.filename} "
+                           f"(capturé pour {self.competition_codes}): recapturer le snapshot")
+        return self.rows[name]
+
+
+class RecordingSource(DataSource):
+    """Enregistre les lignes lues depuis une autre source (capture d'un snapshot)."""
+
+    def __init__(self, source: DataSource):
+        self.source = source
+        self.rows: Dict[str, List[Dict]] = {}
+        self.queries: Dict[str, str] = {}
+        self.description = source.description
+
+    def connect(self) -> bool:
+        return self.source.connect()
+
+    def close(self) -> None:
+        self.source.close()
+
+    def fetch(self, name: str, query: str) -> List[Dict]:
+        rows = self.source.fetch(name, query)
+        self.record(name, query, rows)
+        return rows
+
+    def fetch_all(self, queries: Dict[str, str]) -> Dict[str, List[Dict]]:
+        results = self.source.fetch_all(queries)
+        for name, rows in results.items():
+            self.record(name, queries[name], rows)
+        return results
+
+    def record(self, name: str, query: str, rows: List[Dict]) -> None:
+        """Ajoute des lignes lues ailleurs (cache) au prochain snapshot."""
+        self.queries[name] = query
+        self.rows[name] = rows
+
+    def write_snapshot(self, filename: str, competition_codes: List[str], fingerprint: Dict = None) -> None:
+        """Écrit les lignes enregistrées dans un snapshot JSON compressé (écriture atomique)."""
+        snapshot = {
+            'version': SNAPSHOT_VERSION,
+            'captured_at': datetime.now().isoformat(timespec='seconds'),
+            'source': self.source.description,
+            'competition_codes': list(competition_codes),
+            'queries': {
+                name: {
+                    'query': self.queries[name],
+                    'rows': [{column: _encode(value) for column, value in row.items()} for row in rows],
+                }
+                for name, rows in self.rows.items()
+            },
+        }
+        if fingerprint is not None:
+            snapshot['fingerprint'] = fingerprint
+        tmp_filename = f"{filename}.{os.getpid()}.tmp"
+        with gzip.open(tmp_filename, 'wt', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_filename, filename)
+
+
+class CachedSource(DataSource):
+    """Cache disque des lignes d'une autre source, valable tant que son empreinte ne change pas.
+
+    La source est toujours ouverte pour calculer l'empreinte (probe); si elle est identique à
+    celle du cache, les requêtes déjà en cache sont servies depuis le disque. Les requêtes
+    absentes ou modifiées sont exécutées sur la source et le cache est réécrit à la fermeture.
+    """
+
+    def __init__(self, source: DataSource, filename: str, competition_codes: List[str]):
+        self.source = source
+        self.filename = filename
+        self.competition_codes = list(competition_codes)
+        self.cache: Optional[SnapshotSource] = None
+        self.recording = RecordingSource(source)
+        self.fingerprint: Optional[Dict] = None
+        self.stale = False
+        self.description = source.description
+
+    def connect(self) -> bool:
+        self.cache = None
+        self.recording = RecordingSource(self.source)
+        self.stale = False
+        if not self.source.connect():
+            return False
+        start = timer.perf_counter()
+        try:
+            self.fingerprint = self.source.probe()
+        except Exception as e:
+            logger.warning(f"[ATTENTION] Empreinte des tables impossible, cache des données ignoré: {e}")
+            self.fingerprint = None
+        if self.fingerprint is None:
+            logger.info(f"[INFO] Empreinte des tables indisponible, cache des données ignoré: "
+                        f"chargement depuis {self.source.description}")
+            return True
+
+        cache = SnapshotSource(self.filename)
+        try:
+            cache._load(_read_snapshot(self.filename))
+        except FileNotFoundError:
+            cache = None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"[ATTENTION] Cache des données illisible ({self.filename}): {e}")
+            cache = None
+        if cache and cache.fingerprint == self.fingerprint and cache.competition_codes == self.competition_codes:
+            self.cache = cache
+            self.description = f"{self.source.description}, cache {os.path.basename(self.filename)}"
+            logger.info(f"[INFO] Données lues depuis le cache {self.filename} "
+                        f"(tables inchangées, empreinte en {(timer.perf_counter() - start) * 1000:.0f} ms)")
+        else:
+            self.description = self.source.description
+            logger.info(f"[INFO] Cache des données {'périmé' if cache else 'absent'}, "
+                        f"chargement depuis {self.source.description}")
+        return True
+
+    def close(self) -> None:
+        try:
+            if self.stale and self.fingerprint is not None:
+                os.makedirs(os.path.dirname(self.filename) or '.', exist_ok=True)
+                self.recording.write_snapshot(self.filename, self.competition_codes, self.fingerprint)
+                logger.info(f"[INFO] Cache des données mis à jour: {self.filename}")
+        except OSError as e:
+            logger.warning(f"[ATTENTION] Écriture du cache des données impossible: {e}")
+        finally:
+            self.source.close()
+
+    def fetch(self, name: str, query: str) -> List[Dict]:
+        if self.cache is not None and self.cache.has(name, query):
+            rows = self.cache.rows[name]
+            self.recording.record(name, query, rows)
+            return rows
+        self.stale = True
+        return self.recording.fetch(name, query)
+
+    def fetch_all(self, queries: Dict[str, str]) -> Dict[str, List[Dict]]:
+        # Requêtes en cache lues sur le disque, les autres ensemble sur la source
+        missing = {name: query for name, query in queries.items()
+                   if self.cache is None or not self.cache.has(name, query)}
+        fetched = self.recording.fetch_all(missing) if missing else {}
+        self.stale = self.stale or bool(missing)
+        return {name: fetched[name] if name in missing else self.fetch(name, query)
+                for name, query in queries.items()}
+
+
+def cached_source(source: DataSource, competition_codes: List[str], cache_dir: str = CACHE_DIR) -> CachedSource:
+    """Source avec cache disque, un fichier par liste de compétitions."""
+    return CachedSource(source, os.path.join(cache_dir, f"loader_{'_'.join(competition_codes)}.json.gz"),
+                        competition_codes)
@@ -4,14 +4,32 @@ Module de chargement des données UFOLEP depuis MySQL - Structure réelle.
 Adapté à votre vraie structure avec table classements et créneaux par équipe.
 """
 
-import mysql.connector
+import logging
+import sys
+from collections import Counter
+from itertools import combinations
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 from datetime import datetime, time
-from db_config import DB_CONFIG
 
+import numpy as np
 
-@dataclass
+from data_sources import DataSource, MySQLSource
+
+logger = logging.getLogger(__name__)
+
+# Entités sans __dict__ (mémoire et accès aux attributs), à partir de Python 3.10
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+def pair_key(number1: int, number2: int) -> int:
+    """Clé entière d'une paire non ordonnée de numéros d'équipes (voir UfolepDatabaseLoader.team_number)."""
+    if number1 > number2:
+        number1, number2 = number2, number1
+    return (number1 << 32) | number2
+
+
+@dataclass(**DATACLASS_SLOTS)
 class ClubData:
     """Données d'un club depuis la BDD."""
     id: str
@@ -21,7 +39,7 @@ class ClubData:
     equipes: List['EquipeData']
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class GymnaseData:
     """Données d'un gymnase depuis la BDD (indépendant des clubs)."""
     id: str
@@ -32,7 +50,7 @@ class GymnaseData:
     lng: float = None
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class CreneauData:
     """Données d'un créneau depuis la BDD (appartient à une équipe)."""
     id: str
@@ -42,7 +60,7 @@ class CreneauData:
     heure_debut: time
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class ClassementData:
     """Données de classement (liaison équipe-division)."""
     id: str
@@ -51,7 +69,7 @@ class ClassementData:
     id_equipe: str
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class EquipeData:
     """Données d'une équipe depuis la BDD."""
     id: str
@@ -61,7 +79,7 @@ class EquipeData:
     creneaux: List[CreneauData]
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class DivisionVirtuelle:
     """Division reconstituée depuis les classements."""
     id: str  # ex: "M_1", "F_2a", "MIXTE_3b"
@@ -71,7 +89,7 @@ class DivisionVirtuelle:
     equipes: List[str]  # IDs des équipes
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class CompetitionDates:
     """Dates d'une compétition."""
     code_competition: str
@@ -79,7 +97,7 @@ class CompetitionDates:
     end_date: 'date'
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class BlacklistGymnaseData:
     """Date d'indisponibilité d'un gymnase."""
     id: str
@@ -88,17 +106,18 @@ class BlacklistGymnaseData:
 
 
 class UfolepDatabaseLoader:
-    """Chargeur de données UFOLEP depuis MySQL adapté à la structure réelle."""
+    """Chargeur de données UFOLEP (MySQL, SQLite ou snapshot) adapté à la structure réelle."""
     
-    def __init__(self, competition_codes: List[str] = None):
+    def __init__(self, competition_codes: List[str] = None, source: DataSource = None):
         """Initialise le loader.
         
         Args:
             competition_codes: Liste des codes de compétition à charger (ex: ['m', 'f', 'mo', 'c'])
                               Par défaut: ['m', 'f', 'mo']
+            source: Source des données (voir data_sources.py). Par défaut: MySQL (DB_CONFIG)
         """
-        self.connection = None
         self.competition_codes = competition_codes or ['m', 'f', 'mo']
+        self.source = source or MySQLSource()
         self.clubs = {}
         self.gymnases = {}
         self.creneaux = {}
@@ -106,7 +125,8 @@ class UfolepDatabaseLoader:
         self.equipes = {}
         self.divisions_virtuelles = {}
         self.competition_dates = {}
-        self.historique_deplacements = {}  # {(equipe1_id, equipe2_id): {'equipe1_dom': n, 'equipe2_dom': n}}
+        self.team_numbers = {}  # {equipe_id: numéro interne dense}, voir team_number
+        self.historique_deplacements = {}  # {pair_key: [réceptions du plus petit numéro, du plus grand]}
         self.equipes_joueurs = {}  # {equipe_id: set(joueur_ids)}
         self.equipes_effectif_commun = []  # Liste de tuples (equipe1_id, equipe2_id, nb_joueurs_communs, ratio)
         self.blacklist_gymnases = {}  # {gymnase_id: set(dates)}
@@ -129,20 +149,12 @@ class UfolepDatabaseLoader:
         return None, None
     
     def connect(self) -> bool:
-        """Établit la connexion à la base de données."""
-        try:
-            self.connection = mysql.connector.connect(**DB_CONFIG)
-            print(f"[OK] Connexion reussie a la base {DB_CONFIG['database']}")
-            return True
-        except mysql.connector.Error as err:
-            print(f"[ERREUR] Erreur de connexion MySQL: {err}")
-            return False
+        """Ouvre la source de données (connexion MySQL, fichier SQLite ou snapshot)."""
+        return self.source.connect()
     
     def disconnect(self):
-        """Ferme la connexion à la base de données."""
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
-            print("[INFO] Connexion MySQL fermee")
+        """Ferme la source de données."""
+        self.source.close()
     
     def load_all_data(self) -> bool:
         """Charge toutes les données nécessaires depuis la BDD."""
@@ -150,15 +162,17 @@ class UfolepDatabaseLoader:
             return False
         
         try:
-            print("[INFO] Chargement des donnees UFOLEP reelles...")
-            
-            # Charger dans l'ordre des dépendances
-            self._load_clubs()
-            self._load_gymnases()
-            self._load_equipes()
-            self._load_classements()
-            self._load_creneaux()
-            self._load_competition_dates()
+            logger.info(f"[INFO] Chargement des donnees UFOLEP reelles ({self.source.description})...")
+            
+            # Toutes les requêtes d'abord (en parallèle sur MySQL), puis les traitements
+            # dans l'ordre des dépendances
+            results = self.source.fetch_all(self._queries())
+            self._load_clubs(results)
+            self._load_gymnases(results)
+            self._load_equipes(results)
+            self._load_classements(results)
+            self._load_creneaux(results)
+            self._load_competition_dates(results)
             
             # Reconstruire les divisions virtuelles
             self._build_virtual_divisions()
@@ -167,32 +181,33 @@ class UfolepDatabaseLoader:
             self._associate_data()
             
             # Charger l'historique des déplacements
-            self._load_historique_deplacements()
+            self._load_historique_deplacements(results)
             
             # Charger les effectifs d'équipes et calculer les chevauchements
-            self._load_equipes_joueurs()
+            self._load_equipes_joueurs(results)
             self._calculate_effectif_commun()
             
             # Charger les indisponibilités de gymnases
-            self._load_blacklist_gymnases()
+            self._load_blacklist_gymnases(results)
             
-            print("[OK] Toutes les donnees chargees avec succes")
+            logger.info("[OK] Toutes les donnees chargees avec succes")
             return True
             
-        except Exception as e:
-            print(f"[ERREUR] Erreur lors du chargement: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("[ERREUR] Erreur lors du chargement")
             return False
         finally:
             self.disconnect()
     
-    def _load_clubs(self):
-        """Charge les clubs depuis la BDD."""
-        cursor = self.connection.cursor(dictionary=True)
+    def _queries(self) -> Dict[str, str]:
+        """Requêtes nommées du chargement, indépendantes les unes des autres.
         
+        Pour 'kh': gymnases et créneaux depuis register (inscriptions kh)
+        Pour 'c': créneaux des équipes 'm' inscrites à la coupe (is_cup_registered=1)
+        """
         comp_filter = self._get_competition_filter()
-        query = f"""
+        queries = {}
+        queries['clubs'] = f"""
         SELECT  c.id, 
                 c.nom,
                 c.affiliation_number,
@@ -203,8 +218,142 @@ class UfolepDatabaseLoader:
         WHERE cl.code_competition in {comp_filter}
         """
         
-        cursor.execute(query)
-        rows = cursor.fetchall()
+        classic_codes = [c for c in self.competition_codes if c != 'kh']
+        if classic_codes:
+            classic_filter = "('" + "', '".join(classic_codes) + "')"
+            queries['gymnases'] = f"""
+            SELECT DISTINCT 
+                g.id,
+                g.nom,
+                g.adresse,
+                g.nb_terrain as nb_terrains,
+                g.gps
+            FROM gymnase g
+            JOIN ufolep_13volley.creneau c on g.id = c.id_gymnase
+            JOIN ufolep_13volley.classements cl on c.id_equipe = cl.id_equipe
+            WHERE cl.code_competition in {classic_filter}
+            """
+        if 'kh' in self.competition_codes:
+            queries['gymnases_kh'] = """
+            SELECT DISTINCT 
+                g.id,
+                g.nom,
+                g.adresse,
+                g.nb_terrain as nb_terrains,
+                g.gps
+            FROM gymnase g
+            WHERE g.id IN (
+                SELECT DISTINCT r.id_court_1 FROM register r WHERE r.id_competition = 18 AND r.id_court_1 IS NOT NULL
+                UNION
+                SELECT DISTINCT r.id_court_2 FROM register r WHERE r.id_competition = 18 AND r.id_court_2 IS NOT NULL
+            )
+            """
+        
+        queries['equipes'] = f"""
+        SELECT DISTINCT
+        e.id_equipe as id,
+        e.nom_equipe as nom,
+        e.id_club as club_id
+        FROM equipes e
+        JOIN ufolep_13volley.classements cl on e.id_equipe = cl.id_equipe
+        WHERE cl.code_competition in {comp_filter}  
+        """
+        
+        queries['classements'] = f"""
+        SELECT DISTINCT 
+            id,
+            code_competition,
+            division,
+            id_equipe
+        FROM classements
+        WHERE code_competition IN {comp_filter}
+        """
+        
+        if 'kh' in self.competition_codes:
+            queries['creneaux_kh'] = """
+            SELECT 
+                r.new_team_name,
+                e.id_equipe as equipe_id,
+                r.id_court_1 as gymnase_id_1,
+                r.day_court_1 as jour_1,
+                r.hour_court_1 as heure_1,
+                r.id_court_2 as gymnase_id_2,
+                r.day_court_2 as jour_2,
+                r.hour_court_2 as heure_2
+            FROM register r
+            JOIN equipes e ON e.nom_equipe = r.new_team_name
+            WHERE r.id_competition = 18
+            """
+        if 'c' in self.competition_codes:
+            queries['creneaux_c'] = """
+            SELECT DISTINCT
+                c.id as id,
+                c.id_equipe as equipe_id,
+                c.id_gymnase as gymnase_id,
+                c.jour as jour_semaine,
+                c.heure as heure_debut
+            FROM creneau c
+            JOIN classements cl ON cl.id_equipe = c.id_equipe 
+            JOIN equipes e ON e.id_equipe = c.id_equipe
+            WHERE cl.code_competition = 'm'
+            AND e.is_cup_registered = 1
+            """
+        championship_codes = [c for c in self.competition_codes if c in ('m', 'f', 'mo')]
+        if championship_codes:
+            championship_filter = "('" + "', '".join(championship_codes) + "')"
+            queries['creneaux'] = f"""
+            SELECT DISTINCT
+                c.id as id,
+                c.id_equipe as equipe_id,
+                c.id_gymnase as gymnase_id,
+                c.jour as jour_semaine,
+                c.heure as heure_debut
+            FROM creneau c
+            JOIN classements cl ON cl.id_equipe = c.id_equipe 
+            WHERE cl.code_competition IN {championship_filter}
+            """
+        
+        queries['competition_dates'] = f"""
+        SELECT 
+            c.code_competition,
+            c.start_date,
+            dl.date_limite as end_date
+        FROM competitions c
+        LEFT JOIN dates_limite dl ON dl.code_competition = c.code_competition
+        WHERE c.code_competition IN {comp_filter}
+        """
+        
+        # Matchs CONFIRMED de la saison en cours
+        queries['historique'] = """
+        SELECT 
+            m.id_equipe_dom,
+            m.id_equipe_ext,
+            COUNT(*) as nb_matchs
+        FROM matches m
+        WHERE m.match_status IN ('CONFIRMED', 'ARCHIVED')
+        AND m.date_reception >= '2025-09-01'
+        GROUP BY m.id_equipe_dom, m.id_equipe_ext
+        """
+        
+        # Joueurs avec leur sexe et le code compétition de l'équipe
+        queries['joueurs'] = f"""
+        SELECT je.id_equipe, je.id_joueur, j.sexe, cl.code_competition
+        FROM joueur_equipe je
+        JOIN equipes e ON e.id_equipe = je.id_equipe
+        JOIN classements cl ON cl.id_equipe = e.id_equipe
+        JOIN joueurs j ON j.id = je.id_joueur
+        WHERE cl.code_competition IN {comp_filter}
+        """
+        
+        queries['blacklist_gymnases'] = """
+        SELECT id, id_gymnase, closed_date
+        FROM blacklist_gymnase
+        """
+        return queries
+    
+    def _load_clubs(self, results: Dict[str, List[Dict]]):
+        """Charge les clubs depuis la BDD."""
+        rows = results['clubs']
 
         for row in rows:
             club = ClubData(
@@ -216,35 +365,18 @@ class UfolepDatabaseLoader:
             )
             self.clubs[club.id] = club
         
-        cursor.close()
-        print(f"[INFO] {len(self.clubs)} clubs charges")
+        logger.info(f"[INFO] {len(self.clubs)} clubs charges")
     
-    def _load_gymnases(self):
+    def _load_gymnases(self, results: Dict[str, List[Dict]]):
         """Charge les gymnases depuis la BDD.
         
         Pour 'kh': charge aussi depuis register (inscriptions kh)
         Pour 'c' et autres: charge depuis creneau
         """
-        cursor = self.connection.cursor(dictionary=True)
-        
         # Charger gymnases depuis table creneau (pour 'm', 'f', 'mo', 'c')
         classic_codes = [c for c in self.competition_codes if c != 'kh']
         if classic_codes:
-            comp_filter = "('" + "', '".join(classic_codes) + "')"
-            query = f"""
-            SELECT DISTINCT 
-                g.id,
-                g.nom,
-                g.adresse,
-                g.nb_terrain as nb_terrains,
-                g.gps
-            FROM gymnase g
-            JOIN ufolep_13volley.creneau c on g.id = c.id_gymnase
-            JOIN ufolep_13volley.classements cl on c.id_equipe = cl.id_equipe
-            WHERE cl.code_competition in {comp_filter}
-            """
-            cursor.execute(query)
-            rows = cursor.fetchall()
+            rows = results['gymnases']
             
             for row in rows:
                 lat, lng = self._parse_gps(row.get('gps'))
@@ -260,22 +392,7 @@ class UfolepDatabaseLoader:
         
         # Charger gymnases depuis table register (pour 'kh')
         if 'kh' in self.competition_codes:
-            query_kh = """
-            SELECT DISTINCT 
-                g.id,
-                g.nom,
-                g.adresse,
-                g.nb_terrain as nb_terrains,
-                g.gps
-            FROM gymnase g
-            WHERE g.id IN (
-                SELECT DISTINCT r.id_court_1 FROM register r WHERE r.id_competition = 18 AND r.id_court_1 IS NOT NULL
-                UNION
-                SELECT DISTINCT r.id_court_2 FROM register r WHERE r.id_competition = 18 AND r.id_court_2 IS NOT NULL
-            )
-            """
-            cursor.execute(query_kh)
-            rows_kh = cursor.fetchall()
+            rows_kh = results['gymnases_kh']
             
             for row in rows_kh:
                 if str(row['id']) not in self.gymnases:
@@ -290,26 +407,11 @@ class UfolepDatabaseLoader:
                     )
                     self.gymnases[gymnase.id] = gymnase
         
-        cursor.close()
-        print(f"[INFO] {len(self.gymnases)} gymnases charges")
+        logger.info(f"[INFO] {len(self.gymnases)} gymnases charges")
     
-    def _load_equipes(self):
+    def _load_equipes(self, results: Dict[str, List[Dict]]):
         """Charge les équipes depuis la BDD."""
-        cursor = self.connection.cursor(dictionary=True)
-        
-        comp_filter = self._get_competition_filter()
-        query = f"""
-        SELECT DISTINCT
-        e.id_equipe as id,
-        e.nom_equipe as nom,
-        e.id_club as club_id
-        FROM equipes e
-        JOIN ufolep_13volley.classements cl on e.id_equipe = cl.id_equipe
-        WHERE cl.code_competition in {comp_filter}  
-        """
-        
-        cursor.execute(query)
-        rows = cursor.fetchall()
+        rows = results['equipes']
         
         for row in rows:
             equipe = EquipeData(
@@ -321,26 +423,11 @@ class UfolepDatabaseLoader:
             )
             self.equipes[equipe.id] = equipe
         
-        cursor.close()
-        print(f"[INFO] {len(self.equipes)} equipes chargees")
+        logger.info(f"[INFO] {len(self.equipes)} equipes chargees")
     
-    def _load_classements(self):
+    def _load_classements(self, results: Dict[str, List[Dict]]):
         """Charge les classements (liaison équipes-divisions) depuis la BDD."""
-        cursor = self.connection.cursor(dictionary=True)
-        
-        comp_filter = self._get_competition_filter()
-        query = f"""
-        SELECT DISTINCT 
-            id,
-            code_competition,
-            division,
-            id_equipe
-        FROM classements
-        WHERE code_competition IN {comp_filter}
-        """
-        
-        cursor.execute(query)
-        rows = cursor.fetchall()
+        rows = results['classements']
         
         for row in rows:
             classement = ClassementData(
@@ -363,10 +450,9 @@ class UfolepDatabaseLoader:
                     self.equipes[classement.id_equipe].classement = classement
                 # Sinon garder l'existant (ne pas écraser un non-exclu par un exclu)
         
-        cursor.close()
-        print(f"[INFO] {len(self.classements)} classements charges")
+        logger.info(f"[INFO] {len(self.classements)} classements charges")
     
-    def _load_creneaux(self):
+    def _load_creneaux(self, results: Dict[str, List[Dict]]):
         """Charge les créneaux depuis la BDD.
         
         Logique spéciale par compétition:
@@ -374,7 +460,6 @@ class UfolepDatabaseLoader:
         - 'c': créneaux des équipes 'm' avec is_cup_registered=1 (depuis table 'creneau')
         - 'm', 'f', 'mo': créneaux depuis table 'creneau'
         """
-        cursor = self.connection.cursor(dictionary=True)
         creneau_id = 0
         
         # Mapping jour de la semaine (nom -> numéro)
@@ -385,23 +470,8 @@ class UfolepDatabaseLoader:
         
         # Charger créneaux pour 'kh' depuis table register
         if 'kh' in self.competition_codes:
-            print("[INFO] Chargement créneaux 'kh' depuis table register...")
-            query_kh = """
-            SELECT 
-                r.new_team_name,
-                e.id_equipe as equipe_id,
-                r.id_court_1 as gymnase_id_1,
-                r.day_court_1 as jour_1,
-                r.hour_court_1 as heure_1,
-                r.id_court_2 as gymnase_id_2,
-                r.day_court_2 as jour_2,
-                r.hour_court_2 as heure_2
-            FROM register r
-            JOIN equipes e ON e.nom_equipe = r.new_team_name
-            WHERE r.id_competition = 18
-            """
-            cursor.execute(query_kh)
-            rows_kh = cursor.fetchall()
+            logger.info("[INFO] Chargement créneaux 'kh' depuis table register...")
+            rows_kh = results['creneaux_kh']
             
             # Heure par défaut si non spécifiée
             from datetime import time as dt_time
@@ -438,26 +508,12 @@ class UfolepDatabaseLoader:
                     )
                     self.creneaux[creneau.id] = creneau
             
-            print(f"[INFO] {len([c for c in self.creneaux if c.startswith('reg_kh')])} créneaux 'kh' chargés depuis register")
+            logger.info(f"[INFO] {len([c for c in self.creneaux if c.startswith('reg_kh')])} créneaux 'kh' chargés depuis register")
         
         # Charger créneaux pour 'c' depuis table creneau (équipes 'm' avec is_cup_registered=1)
         if 'c' in self.competition_codes:
-            print("[INFO] Chargement créneaux 'c' depuis équipes 'm' inscrites à la coupe...")
-            query_c = """
-            SELECT DISTINCT
-                c.id as id,
-                c.id_equipe as equipe_id,
-                c.id_gymnase as gymnase_id,
-                c.jour as jour_semaine,
-                c.heure as heure_debut
-            FROM creneau c
-            JOIN classements cl ON cl.id_equipe = c.id_equipe 
-            JOIN equipes e ON e.id_equipe = c.id_equipe
-            WHERE cl.code_competition = 'm'
-            AND e.is_cup_registered = 1
-            """
-            cursor.execute(query_c)
-            rows_c = cursor.fetchall()
+            logger.info("[INFO] Chargement créneaux 'c' depuis équipes 'm' inscrites à la coupe...")
+            rows_c = results['creneaux_c']
             
             for row in rows_c:
                 heure_debut = self._parse_heure(row['heure_debut'])
@@ -477,26 +533,13 @@ class UfolepDatabaseLoader:
                     )
                     self.creneaux[creneau.id] = creneau
             
-            print(f"[INFO] {len([c for c in self.creneaux if c.startswith('cup_c')])} créneaux 'c' chargés")
+            logger.info(f"[INFO] {len([c for c in self.creneaux if c.startswith('cup_c')])} créneaux 'c' chargés")
         
         # Charger créneaux pour 'm', 'f', 'mo' depuis table creneau (méthode classique)
         classic_codes = [c for c in self.competition_codes if c in ('m', 'f', 'mo')]
         if classic_codes:
-            comp_filter = "('" + "', '".join(classic_codes) + "')"
-            print(f"[INFO] Chargement créneaux classiques pour {classic_codes}...")
-            query_classic = f"""
-            SELECT DISTINCT
-                c.id as id,
-                c.id_equipe as equipe_id,
-                c.id_gymnase as gymnase_id,
-                c.jour as jour_semaine,
-                c.heure as heure_debut
-            FROM creneau c
-            JOIN classements cl ON cl.id_equipe = c.id_equipe 
-            WHERE cl.code_competition IN {comp_filter}
-            """
-            cursor.execute(query_classic)
-            rows_classic = cursor.fetchall()
+            logger.info(f"[INFO] Chargement créneaux classiques pour {classic_codes}...")
+            rows_classic = results['creneaux']
             
             for row in rows_classic:
                 heure_debut = self._parse_heure(row['heure_debut'])
@@ -516,8 +559,7 @@ class UfolepDatabaseLoader:
                     )
                     self.creneaux[creneau.id] = creneau
         
-        cursor.close()
-        print(f"[INFO] {len(self.creneaux)} creneaux charges au total")
+        logger.info(f"[INFO] {len(self.creneaux)} creneaux charges au total")
     
     def _parse_heure(self, heure_raw):
         """Parse une heure depuis différents formats."""
@@ -539,23 +581,9 @@ class UfolepDatabaseLoader:
             return heure_raw
         return None
     
-    def _load_competition_dates(self):
+    def _load_competition_dates(self, results: Dict[str, List[Dict]]):
         """Charge les dates de début et fin pour chaque compétition."""
-        cursor = self.connection.cursor(dictionary=True)
-        
-        comp_filter = self._get_competition_filter()
-        query = f"""
-        SELECT 
-            c.code_competition,
-            c.start_date,
-            dl.date_limite as end_date
-        FROM competitions c
-        LEFT JOIN dates_limite dl ON dl.code_competition = c.code_competition
-        WHERE c.code_competition IN {comp_filter}
-        """
-        
-        cursor.execute(query)
-        rows = cursor.fetchall()
+        rows = results['competition_dates']
         
         for row in rows:
             # Convertir les dates si elles sont des chaînes
@@ -587,8 +615,7 @@ class UfolepDatabaseLoader:
             )
             self.competition_dates[comp_dates.code_competition] = comp_dates
         
-        cursor.close()
-        print(f"[INFO] {len(self.competition_dates)} dates de competition chargees")
+        logger.info(f"[INFO] {len(self.competition_dates)} dates de competition chargees")
     
     def _build_virtual_divisions(self):
         """Reconstruit les divisions à partir des classements."""
@@ -625,7 +652,7 @@ class UfolepDatabaseLoader:
             )
             self.divisions_virtuelles[div_key] = division
         
-        print(f"[INFO] {len(self.divisions_virtuelles)} divisions virtuelles creees")
+        logger.info(f"[INFO] {len(self.divisions_virtuelles)} divisions virtuelles creees")
     
     def _associate_data(self):
         """Associe les données entre elles (relations) et filtre les équipes."""
@@ -639,6 +666,11 @@ class UfolepDatabaseLoader:
         # Remplacer la liste des équipes par les équipes filtrées
         self.equipes = equipes_valides
         
+        # Numéros internes des équipes retenues, dans l'ordre de chargement
+        self.team_numbers = {}
+        for equipe_id in self.equipes:
+            self.team_number(equipe_id)
+        
         # Associer créneaux aux équipes (seulement les équipes valides)
         for creneau in self.creneaux.values():
             if creneau.equipe_id in self.equipes:
@@ -695,64 +727,36 @@ class UfolepDatabaseLoader:
                 valid_divisions.append(division)
         return valid_divisions
     
-    def _load_historique_deplacements(self):
+    def _load_historique_deplacements(self, results: Dict[str, List[Dict]]):
         """Charge l'historique des matchs passés pour calculer le déséquilibre dom/ext par paire."""
-        cursor = self.connection.cursor(dictionary=True)
+        rows = results['historique']
         
-        # Charger tous les matchs CONFIRMED de la saison en cours
-        query = """
-        SELECT 
-            m.id_equipe_dom,
-            m.id_equipe_ext,
-            COUNT(*) as nb_matchs
-        FROM matches m
-        WHERE m.match_status IN ('CONFIRMED', 'ARCHIVED')
-        AND m.date_reception >= '2025-09-01'
-        GROUP BY m.id_equipe_dom, m.id_equipe_ext
-        """
-        
-        cursor.execute(query)
-        rows = cursor.fetchall()
-        
-        # Construire l'historique par paire d'équipes
+        # Construire l'historique par paire d'équipes (l'équipe dom a reçu, ext s'est déplacée)
         for row in rows:
-            dom_id = str(row['id_equipe_dom'])
-            ext_id = str(row['id_equipe_ext'])
-            nb = row['nb_matchs']
-            
-            # Normaliser la paire (ordre alphabétique des IDs)
-            pair = tuple(sorted([dom_id, ext_id]))
-            
-            if pair not in self.historique_deplacements:
-                self.historique_deplacements[pair] = {pair[0]: 0, pair[1]: 0}
-            
-            # L'équipe dom_id a reçu (donc ext_id s'est déplacé)
-            self.historique_deplacements[pair][dom_id] += nb
+            self._add_historique(str(row['id_equipe_dom']), str(row['id_equipe_ext']), row['nb_matchs'])
         
         # Compter les paires avec déséquilibre
-        desequilibres = sum(1 for p, h in self.historique_deplacements.items() 
-                          if abs(h[p[0]] - h[p[1]]) >= 2)
+        desequilibres = sum(1 for receptions in self.historique_deplacements.values()
+                            if abs(receptions[0] - receptions[1]) >= 2)
         
-        cursor.close()
-        print(f"[INFO] Historique: {len(self.historique_deplacements)} paires, {desequilibres} avec déséquilibre")
+        logger.info(f"[INFO] Historique: {len(self.historique_deplacements)} paires, {desequilibres} avec déséquilibre")
     
-    def _load_equipes_joueurs(self):
+    def team_number(self, equipe_id: str) -> int:
+        """Numéro interne dense d'une équipe, attribué à la première demande."""
+        number = self.team_numbers.get(equipe_id)
+        if number is None:
+            number = self.team_numbers[equipe_id] = len(self.team_numbers)
+        return number
+    
+    def _add_historique(self, dom_id: str, ext_id: str, nb: int = 1):
+        """Ajoute nb réceptions de dom_id contre ext_id à l'historique de la paire."""
+        dom, ext = self.team_number(dom_id), self.team_number(ext_id)
+        receptions = self.historique_deplacements.setdefault(pair_key(dom, ext), [0, 0])
+        receptions[0 if dom < ext else 1] += nb
+    
+    def _load_equipes_joueurs(self, results: Dict[str, List[Dict]]):
         """Charge les joueurs par équipe avec leur sexe depuis la table joueur_equipe."""
-        cursor = self.connection.cursor(dictionary=True)
-        
-        # Charger les joueurs avec leur sexe et le code compétition de l'équipe
-        comp_filter = self._get_competition_filter()
-        query = f"""
-        SELECT je.id_equipe, je.id_joueur, j.sexe, cl.code_competition
-        FROM joueur_equipe je
-        JOIN equipes e ON e.id_equipe = je.id_equipe
-        JOIN classements cl ON cl.id_equipe = e.id_equipe
-        JOIN joueurs j ON j.id = je.id_joueur
-        WHERE cl.code_competition IN {comp_filter}
-        """
-        
-        cursor.execute(query)
-        rows = cursor.fetchall()
+        rows = results['joueurs']
         
         # Stocker les joueurs par équipe avec leur sexe
         self.equipes_joueurs_details = {}  # {equipe_id: {'joueurs': set(), 'hommes': set(), 'femmes': set(), 'code_comp': str}}
@@ -784,8 +788,7 @@ class UfolepDatabaseLoader:
         
         # Stats
         equipes_avec_effectif = sum(1 for e, d in self.equipes_joueurs_details.items() if len(d['joueurs']) > 0)
-        cursor.close()
-        print(f"[INFO] Effectifs: {equipes_avec_effectif} equipes avec joueurs renseignes")
+        logger.info(f"[INFO] Effectifs: {equipes_avec_effectif} equipes avec joueurs renseignes")
     
     def _is_effectif_complet(self, equipe_id: str) -> bool:
         """Vérifie si une équipe a un effectif complet selon les règles de sa compétition.
@@ -833,46 +836,70 @@ class UfolepDatabaseLoader:
                 equipes_exclues += 1
         
         if equipes_exclues > 0:
-            print(f"[INFO] Effectif commun: {equipes_exclues} equipes exclues (effectif incomplet)")
+            logger.info(f"[INFO] Effectif commun: {equipes_exclues} equipes exclues (effectif incomplet)")
         
         equipes_ids = list(equipes_valides.keys())
         
-        for i in range(len(equipes_ids)):
-            for j in range(i + 1, len(equipes_ids)):
-                e1, e2 = equipes_ids[i], equipes_ids[j]
-                joueurs_e1 = equipes_valides[e1]
-                joueurs_e2 = equipes_valides[e2]
-                
-                # Calculer l'intersection
-                joueurs_communs = joueurs_e1 & joueurs_e2
-                nb_communs = len(joueurs_communs)
-                
-                if nb_communs > 0:
-                    # Ratio par rapport à la plus petite équipe
-                    min_effectif = min(len(joueurs_e1), len(joueurs_e2))
-                    ratio = nb_communs / min_effectif
-                    
-                    if ratio >= seuil_ratio:
-                        self.equipes_effectif_commun.append((e1, e2, nb_communs, ratio))
+        # Index inversé joueur -> équipes (positions croissantes): seules les paires qui
+        # partagent au moins un joueur sont comptées, au lieu de toutes les paires d'équipes
+        equipes_par_joueur = {}
+        for position, equipe_id in enumerate(equipes_ids):
+            for joueur_id in equipes_valides[equipe_id]:
+                equipes_par_joueur.setdefault(joueur_id, []).append(position)
+        nb_communs = Counter()
+        for positions in equipes_par_joueur.values():
+            if len(positions) > 1:
+                nb_communs.update(combinations(positions, 2))
+        if not nb_communs:
+            return
+        
+        # Ratio par rapport à la plus petite équipe, seuil appliqué sur toutes les paires à la fois
+        # (paires triées: même ordre que le parcours de toutes les paires (i, j), i < j)
+        paires = np.array(sorted(nb_communs), dtype=np.int64)
+        communs = np.array([nb_communs[i, j] for i, j in paires.tolist()], dtype=np.int64)
+        effectifs = np.array([len(equipes_valides[equipe_id]) for equipe_id in equipes_ids], dtype=np.int64)
+        ratios = communs / np.minimum(effectifs[paires[:, 0]], effectifs[paires[:, 1]])
+        for k in np.flatnonzero(ratios >= seuil_ratio).tolist():
+            i, j = paires[k].tolist()
+            self.equipes_effectif_commun.append((equipes_ids[i], equipes_ids[j], int(communs[k]), float(ratios[k])))
         
         if self.equipes_effectif_commun:
-            print(f"[INFO] Effectif commun: {len(self.equipes_effectif_commun)} paires avec >={int(seuil_ratio*100)}% joueurs communs")
+            logger.info(f"[INFO] Effectif commun: {len(self.equipes_effectif_commun)} paires avec >={int(seuil_ratio*100)}% joueurs communs")
     
     def get_equipes_avec_effectif_commun(self) -> list:
         """Retourne la liste des paires d'équipes avec effectif commun significatif."""
         return self.equipes_effectif_commun
     
-    def _load_blacklist_gymnases(self):
-        """Charge les dates d'indisponibilité des gymnases depuis la table blacklist_gymnase."""
-        cursor = self.connection.cursor(dictionary=True)
+    def get_cliques_effectif_commun(self) -> List[List[str]]:
+        """Regroupe les paires à effectif commun en cliques maximales d'équipes en conflit.
         
-        query = """
-        SELECT id, id_gymnase, closed_date
-        FROM blacklist_gymnase
+        Trois équipes qui partagent deux à deux leur effectif (ex: Trets 1H/2H/3H) forment
+        une seule clique au lieu de trois paires. Chaque paire est couverte par au moins
+        une clique (algorithme de Bron-Kerbosch avec pivot).
         """
-        
-        cursor.execute(query)
-        rows = cursor.fetchall()
+        voisins = {}
+        for e1_id, e2_id, nb_communs, ratio in self.equipes_effectif_commun:
+            voisins.setdefault(e1_id, set()).add(e2_id)
+            voisins.setdefault(e2_id, set()).add(e1_id)
+        
+        cliques = []
+        
+        def bron_kerbosch(clique: set, candidats: set, exclus: set):
+            if not candidats and not exclus:
+                cliques.append(sorted(clique))
+                return
+            pivot = max(candidats | exclus, key=lambda e: len(voisins[e] & candidats))
+            for equipe in list(candidats - voisins[pivot]):
+                bron_kerbosch(clique | {equipe}, candidats & voisins[equipe], exclus & voisins[equipe])
+                candidats = candidats - {equipe}
+                exclus = exclus | {equipe}
+        
+        bron_kerbosch(set(), set(voisins), set())
+        return sorted(cliques)
+    
+    def _load_blacklist_gymnases(self, results: Dict[str, List[Dict]]):
+        """Charge les dates d'indisponibilité des gymnases depuis la table blacklist_gymnase."""
+        rows = results['blacklist_gymnases']
         
         for row in rows:
             gymnase_id = str(row['id_gymnase'])
@@ -896,8 +923,7 @@ class UfolepDatabaseLoader:
         
         # Stats
         total_dates = sum(len(dates) for dates in self.blacklist_gymnases.values())
-        cursor.close()
-        print(f"[INFO] Blacklist gymnases: {len(self.blacklist_gymnases)} gymnases, {total_dates} dates d'indisponibilité")
+        logger.info(f"[INFO] Blacklist gymnases: {len(self.blacklist_gymnases)} gymnases, {total_dates} dates d'indisponibilité")
     
     def is_gymnase_available(self, gymnase_id: str, date_obj) -> bool:
         """Vérifie si un gymnase est disponible à une date donnée."""
@@ -911,14 +937,13 @@ class UfolepDatabaseLoader:
         Retourne l'équipe qui s'est le plus déplacée (donc qui devrait recevoir maintenant).
         Retourne None si pas d'historique ou si équilibré.
         """
-        pair = tuple(sorted([equipe1_id, equipe2_id]))
-        
-        if pair not in self.historique_deplacements:
+        number1, number2 = self.team_numbers.get(equipe1_id), self.team_numbers.get(equipe2_id)
+        if number1 is None or number2 is None:
             return None
-        
-        hist = self.historique_deplacements[pair]
-        receptions_e1 = hist.get(equipe1_id, 0)
-        receptions_e2 = hist.get(equipe2_id, 0)
+        receptions = self.historique_deplacements.get(pair_key(number1, number2))
+        if receptions is None:
+            return None
+        receptions_e1, receptions_e2 = receptions if number1 < number2 else reversed(receptions)
         
         # Celui qui a le moins reçu devrait recevoir maintenant
         if receptions_e1 < receptions_e2:
@@ -933,11 +958,11 @@ def test_connection():
     """Teste la connexion à la base de données."""
     loader = UfolepDatabaseLoader()
     if loader.connect():
-        print("[OK] Test de connexion reussi")
+        logger.info("[OK] Test de connexion reussi")
         loader.disconnect()
         return True
     else:
-        print("[ERREUR] Test de connexion echoue")
+        logger.error("[ERREUR] Test de connexion echoue")
         return False
 
 
@@ -946,15 +971,15 @@ def test_data_loading():
     loader = UfolepDatabaseLoader()
     if loader.load_all_data():
         summary = loader.get_summary()
-        print("\n[INFO] Resume des donnees chargees:")
+        logger.info("\n[INFO] Resume des donnees chargees:")
         for key, value in summary.items():
-            print(f"  - {key}: {value}")
+            logger.info(f"  - {key}: {value}")
         
         # Afficher les divisions valides
         valid_divisions = loader.get_divisions_with_enough_teams(3)
-        print(f"\n[INFO] Divisions avec au moins 3 equipes: {len(valid_divisions)}")
+        logger.info(f"\n[INFO] Divisions avec au moins 3 equipes: {len(valid_divisions)}")
         for div in valid_divisions:
-            print(f"  - {div.nom}: {len(div.equipes)} équipes")
+            logger.info(f"  - {div.nom}: {len(div.equipes)} équipes")
         
         return True
     else:
@@ -962,7 +987,8 @@ def test_data_loading():
 
 
 if __name__ == "__main__":
-    print("Test de connexion MySQL...")
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    logger.info("Test de connexion MySQL...")
     if test_connection():
-        print("\nTest de chargement des données...")
+        logger.info("\nTest de chargement des données...")
         test_data_loading()
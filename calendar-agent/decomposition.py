@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+"""
+Résolution décomposée par division pour le scheduler UFOLEP.
+
+Les divisions ne sont couplées que par la capacité des gymnases et les effectifs communs :
+chaque groupe de divisions est résolu dans son propre modèle CP-SAT, en parallèle dans un
+pool de processus. Un modèle de réparation global corrige ensuite les dépassements de
+capacité gymnase/date et les conflits d'effectif commun entre divisions : les matchs des
+équipes en conflit restent libres, tous les autres matchs sont fixés à leur solution
+(repair_solution, réutilisé par le mode en deux étapes).
+"""
+
+import copy
+import logging
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import List, Optional, Tuple
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from candidates import CandidateTable
+from constraint_index import ConstraintIndex
+from run_logging import quiet
+from solve_callbacks import ObjectiveStopCallback
+from solver_profiles import PROFILES, SolverProfile
+from worker_pool import init_worker, picklable_scheduler, worker_scheduler
+
+logger = logging.getLogger(__name__)
+
+# Part du temps limite du profil donnée aux sous-modèles (le reste va à la réparation)
+GROUP_TIME_SHARE = 0.5
+
+
+def division_groups(scheduler, share_gyms: bool = False) -> List[List[str]]:
+    """Regroupe les divisions à résoudre ensemble.
+
+    Args:
+        scheduler: UfolepMySQLScheduler dont les données sont chargées
+        share_gyms: Si True, les divisions qui reçoivent dans un même gymnase sont résolues
+                    dans le même sous-modèle; sinon une division par sous-modèle
+
+    Returns:
+        Liste de groupes d'identifiants de division
+    """
+    divisions = [division for division in scheduler.divisions if len(division.teams) >= 3]
+    if not share_gyms:
+        return [[division.id] for division in divisions]
+
+    # Union-find des divisions sur les gymnases de réception
+    parent = {division.id: division.id for division in divisions}
+
+    def find(div_id: str) -> str:
+        while parent[div_id] != div_id:
+            parent[div_id] = parent[parent[div_id]]
+            div_id = parent[div_id]
+        return div_id
+
+    division_by_gym = {}
+    for division in divisions:
+        for team in division.teams:
+            for ts in team.time_slots:
+                other = division_by_gym.setdefault(ts.gymnase_id, division.id)
+                parent[find(division.id)] = find(other)
+
+    groups = {}
+    for division in divisions:
+        groups.setdefault(find(division.id), []).append(division.id)
+    return list(groups.values())
+
+
+def _sub_scheduler(scheduler, division_ids: List[str]):
+    """Scheduler restreint aux divisions demandées (mêmes données chargées)."""
+    sub = copy.copy(scheduler)
+    sub.divisions = [division for division in scheduler.divisions if division.id in division_ids]
+    sub.teams = [team for division in sub.divisions for team in division.teams]
+    sub._index_teams()
+    sub.matches = []
+    sub.prebuilt_candidates = None  # Candidats du scheduler complet
+    return sub
+
+
+def _solve_group(division_ids: List[str], profile: SolverProfile) -> tuple:
+    """Résout le sous-modèle d'un groupe de divisions (exécuté dans un processus du pool).
+
+    Returns:
+        (division_ids, statut, [(domicile_id, exterieur_id, date, creneau_id)], durée en secondes)
+    """
+    start = time.perf_counter()
+    sub = _sub_scheduler(worker_scheduler(), division_ids)
+    with quiet():
+        model, candidates, index = sub.build_model()
+
+    solver = profile.create_solver()
+    status = solver.Solve(model, ObjectiveStopCallback(len(index.by_match), profile.target_gap))
+
+    selected = []
+    if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
+        for row in candidates.selected_rows(solver).tolist():
+            selected.append((
+                candidates.teams[candidates.home[row]].id,
+                candidates.teams[candidates.away[row]].id,
+                candidates.dates[candidates.date_idx[row]],
+                candidates.slots[candidates.slot[row]].id
+            ))
+    return division_ids, solver.StatusName(status), selected, time.perf_counter() - start
+
+
+def _locate_rows(candidates: CandidateTable, solutions: list) -> np.ndarray:
+    """Lignes de la CandidateTable globale correspondant aux matchs retenus par les sous-modèles."""
+    team_index = {team.id: i for i, team in enumerate(candidates.teams)}
+    date_index = {d: i for i, d in enumerate(candidates.dates)}
+    slot_index = {ts.id: i for i, ts in enumerate(candidates.slots)}
+    row_of = {
+        key: row for row, key in enumerate(zip(candidates.home.tolist(), candidates.away.tolist(),
+                                               candidates.date_idx.tolist(), candidates.slot.tolist()))
+    }
+    rows = [row_of[(team_index[home_id], team_index[away_id], date_index[match_date], slot_index[slot_id])]
+            for home_id, away_id, match_date, slot_id in solutions]
+    return np.array(sorted(rows), dtype=np.int64)
+
+
+def _conflicting_rows(scheduler, index: ConstraintIndex, chosen: np.ndarray) -> Tuple[set, int, int]:
+    """Lignes retenues qui violent la capacité gymnase/date ou une clique d'effectif commun.
+
+    Returns:
+        (lignes en conflit, nb de dépassements gymnase, nb de conflits d'effectif commun)
+    """
+    candidates = index.candidates
+    chosen_mask = np.zeros(len(candidates), dtype=bool)
+    chosen_mask[chosen] = True
+    conflicts = set()
+
+    gym_overflows = 0
+    for (gym, _), rows in index.by_gym_date.items():
+        used = rows[chosen_mask[rows]]
+        gymnase = scheduler.db_loader.gymnases.get(candidates.gym_ids[gym])
+        if len(used) > gymnase.nb_terrains:
+            conflicts.update(used.tolist())
+            gym_overflows += 1
+
+    roster_conflicts = 0
+    team_index = {team.id: i for i, team in enumerate(candidates.teams)}
+    for clique in scheduler.db_loader.get_cliques_effectif_commun():
+        clique_dates = [index.by_team[team_index[e_id]] for e_id in clique
+                        if team_index.get(e_id) in index.by_team]
+        dates = set()
+        for team_dates in clique_dates:
+            dates.update(team_dates)
+        for date_idx in dates:
+            # Un match entre deux équipes de la clique compte deux fois, comme dans le modèle
+            rows = np.concatenate([team_dates[date_idx] for team_dates in clique_dates
+                                   if date_idx in team_dates])
+            used = rows[chosen_mask[rows]]
+            if len(used) > 1:
+                conflicts.update(used.tolist())
+                roster_conflicts += 1
+
+    return conflicts, gym_overflows, roster_conflicts
+
+
+def solve_decomposed(scheduler, max_time_group: Optional[float] = None, max_time_repair: Optional[float] = None,
+                     max_workers: Optional[int] = None, share_gyms: bool = False,
+                     profile: SolverProfile = None) -> Tuple[CandidateTable, Optional[np.ndarray]]:
+    """Résout chaque groupe de divisions en parallèle puis répare les conflits globaux.
+
+    Args:
+        scheduler: UfolepMySQLScheduler dont les données sont chargées (mode round-robin)
+        max_time_group: Limite de temps de chaque sous-modèle (secondes). Par défaut,
+                        GROUP_TIME_SHARE du temps limite du profil, réparti entre les vagues
+                        de sous-modèles (groupes / processus)
+        max_time_repair: Limite de temps du modèle de réparation (secondes). Par défaut, le
+                         temps limite du profil moins le temps déjà passé sur les sous-modèles
+        max_workers: Nombre de processus du pool (par défaut: nombre de cœurs)
+        share_gyms: Regrouper les divisions qui partagent un gymnase (voir division_groups)
+        profile: Profil solveur des sous-modèles et de la réparation; son temps limite est
+                 le budget total de la décomposition, le nombre de workers est fixé ici
+
+    Returns:
+        (candidates, lignes retenues) de la CandidateTable globale, lignes à None en cas d'échec
+    """
+    start = time.perf_counter()
+    groups = division_groups(scheduler, share_gyms)
+    cpu_count = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers or cpu_count, len(groups)))
+    num_workers = max(1, cpu_count // max_workers)
+    profile = profile or PROFILES['defaut']
+    if max_time_group is None:
+        waves = max(1, math.ceil(len(groups) / max_workers))
+        max_time_group = max(1.0, profile.max_time_in_seconds * GROUP_TIME_SHARE / waves)
+    group_profile = replace(profile, max_time_in_seconds=max_time_group, num_workers=num_workers)
+    logger.info(f"[INFO] Décomposition: {len(groups)} sous-modèles, {max_workers} processus "
+                f"({num_workers} workers CP-SAT chacun, {max_time_group:.0f}s par sous-modèle)")
+
+    solutions = []
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker,
+                             initargs=(picklable_scheduler(scheduler),)) as pool:
+        futures = [pool.submit(_solve_group, ids, group_profile) for ids in groups]
+        for future in futures:
+            division_ids, status, selected, seconds = future.result()
+            logger.info(f"       - {', '.join(division_ids)}: {status}, {len(selected)} matchs en {seconds:.1f}s")
+            solutions.extend(selected)
+    logger.info(f"[INFO] Sous-modèles résolus en {time.perf_counter() - start:.1f}s")
+
+    # Modèle global: contraintes complètes, solution des sous-modèles en indice
+    model, candidates, index = scheduler.build_model()
+    chosen = _locate_rows(candidates, solutions)
+    conflicts, gym_overflows, roster_conflicts = _conflicting_rows(scheduler, index, chosen)
+    logger.info(f"[INFO] Réparation: {gym_overflows} dépassements gymnase/date, "
+                f"{roster_conflicts} conflits d'effectif commun")
+
+    conflict_rows = np.array(sorted(conflicts), dtype=np.int64)
+    free_teams = np.union1d(candidates.home[conflict_rows], candidates.away[conflict_rows])
+    if max_time_repair is None:
+        max_time_repair = max(1.0, profile.max_time_in_seconds - (time.perf_counter() - start))
+    selected_rows = repair_solution(model, candidates, index, chosen, free_teams,
+                                    profile, max_time_repair)
+    logger.info(f"[INFO] Total décomposition: {time.perf_counter() - start:.1f}s")
+    return candidates, selected_rows
+
+
+def repair_solution(model: cp_model.CpModel, candidates: CandidateTable, index: ConstraintIndex,
+                    chosen: np.ndarray, free_teams: np.ndarray, profile: SolverProfile,
+                    max_time: float) -> Optional[np.ndarray]:
+    """Résout le modèle complet en fixant une solution partielle hors des équipes libres.
+
+    Les matchs des équipes libres et ceux absents de la solution partielle restent libres
+    (libérer seulement les matchs en conflit rendrait l'équilibre dom/ext infaisable); tous
+    les autres matchs sont fixés à leur ligne retenue (fix_outside). La solution partielle
+    sert d'indice.
+
+    Args:
+        model, candidates, index: Modèle complet construit par build_model
+        chosen: Lignes retenues par la solution partielle
+        free_teams: Index des équipes dont les matchs restent libres
+        profile: Profil solveur (le temps limite est remplacé par max_time)
+        max_time: Limite de temps de la réparation (secondes)
+
+    Returns:
+        Lignes retenues, ou None si la réparation échoue
+    """
+    free_matches = set(candidates.match_id[np.isin(candidates.home, free_teams)
+                                           | np.isin(candidates.away, free_teams)].tolist())
+    fixed_rows = fix_outside(model, candidates, chosen, free_matches)
+    n_fixed = len(np.unique(candidates.match_id[fixed_rows]))
+    logger.info(f"[INFO] Réparation: {len(np.unique(candidates.match_id)) - n_fixed} matchs libres, {n_fixed} matchs fixés")
+
+    solver = replace(profile, max_time_in_seconds=max_time,
+                     num_workers=profile.num_workers or os.cpu_count() or 1).create_solver()
+    callback = ObjectiveStopCallback(len(index.by_match), profile.target_gap)
+    status = solver.Solve(model, callback)
+    logger.info(f"[INFO] Réparation: {solver.StatusName(status)} en {solver.WallTime():.1f}s, {callback.summary()}")
+
+    if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
+        return candidates.selected_rows(solver)
+    return None
+
+
+def fix_outside(model: cp_model.CpModel, candidates: CandidateTable, chosen: np.ndarray,
+                free_matches: set) -> np.ndarray:
+    """Fixe les matchs hors voisinage à leur solution et met la solution en indice.
+
+    Les matchs de free_matches et ceux absents de la solution restent libres. Les variables
+    sont retrouvées par leur index dans le proto: model peut être une copie du modèle de
+    candidates.
+
+    Returns:
+        Lignes fixées
+    """
+    chosen_mask = np.zeros(len(candidates), dtype=bool)
+    chosen_mask[chosen] = True
+    variables = [model.GetBoolVarFromProtoIndex(i) for i in candidates.proto_index[candidates.var_index].tolist()]
+    # Remplace les indices d'un éventuel démarrage à chaud
+    model.ClearHints()
+    for var, value in zip(variables, chosen_mask.tolist()):
+        model.AddHint(var, value)
+
+    free = set(free_matches) | (set(candidates.match_id.tolist()) - set(candidates.match_id[chosen].tolist()))
+    fixed_rows = np.flatnonzero(~np.isin(candidates.match_id, list(free)))
+    for row in fixed_rows.tolist():
+        model.Add(variables[row] == int(chosen_mask[row]))
+    return fixed_rows
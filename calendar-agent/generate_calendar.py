@@ -7,20 +7,86 @@ Usage:
     python generate_calendar.py c kh             # Idem
     python generate_calendar.py m f mo           # Championnats uniquement
     python generate_calendar.py c                # Coupes uniquement
+    python generate_calendar.py m f mo --decompose   # Une division par processus + réparation
+    python generate_calendar.py m f mo --decompose --share-gyms   # Divisions d'un même gymnase ensemble
+    python generate_calendar.py m f mo --two-stage   # Semaine/domicile puis créneau par semaine
+    python generate_calendar.py m f mo --greedy      # Aperçu glouton immédiat, sans CP-SAT
+    python generate_calendar.py m f mo --greedy-hints    # CP-SAT part du calendrier glouton
+    python generate_calendar.py m f mo --greedy --lns=600   # Glouton puis 10 min d'amélioration LNS
+    python generate_calendar.py m f mo --repair      # Place ensuite les non programmés (relaxations)
+    python generate_calendar.py m --warm-start       # Part des matchs NOT_CONFIRMED en BDD
+    python generate_calendar.py m --warm-start=insert_matches_m.sql   # Part d'un export SQL
+    python generate_calendar.py m f mo --checkpoint --time=3600     # Sauvegarde chaque amélioration
+    python generate_calendar.py m f mo --checkpoint --resume        # Reprend après interruption
+    python generate_calendar.py m f mo --model-cache --time=600     # Réutilise le modèle si données inchangées
+    python generate_calendar.py m f mo --export-model=modele_m_f_mo.pb   # Export pour réglage hors ligne
+    python generate_calendar.py m --cprofile --tracemalloc   # Profil .prof et pic mémoire dans le rapport
+    python generate_calendar.py m --verbose --log-json       # Détail match par match, log JSON lines
+    python generate_calendar.py m f mo --snapshot=snapshot_m_f_mo.json.gz   # Hors ligne (capture_snapshot.py)
+    python generate_calendar.py m f mo --sqlite=ufolep_13volley.db          # Copie SQLite de la base
+    python generate_calendar.py m f mo --data-cache   # Relit data_cache/ si les tables MySQL n'ont pas changé
+
+Chaque exécution écrit un rapport JSON (durée des phases, taille du modèle, pic mémoire)
+dans generation_<codes>_report.json, à côté du fichier generation_<codes>.log. Le détail
+match par match (calendrier, itérations LNS, placements) n'est journalisé qu'avec --verbose.
+Avec --data-cache, les données MySQL sont mises en cache dans data_cache/ et relues depuis le
+disque tant que l'empreinte des tables (date de modification, AUTO_INCREMENT) ne change pas
+(voir data_sources.py).
+
+Options solveur (voir solver_profiles.py):
+    --profile=rapide|defaut|approfondi   --time=S   --workers=N   --seed=N
+    --portfolio                          # Variantes du profil en parallèle, garde la meilleure
 """
 
 import sys
+from data_sources import MySQLSource, SQLiteSource, SnapshotSource, cached_source
+from solver_profiles import parse_solver_args
 from ufolep_mysql_final import main
 
 if __name__ == "__main__":
     # Récupérer les codes de compétition depuis les arguments
-    if len(sys.argv) > 1:
-        competition_codes = sys.argv[1:]
+    args, profile, portfolio = parse_solver_args(sys.argv[1:])
+    decompose = '--decompose' in args
+    share_gyms = '--share-gyms' in args
+    two_stage = '--two-stage' in args
+    greedy = '--greedy' in args
+    greedy_hints = '--greedy-hints' in args
+    repair = '--repair' in args
+    cprofile = '--cprofile' in args
+    trace_memory = '--tracemalloc' in args
+    verbose = '--verbose' in args
+    log_json = '--log-json' in args
+    warm_start = '--warm-start' in args
+    warm_start_file = next((arg.partition('=')[2] for arg in args if arg.startswith('--warm-start=')), None)
+    checkpoint = '--checkpoint' in args
+    resume = '--resume' in args
+    use_model_cache = '--model-cache' in args
+    export_model_file = next((arg.partition('=')[2] for arg in args if arg.startswith('--export-model=')), None)
+    lns_budget = next((float(arg.partition('=')[2]) for arg in args if arg.startswith('--lns=')), None)
+    snapshot_file = next((arg.partition('=')[2] for arg in args if arg.startswith('--snapshot=')), None)
+    sqlite_file = next((arg.partition('=')[2] for arg in args if arg.startswith('--sqlite=')), None)
+    data_source = SnapshotSource(snapshot_file) if snapshot_file else SQLiteSource(sqlite_file) if sqlite_file else None
+    data_cache = '--data-cache' in args
+    args = [arg for arg in args if arg not in ('--decompose', '--share-gyms', '--two-stage', '--greedy',
+                                               '--greedy-hints', '--repair', '--cprofile', '--tracemalloc',
+                                               '--verbose', '--log-json', '--checkpoint', '--resume',
+                                               '--model-cache', '--data-cache')
+            and not arg.startswith('--warm-start') and not arg.startswith('--export-model=')
+            and not arg.startswith('--lns=') and not arg.startswith('--snapshot=') and not arg.startswith('--sqlite=')]
+    if args:
+        competition_codes = args
     else:
         # Par défaut: coupes et kh
         competition_codes = ['c', 'kh']
+    if data_source is None and data_cache:
+        data_source = cached_source(MySQLSource(), competition_codes)
     
     print(f"Génération du calendrier pour: {', '.join(competition_codes)}")
     print("=" * 60)
     
-    main(competition_codes)
+    main(competition_codes, decompose=decompose, profile=profile, portfolio=portfolio,
+         warm_start=warm_start, warm_start_file=warm_start_file, checkpoint=checkpoint, resume=resume,
+         use_model_cache=use_model_cache, export_model_file=export_model_file, two_stage=two_stage,
+         greedy=greedy, greedy_hints=greedy_hints, lns_budget=lns_budget,
+         repair=repair, share_gyms=share_gyms, cprofile=cprofile, trace_memory=trace_memory,
+         verbose=verbose, log_json=log_json, data_source=data_source)
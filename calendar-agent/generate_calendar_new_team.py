@@ -15,19 +15,26 @@ Contraintes respectées:
 
 Usage:
     python generate_calendar_new_team.py
+    python generate_calendar_new_team.py --data-cache   # Relit data_cache/ si les tables MySQL n'ont pas changé
 """
 
-import sys
+import logging
 import os
+import sys
 from datetime import datetime, date, timedelta, time as dt_time
 from typing import List, Dict, Set, Tuple
 from dataclasses import dataclass
 
 import mysql.connector
+import numpy as np
 from ortools.sat.python import cp_model
 
+from data_sources import MySQLSource, cached_source
 from db_config import DB_CONFIG, TABLE_NAMES, COLUMN_MAPPING
 from db_loader_real import UfolepDatabaseLoader
+from candidates import CandidateMatrix
+from constraint_index import ConstraintIndex
+from run_logging import setup_logging, shutdown_logging
 
 # Import des structures et constantes depuis le module principal
 from ufolep_mysql_final import (
@@ -36,6 +43,8 @@ from ufolep_mysql_final import (
     UfolepMySQLScheduler,
 )
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class ConfirmedMatch:
@@ -91,11 +100,11 @@ def load_all_confirmed_matches() -> List[ConfirmedMatch]:
         cursor.close()
         connection.close()
         
-        print(f"[OK] {len(matches)} matchs confirmés chargés (toutes compétitions)")
+        logger.info(f"[OK] {len(matches)} matchs confirmés chargés (toutes compétitions)")
         return matches
         
     except mysql.connector.Error as e:
-        print(f"[ERREUR] Impossible de charger les matchs confirmés: {e}")
+        logger.error(f"[ERREUR] Impossible de charger les matchs confirmés: {e}")
         return []
 
 
@@ -142,8 +151,8 @@ def find_new_team(scheduler: UfolepMySQLScheduler, division_id: str,
             break
     
     if not target_division:
-        print(f"[ERREUR] Division '{division_id}' non trouvée")
-        print(f"[INFO] Divisions disponibles: {[d.id for d in scheduler.divisions]}")
+        logger.error(f"[ERREUR] Division '{division_id}' non trouvée")
+        logger.info(f"[INFO] Divisions disponibles: {[d.id for d in scheduler.divisions]}")
         return None
     
     # Collecter les IDs d'équipes qui ont des matchs confirmés dans cette division
@@ -157,13 +166,13 @@ def find_new_team(scheduler: UfolepMySQLScheduler, division_id: str,
     new_teams = [t for t in target_division.teams if t.id not in teams_with_matches]
     
     if len(new_teams) == 0:
-        print(f"[ERREUR] Toutes les équipes de {target_division.nom} ont déjà des matchs confirmés")
+        logger.error(f"[ERREUR] Toutes les équipes de {target_division.nom} ont déjà des matchs confirmés")
         return None
     elif len(new_teams) > 1:
-        print(f"[ATTENTION] Plusieurs équipes sans matchs trouvées:")
+        logger.warning(f"[ATTENTION] Plusieurs équipes sans matchs trouvées:")
         for t in new_teams:
-            print(f"  - {t.nom} (ID: {t.id})")
-        print(f"[INFO] Sélection de la première: {new_teams[0].nom}")
+            logger.warning(f"  - {t.nom} (ID: {t.id})")
+        logger.info(f"[INFO] Sélection de la première: {new_teams[0].nom}")
     
     return new_teams[0]
 
@@ -179,234 +188,167 @@ def generate_new_team_matches(scheduler: UfolepMySQLScheduler,
     
     # Générer les dates valides
     valid_dates = scheduler._generate_valid_dates()
-    print(f"[INFO] {len(valid_dates)} dates valides dans la période")
+    logger.info(f"[INFO] {len(valid_dates)} dates valides dans la période")
     
     # Identifier les adversaires (toutes les autres équipes de la division)
     opponents = [t for t in division.teams if t.id != new_team.id]
-    print(f"[INFO] {len(opponents)} adversaires à planifier:")
+    logger.info(f"[INFO] {len(opponents)} adversaires à planifier:")
     for opp in opponents:
         blocked = len(team_blocked_dates.get(opp.id, set()))
-        print(f"  - {opp.nom} ({blocked} dates déjà bloquées)")
+        logger.info(f"  - {opp.nom} ({blocked} dates déjà bloquées)")
     
     # Créer le modèle OR-Tools
     model = cp_model.CpModel()
-    matches_data = []
-    match_id = 0
     
-    for opponent in opponents:
-        both_teams = [new_team, opponent]
-        
-        for date_obj in valid_dates:
-            # Vérifier si l'une des deux équipes joue déjà ce jour
-            new_team_blocked = date_obj in team_blocked_dates.get(new_team.id, set())
-            opponent_blocked = date_obj in team_blocked_dates.get(opponent.id, set())
-            
-            if new_team_blocked or opponent_blocked:
-                continue
-            
-            # Vérifier si l'une des deux équipes joue déjà cette semaine
-            week_num = date_obj.isocalendar()[1]
-            new_team_week_blocked = week_num in team_blocked_weeks.get(new_team.id, set())
-            opponent_week_blocked = week_num in team_blocked_weeks.get(opponent.id, set())
-            
-            if new_team_week_blocked or opponent_week_blocked:
-                continue
-            
-            # Essayer chaque créneau des deux équipes (match chez l'une ou l'autre)
-            for home_team, away_team in [(new_team, opponent), (opponent, new_team)]:
-                for time_slot in home_team.time_slots:
-                    if date_obj.weekday() + 1 != time_slot.jour_semaine:
-                        continue
-                    
-                    # Vérifier blacklist gymnase
-                    if not scheduler.db_loader.is_gymnase_available(time_slot.gymnase_id, date_obj):
-                        continue
-                    
-                    # Vérifier capacité gymnase restante (après matchs confirmés)
-                    gym_key = (time_slot.gymnase_id, date_obj)
-                    current_usage = gym_date_usage.get(gym_key, 0)
-                    gymnase = scheduler.db_loader.gymnases.get(time_slot.gymnase_id)
-                    if gymnase and current_usage >= gymnase.nb_terrains:
-                        continue
-                    
-                    var_name = f"match_{match_id}_{home_team.id}_vs_{away_team.id}_{date_obj}_{time_slot.id}"
-                    match_var = model.NewBoolVar(var_name)
-                    
-                    matches_data.append({
-                        'var': match_var,
-                        'match_id': match_id,
-                        'home_team': home_team,
-                        'away_team': away_team,
-                        'date': date_obj,
-                        'time_slot': time_slot,
-                        'division': division
-                    })
-        
-        match_id += 1
-    
-    if not matches_data:
-        print("[ERREUR] Aucune combinaison possible trouvée")
+    # Candidats de chaque adversaire (match = index de l'adversaire), réception chez l'une ou l'autre
+    teams = [new_team] + opponents
+    match_ids = np.repeat(np.arange(len(opponents), dtype=np.int64), 2)
+    homes = np.zeros(2 * len(opponents), dtype=np.int64)
+    homes[1::2] = np.arange(1, len(teams))
+    aways = np.zeros(2 * len(opponents), dtype=np.int64)
+    aways[0::2] = np.arange(1, len(teams))
+    
+    matrix = CandidateMatrix(valid_dates, teams, scheduler.db_loader.blacklist_gymnases)
+    candidates = matrix.enumerate(match_ids, homes, aways)
+    
+    # Dates et semaines déjà occupées par les matchs confirmés, par équipe
+    date_index = {d: i for i, d in enumerate(matrix.dates)}
+    blocked_dates = np.zeros((len(teams), len(matrix.dates)), dtype=bool)
+    blocked_weeks = np.zeros((len(teams), len(matrix.weeks)), dtype=bool)
+    for team_idx, team in enumerate(teams):
+        for blocked_date in team_blocked_dates.get(team.id, set()):
+            if blocked_date in date_index:
+                blocked_dates[team_idx, date_index[blocked_date]] = True
+        team_weeks = team_blocked_weeks.get(team.id, set())
+        for week_idx, (_, week_num) in enumerate(matrix.weeks):
+            blocked_weeks[team_idx, week_idx] = week_num in team_weeks
+    
+    # Usage des gymnases par les matchs confirmés et capacité (illimitée si gymnase inconnu)
+    gym_usage = np.zeros((len(matrix.gym_ids), len(matrix.dates)), dtype=np.int64)
+    gym_capacity = np.full(len(matrix.gym_ids), np.iinfo(np.int64).max, dtype=np.int64)
+    gym_index = {gym_id: i for i, gym_id in enumerate(matrix.gym_ids)}
+    for gym_idx, gym_id in enumerate(matrix.gym_ids):
+        gymnase = scheduler.db_loader.gymnases.get(gym_id)
+        if gymnase:
+            gym_capacity[gym_idx] = gymnase.nb_terrains
+    for (gym_id, usage_date), count in gym_date_usage.items():
+        if gym_id in gym_index and usage_date in date_index:
+            gym_usage[gym_index[gym_id], date_index[usage_date]] = count
+    
+    # Filtrer en bloc: équipes libres ce jour et cette semaine, gymnase avec capacité restante
+    keep = ~(blocked_dates[candidates.home, candidates.date_idx]
+             | blocked_dates[candidates.away, candidates.date_idx]
+             | blocked_weeks[candidates.home, candidates.week_idx]
+             | blocked_weeks[candidates.away, candidates.week_idx])
+    keep &= gym_usage[candidates.gym, candidates.date_idx] < gym_capacity[candidates.gym]
+    candidates = candidates.select(np.flatnonzero(keep))
+    
+    if not len(candidates):
+        logger.error("[ERREUR] Aucune combinaison possible trouvée")
         return []
     
-    print(f"[INFO] {len(matches_data)} combinaisons possibles pour {match_id} matchs")
+    candidates.create_variables(model)
+    logger.info(f"[INFO] {len(candidates)} combinaisons possibles pour {len(opponents)} matchs")
     
-    # CONTRAINTE 1: Chaque match (paire d'équipes) programmé exactement 0 ou 1 fois, maximiser
-    matches_by_id = {}
-    for md in matches_data:
-        mid = md['match_id']
-        if mid not in matches_by_id:
-            matches_by_id[mid] = []
-        matches_by_id[mid].append(md['var'])
+    # Regroupements partagés par toutes les contraintes
+    index = ConstraintIndex(candidates)
     
-    for mid, vars_list in matches_by_id.items():
-        model.Add(sum(vars_list) <= 1)
+    # CONTRAINTE 1: Chaque match (paire d'équipes) programmé exactement 0 ou 1 fois, maximiser
+    for rows in index.by_match.values():
+        model.Add(cp_model.LinearExpr.Sum(candidates.vars_at(rows)) <= 1)
     
     # Maximiser le nombre de matchs programmés
-    all_vars = [md['var'] for md in matches_data]
-    model.Maximize(sum(all_vars))
+    model.Maximize(cp_model.LinearExpr.Sum(candidates.vars_at(candidates.rows)))
     
     # CONTRAINTE 2: Max 1 match par équipe par date (parmi les nouveaux matchs)
-    team_date_vars: Dict[Tuple[str, date], list] = {}
-    for md in matches_data:
-        for team in [md['home_team'], md['away_team']]:
-            key = (team.id, md['date'])
-            if key not in team_date_vars:
-                team_date_vars[key] = []
-            team_date_vars[key].append(md['var'])
-    
-    for vars_list in team_date_vars.values():
-        model.Add(sum(vars_list) <= 1)
+    team_date_rows = index.by_team_date
+    for rows in team_date_rows.values():
+        model.Add(cp_model.LinearExpr.Sum(candidates.vars_at(rows)) <= 1)
     
     # CONTRAINTE 3: Max 1 match par équipe par semaine (parmi les nouveaux matchs)
-    team_week_vars: Dict[Tuple[str, int], list] = {}
-    for md in matches_data:
-        week_num = md['date'].isocalendar()[1]
-        for team in [md['home_team'], md['away_team']]:
-            key = (team.id, week_num)
-            if key not in team_week_vars:
-                team_week_vars[key] = []
-            team_week_vars[key].append(md['var'])
-    
-    for vars_list in team_week_vars.values():
-        model.Add(sum(vars_list) <= 1)
+    for rows in index.by_team_week.values():
+        model.Add(cp_model.LinearExpr.Sum(candidates.vars_at(rows)) <= 1)
     
     # CONTRAINTE 4: Capacité gymnases (entre nouveaux matchs sur le même gymnase/date)
-    gym_date_vars: Dict[Tuple[str, date], list] = {}
-    for md in matches_data:
-        key = (md['time_slot'].gymnase_id, md['date'])
-        if key not in gym_date_vars:
-            gym_date_vars[key] = []
-        gym_date_vars[key].append(md['var'])
-    
-    for (gym_id, date_obj), vars_list in gym_date_vars.items():
-        gymnase = scheduler.db_loader.gymnases.get(gym_id)
+    for (gym_idx, date_idx), rows in index.by_gym_date.items():
+        gymnase = scheduler.db_loader.gymnases.get(matrix.gym_ids[gym_idx])
         if gymnase:
-            existing_usage = gym_date_usage.get((gym_id, date_obj), 0)
-            remaining_capacity = gymnase.nb_terrains - existing_usage
+            remaining_capacity = gymnase.nb_terrains - int(gym_usage[gym_idx, date_idx])
             if remaining_capacity > 0:
-                model.Add(sum(vars_list) <= remaining_capacity)
+                model.Add(cp_model.LinearExpr.Sum(candidates.vars_at(rows)) <= remaining_capacity)
             else:
                 # Pas de capacité restante (ne devrait pas arriver vu le filtrage)
-                model.Add(sum(vars_list) == 0)
+                model.Add(cp_model.LinearExpr.Sum(candidates.vars_at(rows)) == 0)
     
     # CONTRAINTE 5: Effectifs communs - éviter que 2 équipes avec joueurs partagés jouent le même jour
+    # (une équipe dont le partenaire d'effectif a déjà un match confirmé ce jour-là ne joue pas)
     paires_effectif_commun = scheduler.db_loader.get_equipes_avec_effectif_commun()
     if paires_effectif_commun:
-        # Dates bloquées par les matchs confirmés + nouveaux matchs
-        all_team_date_vars = {}
-        for md in matches_data:
-            for team in [md['home_team'], md['away_team']]:
-                key = (team.id, md['date'])
-                if key not in all_team_date_vars:
-                    all_team_date_vars[key] = []
-                all_team_date_vars[key].append(md['var'])
-        
+        team_index = {team.id: i for i, team in enumerate(teams)}
         constraints_added = 0
         for e1_id, e2_id, nb_communs, ratio in paires_effectif_commun:
-            # Vérifier si la nouvelle équipe ou ses adversaires sont impliqués
-            if new_team.id not in (e1_id, e2_id):
-                # Pas directement la nouvelle équipe, mais vérifier si un adversaire est impliqué
-                pass
-            
-            for md in matches_data:
-                match_date = md['date']
-                # Si e1 a un match confirmé ce jour et e2 est impliquée dans un nouveau match
-                if e1_id in team_blocked_dates.get(e1_id, set()) and match_date in team_blocked_dates.get(e1_id, set()):
-                    vars_e2 = all_team_date_vars.get((e2_id, match_date), [])
-                    if vars_e2:
-                        model.Add(sum(vars_e2) == 0)
-                        constraints_added += 1
-                
-                if e2_id in team_blocked_dates.get(e2_id, set()) and match_date in team_blocked_dates.get(e2_id, set()):
-                    vars_e1 = all_team_date_vars.get((e1_id, match_date), [])
-                    if vars_e1:
-                        model.Add(sum(vars_e1) == 0)
+            for busy_id, other_id in [(e1_id, e2_id), (e2_id, e1_id)]:
+                other = team_index.get(other_id)
+                if other is None:
+                    continue
+                for busy_date in team_blocked_dates.get(busy_id, set()):
+                    if busy_date not in date_index:
+                        continue
+                    rows_other = team_date_rows.get((other, date_index[busy_date]))
+                    if rows_other is not None:
+                        model.Add(cp_model.LinearExpr.Sum(candidates.vars_at(rows_other)) == 0)
                         constraints_added += 1
         
         if constraints_added > 0:
-            print(f"[INFO] {constraints_added} contraintes effectif commun ajoutées")
+            logger.info(f"[INFO] {constraints_added} contraintes effectif commun ajoutées")
     
     # CONTRAINTE 6: Alternance dom/ext basée sur l'historique
-    teams_with_reception = {t.id for t in scheduler.teams if t.time_slots}
-    pair_home_vars = {}
-    
-    for md in matches_data:
-        home_id = md['home_team'].id
-        away_id = md['away_team'].id
-        pair = tuple(sorted([home_id, away_id]))
-        if pair not in pair_home_vars:
-            pair_home_vars[pair] = {pair[0]: [], pair[1]: []}
-        pair_home_vars[pair][home_id].append(md['var'])
+    match_home_rows = index.by_match_home
     
     forced = 0
-    for opponent in opponents:
-        pair = tuple(sorted([new_team.id, opponent.id]))
-        if pair not in pair_home_vars:
-            continue
-        
+    for opp_idx, opponent in enumerate(opponents):
         equipe_qui_doit_recevoir = scheduler.db_loader.get_equipe_qui_doit_recevoir(new_team.id, opponent.id)
         if equipe_qui_doit_recevoir:
-            other_id = new_team.id if equipe_qui_doit_recevoir != new_team.id else opponent.id
-            vars_other_home = pair_home_vars[pair].get(other_id, [])
-            if vars_other_home and other_id in teams_with_reception:
+            # Index de l'équipe qui ne doit pas recevoir: 0 = nouvelle équipe, opp_idx + 1 = adversaire
+            other = 0 if equipe_qui_doit_recevoir != new_team.id else opp_idx + 1
+            rows_other_home = match_home_rows.get((opp_idx, other))
+            if rows_other_home is not None and teams[other].time_slots:
                 # Interdire que l'autre équipe reçoive
-                model.Add(sum(vars_other_home) == 0)
+                model.Add(cp_model.LinearExpr.Sum(candidates.vars_at(rows_other_home)) == 0)
                 forced += 1
     
     if forced > 0:
-        print(f"[INFO] {forced} réceptions forcées par l'historique")
+        logger.info(f"[INFO] {forced} réceptions forcées par l'historique")
     
     # CONTRAINTE 7: Équilibre dom/ext pour la nouvelle équipe
     # Avec N matchs, viser au moins (N-1)//2 matchs à domicile
-    new_team_home_vars = [md['var'] for md in matches_data if md['home_team'].id == new_team.id]
-    new_team_away_vars = [md['var'] for md in matches_data if md['away_team'].id == new_team.id]
-    if new_team_home_vars:
+    new_team_home_rows = index.by_home.get(0)
+    if new_team_home_rows is not None:
         n_opponents = len(opponents)
         min_home = (n_opponents - 1) // 2  # 6 matchs -> min 2 dom
-        model.Add(sum(new_team_home_vars) >= min_home)
-        print(f"[INFO] Équilibre dom/ext: minimum {min_home} matchs à domicile imposé")
+        model.Add(cp_model.LinearExpr.Sum(candidates.vars_at(new_team_home_rows)) >= min_home)
+        logger.info(f"[INFO] Équilibre dom/ext: minimum {min_home} matchs à domicile imposé")
     
     # Résoudre
     solver = cp_model.CpSolver()
     solver.parameters.max_time_in_seconds = 60.0
     solver.parameters.log_search_progress = False
     
-    print("\n[INFO] Résolution en cours...")
+    logger.info("\n[INFO] Résolution en cours...")
     status = solver.Solve(model)
     
     if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
         result_matches = []
-        for md in matches_data:
-            if solver.Value(md['var']) == 1:
-                match = Match(
-                    id=f"new_match_{len(result_matches)}",
-                    equipe_domicile=md['home_team'],
-                    equipe_exterieur=md['away_team'],
-                    date=md['date'],
-                    time_slot=md['time_slot'],
-                    division=md['division']
-                )
-                result_matches.append(match)
+        for row in candidates.selected_rows(solver).tolist():
+            match = Match(
+                id=f"new_match_{len(result_matches)}",
+                equipe_domicile=teams[candidates.home[row]],
+                equipe_exterieur=teams[candidates.away[row]],
+                date=matrix.dates[candidates.date_idx[row]],
+                time_slot=matrix.slots[candidates.slot[row]],
+                division=division
+            )
+            result_matches.append(match)
         
         # Identifier les matchs non programmés
         programmed_opponents = {
@@ -415,22 +357,22 @@ def generate_new_team_matches(scheduler: UfolepMySQLScheduler,
         }
         unprogrammed = [opp for opp in opponents if opp.id not in programmed_opponents]
         
-        print(f"\n[OK] {len(result_matches)}/{len(opponents)} matchs programmés")
+        logger.info(f"\n[OK] {len(result_matches)}/{len(opponents)} matchs programmés")
         if unprogrammed:
-            print(f"[ATTENTION] {len(unprogrammed)} matchs non programmés:")
+            logger.warning(f"[ATTENTION] {len(unprogrammed)} matchs non programmés:")
             for opp in unprogrammed:
-                print(f"  - vs {opp.nom}")
+                logger.warning(f"  - vs {opp.nom}")
         
         return result_matches
     else:
-        print(f"[ÉCHEC] Pas de solution trouvée. Status: {solver.StatusName(status)}")
+        logger.error(f"[ÉCHEC] Pas de solution trouvée. Status: {solver.StatusName(status)}")
         return []
 
 
 def generate_sql_file(matches: List[Match], division: Division, filename: str) -> bool:
     """Génère un fichier SQL pour insérer uniquement les nouveaux matchs."""
     if not matches:
-        print("[ERREUR] Aucun match à exporter")
+        logger.error("[ERREUR] Aucun match à exporter")
         return False
     
     try:
@@ -483,16 +425,20 @@ def generate_sql_file(matches: List[Match], division: Division, filename: str) -
             f.write(',\n'.join(match_values))
             f.write(';\n')
         
-        print(f"[OK] Fichier SQL généré: {filename}")
+        logger.info(f"[OK] Fichier SQL généré: {filename}")
         return True
         
     except Exception as e:
-        print(f"[ERREUR] Impossible de générer le fichier SQL: {e}")
+        logger.error(f"[ERREUR] Impossible de générer le fichier SQL: {e}")
         return False
 
 
-def main():
-    """Fonction principale."""
+def main(data_cache: bool = False):
+    """Fonction principale.
+    
+    Args:
+        data_cache: Charger les données via le cache data_cache/ (voir data_sources.py)
+    """
     # Configuration
     COMPETITION_CODE = 'f'  # Féminin
     DIVISION_NUM = '5'      # Division 5
@@ -502,81 +448,65 @@ def main():
     script_dir = os.path.dirname(os.path.abspath(__file__))
     log_filename = os.path.join(script_dir, "generation_new_team.log")
     
-    class TeeOutput:
-        def __init__(self, filename):
-            self.terminal = sys.stdout
-            self.log = open(filename, 'w', encoding='utf-8')
-        def write(self, message):
-            self.terminal.write(message)
-            self.log.write(message)
-        def flush(self):
-            self.terminal.flush()
-            self.log.flush()
-        def close(self):
-            self.log.close()
-    
-    tee = TeeOutput(log_filename)
-    sys.stdout = tee
-    
-    print("=" * 60)
-    print("GÉNÉRATION INCRÉMENTALE - NOUVELLE ÉQUIPE")
-    print(f"Compétition: {COMPETITION_CODE} | Division: {DIVISION_NUM}")
-    print("=" * 60)
+    setup_logging(log_filename)
+    
+    logger.info("=" * 60)
+    logger.info("GÉNÉRATION INCRÉMENTALE - NOUVELLE ÉQUIPE")
+    logger.info(f"Compétition: {COMPETITION_CODE} | Division: {DIVISION_NUM}")
+    logger.info("=" * 60)
     
     # Étape 1: Charger les données de la compétition féminine
-    print("\n--- ÉTAPE 1: Chargement des données ---")
-    scheduler = UfolepMySQLScheduler([COMPETITION_CODE])
+    logger.info("\n--- ÉTAPE 1: Chargement des données ---")
+    data_source = cached_source(MySQLSource(), [COMPETITION_CODE]) if data_cache else None
+    scheduler = UfolepMySQLScheduler([COMPETITION_CODE], data_source=data_source)
     if not scheduler.load_data():
-        sys.stdout = tee.terminal
-        tee.close()
+        shutdown_logging()
         return
     
     # Étape 2: Charger TOUS les matchs confirmés (toutes compétitions)
-    print("\n--- ÉTAPE 2: Chargement des matchs confirmés (TOUTES compétitions) ---")
+    logger.info("\n--- ÉTAPE 2: Chargement des matchs confirmés (TOUTES compétitions) ---")
     confirmed_matches = load_all_confirmed_matches()
     if not confirmed_matches:
-        print("[ATTENTION] Aucun match confirmé trouvé, on continue sans contraintes existantes")
+        logger.warning("[ATTENTION] Aucun match confirmé trouvé, on continue sans contraintes existantes")
     
     # Stats par compétition
     comp_stats = {}
     for m in confirmed_matches:
         comp_stats[m.code_competition] = comp_stats.get(m.code_competition, 0) + 1
     for comp, count in sorted(comp_stats.items()):
-        print(f"  - {comp}: {count} matchs confirmés")
+        logger.info(f"  - {comp}: {count} matchs confirmés")
     
     # Étape 3: Identifier la nouvelle équipe
-    print(f"\n--- ÉTAPE 3: Identification de la nouvelle équipe dans {DIVISION_ID} ---")
+    logger.info(f"\n--- ÉTAPE 3: Identification de la nouvelle équipe dans {DIVISION_ID} ---")
     new_team = find_new_team(scheduler, DIVISION_ID, confirmed_matches)
     if not new_team:
-        sys.stdout = tee.terminal
-        tee.close()
+        shutdown_logging()
         return
     
-    print(f"[OK] Nouvelle équipe identifiée: {new_team.nom} (ID: {new_team.id})")
-    print(f"     Créneaux: {len(new_team.time_slots)}")
+    logger.info(f"[OK] Nouvelle équipe identifiée: {new_team.nom} (ID: {new_team.id})")
+    logger.info(f"     Créneaux: {len(new_team.time_slots)}")
     for ts in new_team.time_slots:
         jours = ['', 'Lundi', 'Mardi', 'Mercredi', 'Jeudi', 'Vendredi', 'Samedi', 'Dimanche']
         gym = scheduler.db_loader.gymnases.get(ts.gymnase_id)
         gym_nom = gym.nom if gym else ts.gymnase_id
-        print(f"       - {jours[ts.jour_semaine]} {ts.heure_debut} @ {gym_nom}")
+        logger.info(f"       - {jours[ts.jour_semaine]} {ts.heure_debut} @ {gym_nom}")
     
     # Trouver la division
     target_division = next(d for d in scheduler.divisions if d.id == DIVISION_ID)
     
     # Étape 4: Générer les matchs
-    print(f"\n--- ÉTAPE 4: Génération des matchs ---")
+    logger.info(f"\n--- ÉTAPE 4: Génération des matchs ---")
     new_matches = generate_new_team_matches(scheduler, new_team, target_division, confirmed_matches)
     
     if not new_matches:
-        print("[ERREUR] Aucun match généré")
-        sys.stdout = tee.terminal
-        tee.close()
+        logger.error("[ERREUR] Aucun match généré")
+        shutdown_logging()
         return
     
     # Afficher le calendrier
-    print("\n" + "=" * 60)
-    print("CALENDRIER DE LA NOUVELLE ÉQUIPE")
-    print("=" * 60)
+    logger.info("\n" + "=" * 60)
+    logger.info("CALENDRIER DE LA NOUVELLE ÉQUIPE")
+    logger.info("=" * 60)
     
     sorted_matches = sorted(new_matches, key=lambda m: m.date)
     for match in sorted_matches:
@@ -589,24 +519,23 @@ def main():
         else:
             role = "EXT"
         
-        print(f"  {day_name} {match.date.strftime('%d/%m/%Y')} {match.time_slot.heure_debut.strftime('%H:%M')} "
-              f"| {match.equipe_domicile.nom} vs {match.equipe_exterieur.nom} [{role}] @ {gym_nom}")
+        logger.info(f"  {day_name} {match.date.strftime('%d/%m/%Y')} {match.time_slot.heure_debut.strftime('%H:%M')} "
+                    f"| {match.equipe_domicile.nom} vs {match.equipe_exterieur.nom} [{role}] @ {gym_nom}")
     
     # Stats dom/ext
     home_count = sum(1 for m in new_matches if m.equipe_domicile.id == new_team.id)
     away_count = len(new_matches) - home_count
-    print(f"\n  Domicile: {home_count} | Extérieur: {away_count}")
+    logger.info(f"\n  Domicile: {home_count} | Extérieur: {away_count}")
     
     # Étape 5: Générer le fichier SQL
-    print(f"\n--- ÉTAPE 5: Génération du fichier SQL ---")
+    logger.info(f"\n--- ÉTAPE 5: Génération du fichier SQL ---")
     sql_filename = os.path.join(script_dir, f"insert_matches_new_team_{COMPETITION_CODE}_{DIVISION_NUM}.sql")
     generate_sql_file(new_matches, target_division, sql_filename)
     
     # Fermer le log
-    sys.stdout = tee.terminal
-    tee.close()
-    print(f"\n[INFO] Log sauvegardé dans: {log_filename}")
+    logger.info(f"\n[INFO] Log sauvegardé dans: {log_filename}")
+    shutdown_logging()
 
 
 if __name__ == "__main__":
-    main()
+    main(data_cache='--data-cache' in sys.argv[1:])
@@ -10,8 +10,12 @@ Usage:
     python generate_huitiemes_v2.py cf    # Huitièmes coupe Isoardi (parent: c)
     python generate_huitiemes_v2.py kf    # Huitièmes coupe KH (parent: kh)
     python generate_huitiemes_v2.py cf kf # Les deux coupes (planification conjointe)
+    python generate_huitiemes_v2.py cf --profile=rapide --seed=3   # Options solveur
+    python generate_huitiemes_v2.py cf kf --portfolio              # Variantes en parallèle
+    python generate_huitiemes_v2.py cf --data-cache   # Relit data_cache/ si les tables MySQL n'ont pas changé
 """
 
+import logging
 import os
 import re
 import sys
@@ -22,7 +26,12 @@ from typing import List, Dict, Optional
 import mysql.connector
 
 from db_config import DB_CONFIG, TABLE_NAMES, COLUMN_MAPPING
+from data_sources import MySQLSource, cached_source
 from ufolep_mysql_final import UfolepMySQLScheduler, PredefinedMatch, Division, Team
+from run_logging import setup_logging, shutdown_logging
+from solver_profiles import SolverProfile, parse_solver_args
+
+logger = logging.getLogger(__name__)
 
 
 # Mapping compétition finale -> compétition parente
@@ -67,13 +76,13 @@ class HuitiemesDrawLoader:
         # Récupérer le tirage brut
         raw_draw = self._get_finals_draw_raw()
         if not raw_draw:
-            print(f"[ERREUR] Aucun tirage trouvé pour {self.code_finals}")
+            logger.error(f"[ERREUR] Aucun tirage trouvé pour {self.code_finals}")
             return []
         
         # Récupérer les classements
         rankings = self._get_pool_rankings()
         if not rankings:
-            print(f"[ERREUR] Aucun classement trouvé pour {self.code_parent}")
+            logger.error(f"[ERREUR] Aucun classement trouvé pour {self.code_parent}")
             return []
         
         # Récupérer le tirage de réception
@@ -105,7 +114,7 @@ class HuitiemesDrawLoader:
             )
             self.matches.append(match)
         
-        print(f"[OK] {len(self.matches)} matchs de huitièmes chargés pour {self.code_finals}")
+        logger.info(f"[OK] {len(self.matches)} matchs de huitièmes chargés pour {self.code_finals}")
         return self.matches
     
     def _get_finals_draw_raw(self) -> Dict[int, Dict[str, str]]:
@@ -131,7 +140,7 @@ class HuitiemesDrawLoader:
                 matches[match_num] = {}
             matches[match_num][side] = value
         
-        print(f"[OK] Tirage récupéré: {len(matches)} matchs pour {self.code_finals}")
+        logger.info(f"[OK] Tirage récupéré: {len(matches)} matchs pour {self.code_finals}")
         return dict(sorted(matches.items()))
     
     def _get_pool_rankings(self) -> Dict[str, List[Dict]]:
@@ -190,7 +199,7 @@ class HuitiemesDrawLoader:
         for division in rankings_by_pool:
             rankings_by_pool[division].sort(key=lambda t: t.get('rang_poule') or 999)
         
-        print(f"[OK] Classements récupérés: {len(rankings_by_pool)} poules pour {self.code_parent}")
+        logger.info(f"[OK] Classements récupérés: {len(rankings_by_pool)} poules pour {self.code_parent}")
         return rankings_by_pool
     
     def _get_host_draw(self) -> Dict[int, int]:
@@ -245,55 +254,46 @@ class HuitiemesDrawLoader:
                 return TeamData(id=team['id_equipe'], nom=team['nom_equipe'], club_id=team['id_club'])
             return None
         
-        print(f"[ATTENTION] Position non reconnue: {position_label}")
+        logger.warning(f"[ATTENTION] Position non reconnue: {position_label}")
         return None
 
 
-def main(competition_codes: List[str]):
-    """Point d'entrée principal."""
+def main(competition_codes: List[str], profile: SolverProfile = None, portfolio: bool = False,
+         data_cache: bool = False):
+    """Point d'entrée principal.
+    
+    Args:
+        data_cache: Charger les données du scheduler via le cache data_cache/ (voir data_sources.py)
+    """
     # Configurer le logging
     script_dir = os.path.dirname(os.path.abspath(__file__))
     codes_suffix = "_".join(competition_codes)
     log_filename = os.path.join(script_dir, f"generation_huitiemes_{codes_suffix}.log")
     
-    class TeeOutput:
-        def __init__(self, filename):
-            self.terminal = sys.stdout
-            self.log = open(filename, 'w', encoding='utf-8')
-        def write(self, message):
-            self.terminal.write(message)
-            self.log.write(message)
-        def flush(self):
-            self.terminal.flush()
-            self.log.flush()
-        def close(self):
-            self.log.close()
-    
-    tee = TeeOutput(log_filename)
-    sys.stdout = tee
+    setup_logging(log_filename)
     
-    print(f"GÉNÉRATEUR DE HUITIÈMES DE FINALE UFOLEP")
-    print(f"Compétitions: {competition_codes}")
-    print(f"Fichier log: {log_filename}")
-    print("=" * 60)
+    logger.info(f"GÉNÉRATEUR DE HUITIÈMES DE FINALE UFOLEP")
+    logger.info(f"Compétitions: {competition_codes}")
+    logger.info(f"Fichier log: {log_filename}")
+    logger.info("=" * 60)
     
     try:
         # Connexion à la BDD
         connection = mysql.connector.connect(**DB_CONFIG)
-        print(f"[OK] Connexion réussie à la base {DB_CONFIG['database']}")
+        logger.info(f"[OK] Connexion réussie à la base {DB_CONFIG['database']}")
         
         # Charger les tirages pour toutes les compétitions
         all_matches: List[MatchHuitieme] = []
         for code in competition_codes:
             if code not in PARENT_COMPETITION:
-                print(f"[ERREUR] Code compétition invalide: {code}")
+                logger.error(f"[ERREUR] Code compétition invalide: {code}")
                 continue
             loader = HuitiemesDrawLoader(code)
             matches = loader.load(connection)
             all_matches.extend(matches)
         
         if not all_matches:
-            print("[ERREUR] Aucun match à planifier")
+            logger.error("[ERREUR] Aucun match à planifier")
             connection.close()
             return
         
@@ -304,7 +304,7 @@ def main(competition_codes: List[str]):
         
         for match in all_matches:
             if not match.home_team or not match.away_team:
-                print(f"[ATTENTION] Match incomplet: {match.team1_label} vs {match.team2_label}")
+                logger.warning(f"[ATTENTION] Match incomplet: {match.team1_label} vs {match.team2_label}")
                 continue
             
             # Créer une division fictive si nécessaire
@@ -325,16 +325,18 @@ def main(competition_codes: List[str]):
             )
             predefined_matches.append(predef)
         
-        print(f"\n[INFO] {len(predefined_matches)} matchs prédéfinis à planifier")
+        logger.info(f"\n[INFO] {len(predefined_matches)} matchs prédéfinis à planifier")
         
         # Utiliser le scheduler avec les matchs prédéfinis
         # On doit charger les équipes des compétitions parentes (c, kh) car les équipes
         # des huitièmes sont inscrites dans ces compétitions
         parent_codes = list(set(PARENT_COMPETITION[code] for code in competition_codes if code in PARENT_COMPETITION))
-        scheduler = UfolepMySQLScheduler(parent_codes, predefined_matches=predefined_matches)
+        data_source = cached_source(MySQLSource(), parent_codes) if data_cache else None
+        scheduler = UfolepMySQLScheduler(parent_codes, predefined_matches=predefined_matches,
+                                         data_source=data_source)
         
         if not scheduler.load_data():
-            print("[ERREUR] Impossible de charger les données")
+            logger.error("[ERREUR] Impossible de charger les données")
             connection.close()
             return
         
@@ -359,10 +361,10 @@ def main(competition_codes: List[str]):
         if start_date and end_date:
             scheduler.start_date = start_date
             scheduler.end_date = end_date
-            print(f"[OK] Dates forcées pour les finales: {start_date} au {end_date}")
+            logger.info(f"[OK] Dates forcées pour les finales: {start_date} au {end_date}")
         
-        if not scheduler.generate_schedule():
-            print("[ERREUR] Impossible de générer le calendrier")
+        if not scheduler.generate_schedule(profile=profile, portfolio=portfolio):
+            logger.error("[ERREUR] Impossible de générer le calendrier")
             connection.close()
             return
         
@@ -375,17 +377,19 @@ def main(competition_codes: List[str]):
             scheduler.generate_sql_file(filename, filter_competition=code)
         
         connection.close()
-        print("[INFO] Connexion MySQL fermée")
+        logger.info("[INFO] Connexion MySQL fermée")
         
     finally:
-        sys.stdout = tee.terminal
-        tee.close()
-        print(f"\n[INFO] Log sauvegardé dans: {log_filename}")
+        logger.info(f"\n[INFO] Log sauvegardé dans: {log_filename}")
+        shutdown_logging()
 
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        codes = sys.argv[1:]
+    args, profile, portfolio = parse_solver_args(sys.argv[1:])
+    data_cache = '--data-cache' in args
+    args = [arg for arg in args if arg != '--data-cache']
+    if args:
+        codes = args
     else:
         print("Usage: python generate_huitiemes_v2.py <code_competition> [code_competition2 ...]")
         print("  Codes valides: cf (coupe Isoardi), kf (coupe KH)")
@@ -395,4 +399,4 @@ if __name__ == "__main__":
         print("  python generate_huitiemes_v2.py cf kf")
         sys.exit(1)
     
-    main(codes)
+    main(codes, profile=profile, portfolio=portfolio, data_cache=data_cache)
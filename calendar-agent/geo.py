@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+Distances géographiques entre gymnases (coordonnées GPS de la table gymnase).
+"""
+
+import math
+
+import numpy as np
+
+
+def haversine_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Calcule la distance en km entre deux points GPS (formule Haversine)."""
+    if None in (lat1, lng1, lat2, lng2):
+        return 0
+    R = 6371  # Rayon de la Terre en km
+    dlat = math.radians(lat2 - lat1)
+    dlng = math.radians(lng2 - lng1)
+    a = math.sin(dlat/2)**2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlng/2)**2
+    return R * 2 * math.asin(math.sqrt(a))
+
+
+def haversine_matrix(lat1: np.ndarray, lng1: np.ndarray, lat2: np.ndarray, lng2: np.ndarray) -> np.ndarray:
+    """Distances en km entre deux séries de points GPS (matrice len(lat1) × len(lat2)).
+
+    Les coordonnées inconnues (NaN) donnent une distance nulle, comme haversine_distance.
+    """
+    lat1, lng1, lat2, lng2 = (np.radians(np.asarray(a, dtype=float)) for a in (lat1, lng1, lat2, lng2))
+    dlat = lat2[None, :] - lat1[:, None]
+    dlng = lng2[None, :] - lng1[:, None]
+    a = np.sin(dlat/2)**2 + np.cos(lat1)[:, None] * np.cos(lat2)[None, :] * np.sin(dlng/2)**2
+    return np.nan_to_num(6371 * 2 * np.arcsin(np.sqrt(a)), nan=0.0)
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Ordonnancement glouton (méthode du cercle) pour le scheduler UFOLEP.
+
+Les journées de chaque division sont générées par la méthode du cercle (round-robin), puis
+réparties uniformément sur les semaines de la période. Chaque match est placé sur le premier
+candidat (date, créneau) libre de sa semaine cible, puis des semaines suivantes, en
+respectant les mêmes règles que le modèle CP-SAT: un match par équipe et par semaine,
+capacité des gymnases, dates blacklistées (candidats déjà filtrés), alternance historique
+(orientations déjà élaguées), effectifs communs et équilibre domicile/extérieur.
+
+Le résultat est une solution réalisable du modèle, obtenue en une fraction de seconde: il
+sert d'aperçu du calendrier ou d'indice (hints) pour CP-SAT.
+"""
+
+import logging
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from candidates import CandidateTable, group_rows
+from warm_start import PreviousMatch
+
+logger = logging.getLogger(__name__)
+
+
+def circle_rounds(n_teams: int) -> List[List[Tuple[int, int]]]:
+    """Journées d'un round-robin simple par la méthode du cercle.
+
+    Args:
+        n_teams: Nombre d'équipes (une équipe fictive est ajoutée si impair)
+
+    Returns:
+        Liste des journées, chacune une liste de paires (i, j) d'index d'équipes, i < j
+    """
+    ring = list(range(n_teams)) + ([None] if n_teams % 2 else [])
+    size = len(ring)
+    rounds = []
+    for _ in range(size - 1):
+        pairs = [(ring[k], ring[size - 1 - k]) for k in range(size // 2)]
+        rounds.append([(min(i, j), max(i, j)) for i, j in pairs if i is not None and j is not None])
+        # Le premier élément reste fixe, les autres tournent d'un cran
+        ring = [ring[0], ring[-1]] + ring[1:-1]
+    return rounds
+
+
+def greedy_schedule(scheduler, candidates: CandidateTable) -> np.ndarray:
+    """Place gloutonnement les matchs de la CandidateTable, journée par journée.
+
+    Args:
+        scheduler: UfolepMySQLScheduler dont les matchs ont été préparés (mode round-robin)
+        candidates: Candidats énumérés par scheduler.build_candidates() ou build_model()
+
+    Returns:
+        Lignes retenues de la CandidateTable (au plus une par match)
+    """
+    start = time.perf_counter()
+    team_index = {team.id: i for i, team in enumerate(candidates.teams)}
+    n_weeks = len(candidates.weeks)
+
+    # Candidats par (match, équipe qui reçoit, semaine), triés par date
+    groups = group_rows((candidates.match_id, candidates.home, candidates.week_idx), candidates.rows)
+    hosts: Dict[int, List[int]] = {}
+    for mid, home, _ in groups:
+        if home not in hosts.setdefault(mid, []):
+            hosts[mid].append(home)
+
+    # Journées de chaque division, réparties sur les semaines
+    match_of = {(info['team1'].id, info['team2'].id): mid for mid, info in enumerate(scheduler._all_matches_info)}
+    schedule = []  # (journée normalisée, semaine cible, match)
+    for division in scheduler.divisions:
+        teams = division.teams
+        if len(teams) < 3:
+            continue
+        rounds = circle_rounds(len(teams))
+        for r, pairs in enumerate(rounds):
+            target_week = r * n_weeks // len(rounds)
+            for i, j in pairs:
+                mid = match_of.get((teams[i].id, teams[j].id))
+                if mid is not None and mid in hosts:
+                    schedule.append((r / len(rounds), target_week, mid))
+    schedule.sort()
+
+    # État des ressources
+    nb_terrains = [scheduler.db_loader.gymnases[gym_id].nb_terrains for gym_id in candidates.gym_ids]
+    gym_used: Dict[Tuple[int, int], int] = {}
+    team_weeks = set()
+    team_dates = set()
+    home_count = np.zeros(len(candidates.teams), dtype=np.int64)
+    away_count = np.zeros(len(candidates.teams), dtype=np.int64)
+    has_slots = np.array([bool(team.time_slots) for team in candidates.teams])
+    partners: Dict[int, List[int]] = {}
+    for e1_id, e2_id, _, _ in scheduler.db_loader.get_equipes_avec_effectif_commun():
+        if e1_id in team_index and e2_id in team_index:
+            partners.setdefault(team_index[e1_id], []).append(team_index[e2_id])
+            partners.setdefault(team_index[e2_id], []).append(team_index[e1_id])
+
+    def place(mid: int, home: int, week: int) -> int:
+        """Premier candidat libre du match dans la semaine, -1 si aucun."""
+        for row in groups.get((mid, home, week), ()):
+            row = int(row)
+            away = int(candidates.away[row])
+            date_idx = int(candidates.date_idx[row])
+            gym = int(candidates.gym[row])
+            if gym_used.get((gym, date_idx), 0) >= nb_terrains[gym]:
+                continue
+            if any((partner, date_idx) in team_dates
+                   for team in (home, away) for partner in partners.get(team, ())):
+                continue
+            return row
+        return -1
+
+    selected = []
+    for _, target_week, mid in schedule:
+        # Orientation: l'équipe qui a le moins reçu d'abord; l'équipe qui se déplace ne doit
+        # pas dépasser de plus d'un match ses réceptions
+        orientations = sorted(hosts[mid], key=lambda h: (home_count[h] - away_count[h], h))
+        placed = -1
+        for offset in range(n_weeks):
+            week = (target_week + offset) % n_weeks
+            for home in orientations:
+                rows = groups.get((mid, home, week))
+                if rows is None:
+                    continue
+                away = int(candidates.away[rows[0]])
+                if (home, week) in team_weeks or (away, week) in team_weeks:
+                    break
+                if has_slots[away] and away_count[away] + 1 > home_count[away] + 1:
+                    continue
+                placed = place(mid, home, week)
+                if placed >= 0:
+                    break
+            if placed >= 0:
+                break
+        if placed < 0:
+            continue
+
+        home, away = int(candidates.home[placed]), int(candidates.away[placed])
+        date_idx, week = int(candidates.date_idx[placed]), int(candidates.week_idx[placed])
+        gym = int(candidates.gym[placed])
+        gym_used[(gym, date_idx)] = gym_used.get((gym, date_idx), 0) + 1
+        team_weeks.update(((home, week), (away, week)))
+        team_dates.update(((home, date_idx), (away, date_idx)))
+        home_count[home] += 1
+        away_count[away] += 1
+        selected.append(placed)
+
+    logger.info(f"[INFO] Glouton: {len(selected)}/{len(hosts)} matchs placés en {time.perf_counter() - start:.3f}s")
+    return np.array(sorted(selected), dtype=np.int64)
+
+
+def greedy_matches(scheduler) -> List[PreviousMatch]:
+    """Calendrier glouton au format des matchs précédents (indices du démarrage à chaud).
+
+    Les candidats énumérés pour le glouton sont laissés au scheduler (prebuilt_candidates):
+    le build_model suivant les reprend au lieu de préparer et d'énumérer à nouveau les matchs.
+    """
+    candidates = scheduler.build_candidates()
+    rows = greedy_schedule(scheduler, candidates)
+    scheduler.prebuilt_candidates = candidates
+    return [
+        PreviousMatch(
+            id_equipe_dom=candidates.teams[candidates.home[row]].id,
+            id_equipe_ext=candidates.teams[candidates.away[row]].id,
+            date_reception=candidates.dates[candidates.date_idx[row]],
+            id_gymnasium=candidates.gym_ids[candidates.gym[row]]
+        )
+        for row in rows.tolist()
+    ]
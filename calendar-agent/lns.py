@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+Amélioration d'un calendrier par recherche à grand voisinage (LNS).
+
+À chaque itération, un voisinage est libéré: les matchs d'une division, ceux d'une fenêtre
+de semaines ou ceux reçus dans un gymnase (les matchs non programmés sont toujours libres).
+Tous les autres matchs sont fixés à leur solution courante, et seul ce voisinage est
+re-résolu sur une copie du modèle complet, construit une seule fois. La nouvelle solution
+est acceptée si elle ne dégrade pas l'objectif pondéré des re-résolutions:
+
+    POIDS_MATCH × matchs - POIDS_DESEQUILIBRE × déséquilibre dom/ext - km de déplacement
+
+- déséquilibre dom/ext: somme des |réceptions - déplacements| des équipes qui ont des créneaux
+- déplacement: distance entre le gymnase de l'équipe qui se déplace et celui du match
+- POIDS_MATCH dépasse la plus grande pénalité possible: un match programmé de plus l'emporte
+  toujours sur l'équilibre et les déplacements
+
+Une égalité déplace le calendrier sans le dégrader et ouvre d'autres voisinages. La boucle
+utilise tout le budget de temps; elle ne s'arrête plus tôt que si l'objectif atteint sa borne
+(tous les matchs programmables, déséquilibre et déplacements minimaux): plus rien à améliorer.
+"""
+
+import logging
+import random
+import time
+from dataclasses import dataclass, replace
+from typing import List, Set, Tuple
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from candidates import CandidateTable
+from constraint_index import ConstraintIndex
+from decomposition import fix_outside
+from geo import haversine_matrix
+from run_logging import quiet
+from solve_callbacks import ObjectiveStopCallback
+from solver_profiles import PROFILES, SolverProfile
+
+logger = logging.getLogger(__name__)
+
+# Une unité de déséquilibre dom/ext vaut autant que POIDS_DESEQUILIBRE km de déplacement
+POIDS_DESEQUILIBRE = 20
+
+
+@dataclass
+class LnsIteration:
+    """Statistiques d'une itération LNS (objectif pondéré, matchs, déséquilibre, km)."""
+    numero: int
+    voisinage: str
+    matchs_libres: int
+    statut: str
+    objectif_avant: int
+    objectif_apres: int
+    matchs_apres: int
+    desequilibre_apres: int
+    deplacement_apres: int
+    acceptee: bool
+    duree: float
+
+
+@dataclass
+class LnsObjective:
+    """Objectif pondéré des re-résolutions et sa borne supérieure."""
+    travel_km: np.ndarray  # Km du déplacement de l'équipe extérieure, par ligne candidate
+    poids_match: int
+    borne: int  # Tous les matchs programmables, déséquilibre et déplacements minimaux
+
+    def terms(self, candidates: CandidateTable, rows: np.ndarray) -> Tuple[int, int, int]:
+        """(matchs, déséquilibre dom/ext, km de déplacement) d'un calendrier."""
+        return len(rows), home_away_imbalance(candidates, rows), int(self.travel_km[rows].sum())
+
+    def value(self, candidates: CandidateTable, rows: np.ndarray) -> int:
+        """Valeur de l'objectif pondéré d'un calendrier (identique à celle du modèle)."""
+        matches, imbalance, travel = self.terms(candidates, rows)
+        return self.poids_match * matches - POIDS_DESEQUILIBRE * imbalance - travel
+
+
+def _clone(model: cp_model.CpModel) -> cp_model.CpModel:
+    """Copie du modèle (Clone dans les versions récentes d'ortools, CopyFrom en 9.7)."""
+    if hasattr(model, 'Clone'):
+        return model.Clone()
+    clone = cp_model.CpModel()
+    clone.CopyFrom(model)
+    return clone
+
+
+def home_away_imbalance(candidates: CandidateTable, rows: np.ndarray) -> int:
+    """Somme des |réceptions - déplacements| des équipes qui ont des créneaux de réception."""
+    n_teams = len(candidates.teams)
+    balance = (np.bincount(candidates.home[rows], minlength=n_teams)
+               - np.bincount(candidates.away[rows], minlength=n_teams))
+    with_slots = np.fromiter((bool(team.time_slots) for team in candidates.teams), dtype=bool, count=n_teams)
+    return int(np.abs(balance[with_slots]).sum())
+
+
+def travel_km(scheduler, candidates: CandidateTable) -> np.ndarray:
+    """Km (entiers) entre le gymnase de l'équipe extérieure et celui du match, par ligne.
+
+    L'équipe est localisée au gymnase de son premier créneau: une coordonnée inconnue
+    (équipe sans créneau, gymnase sans GPS) donne un déplacement nul.
+    """
+    gymnases = scheduler.db_loader.gymnases
+
+    def coordinates(points):
+        return (np.array([np.nan if p is None or p.lat is None else float(p.lat) for p in points]),
+                np.array([np.nan if p is None or p.lng is None else float(p.lng) for p in points]))
+
+    team_lat, team_lng = coordinates(candidates.teams)
+    gym_lat, gym_lng = coordinates([gymnases.get(gym_id) for gym_id in candidates.gym_ids])
+    distances = np.rint(haversine_matrix(team_lat, team_lng, gym_lat, gym_lng)).astype(np.int64)
+    return distances[candidates.away, candidates.gym]
+
+
+def add_weighted_objective(model: cp_model.CpModel, scheduler, index: ConstraintIndex) -> LnsObjective:
+    """Remplace l'objectif du modèle (nombre de matchs) par l'objectif pondéré de la LNS.
+
+    Le déséquilibre |réceptions - déplacements| de chaque équipe avec créneaux est porté par
+    une variable entière; POIDS_MATCH = 1 + la plus grande pénalité possible (déséquilibre
+    maximal de chaque équipe et plus long déplacement de chaque match).
+
+    Returns:
+        LnsObjective (km par ligne, poids d'un match, borne supérieure de l'objectif)
+    """
+    candidates = index.candidates
+    travel = travel_km(scheduler, candidates)
+
+    # Matchs programmables par équipe, plus court et plus long déplacement par match
+    n_teams = len(candidates.teams)
+    matches_per_team = np.zeros(n_teams, dtype=np.int64)
+    min_travel = max_travel = 0
+    for rows in index.by_match.values():
+        matches_per_team[[candidates.home[rows[0]], candidates.away[rows[0]]]] += 1
+        min_travel += int(travel[rows].min())
+        max_travel += int(travel[rows].max())
+
+    imbalance_vars = []
+    max_imbalance = min_imbalance = 0
+    for team_idx, team in enumerate(candidates.teams):
+        n_matches = int(matches_per_team[team_idx])
+        if not team.time_slots or n_matches == 0:
+            continue
+        home_rows = index.by_home.get(team_idx)
+        away_rows = index.by_away.get(team_idx)
+        home = cp_model.LinearExpr.Sum(candidates.vars_at(home_rows)) if home_rows is not None else 0
+        away = cp_model.LinearExpr.Sum(candidates.vars_at(away_rows)) if away_rows is not None else 0
+        imbalance = model.NewIntVar(0, n_matches, f"desequilibre_{team.id}")
+        model.Add(imbalance >= home - away)
+        model.Add(imbalance >= away - home)
+        imbalance_vars.append(imbalance)
+        max_imbalance += n_matches
+        min_imbalance += n_matches % 2  # Nombre impair de matchs: au moins 1 d'écart
+
+    poids_match = 1 + POIDS_DESEQUILIBRE * max_imbalance + max_travel
+    rows = candidates.rows
+    model.Maximize(cp_model.LinearExpr.WeightedSum(candidates.vars_at(rows), (poids_match - travel[rows]).tolist())
+                   - POIDS_DESEQUILIBRE * cp_model.LinearExpr.Sum(imbalance_vars))
+    borne = poids_match * len(index.by_match) - POIDS_DESEQUILIBRE * min_imbalance - min_travel
+    return LnsObjective(travel, poids_match, borne)
+
+
+def pick_neighbourhood(kind: int, scheduler, candidates: CandidateTable, rows: np.ndarray,
+                      rng: random.Random, week_window: int = 2) -> Tuple[str, Set[int]]:
+    """Tire un voisinage de la solution courante.
+
+    Args:
+        kind: 0 = une division, 1 = une fenêtre de week_window semaines, 2 = un gymnase
+        rows: Lignes retenues de la solution courante
+
+    Returns:
+        (description, matchs libres)
+    """
+    if kind == 1:
+        first = rng.randrange(max(1, len(candidates.weeks) - week_window + 1))
+        in_window = np.isin(candidates.week_idx[rows], np.arange(first, first + week_window))
+        year, num = candidates.weeks[first]
+        return f"semaines {year}-S{num:02d} (+{week_window - 1})", set(candidates.match_id[rows[in_window]].tolist())
+    if kind == 2 and len(rows):
+        gym = rng.choice(np.unique(candidates.gym[rows]).tolist())
+        return f"gymnase {candidates.gym_ids[gym]}", set(candidates.match_id[rows[candidates.gym[rows] == gym]].tolist())
+    match_info = scheduler._all_matches_info
+    division_id = rng.choice(sorted({info['division'].id for info in match_info}))
+    return (f"division {division_id}",
+            {mid for mid, info in enumerate(match_info) if info['division'].id == division_id})
+
+
+def improve_schedule(scheduler, selected_rows: np.ndarray, budget: float,
+                     max_time_iteration: float = 10.0,
+                     profile: SolverProfile = None) -> Tuple[np.ndarray, List[LnsIteration]]:
+    """Améliore un calendrier par LNS pendant budget secondes.
+
+    Args:
+        scheduler: UfolepMySQLScheduler dont les données sont chargées
+        selected_rows: Lignes retenues du calendrier de départ (CandidateTable de build_model,
+                       identique à celle de build_candidates: énumération déterministe)
+        budget: Temps total de l'amélioration (secondes, construction du modèle comprise),
+                utilisé en entier sauf si l'objectif pondéré atteint sa borne
+        max_time_iteration: Limite de temps de chaque re-résolution (secondes)
+        profile: Profil solveur (graine du tirage des voisinages, workers, écart toléré)
+
+    Returns:
+        (lignes retenues du meilleur calendrier, statistiques par itération)
+    """
+    start = time.perf_counter()
+    profile = profile or PROFILES['defaut']
+    with quiet():
+        model, candidates, index = scheduler.build_model()
+    weights = add_weighted_objective(model, scheduler, index)
+    target = len(index.by_match)
+    rng = random.Random(profile.random_seed)
+
+    current = np.asarray(selected_rows, dtype=np.int64)
+    objective = weights.value(candidates, current)
+    matches, imbalance, travel = weights.terms(candidates, current)
+    logger.info(f"[INFO] LNS: départ {matches}/{target} matchs, déséquilibre dom/ext {imbalance}, "
+                f"déplacements {travel} km, budget {budget:.0f}s")
+
+    stats = []
+    while True:
+        if objective >= weights.borne:
+            logger.info("[INFO] LNS: borne de l'objectif atteinte, plus rien à améliorer")
+            break
+        remaining = budget - (time.perf_counter() - start)
+        if remaining < 1.0:
+            break
+
+        name, free_matches = pick_neighbourhood(len(stats) % 3, scheduler, candidates, current, rng)
+        iteration_start = time.perf_counter()
+        neighbour = _clone(model)
+        fixed_rows = fix_outside(neighbour, candidates, current, free_matches)
+        n_free = len(np.unique(candidates.match_id)) - len(np.unique(candidates.match_id[fixed_rows]))
+
+        # Arrêt de la re-résolution à la borne de l'objectif pondéré, pas au nombre de matchs
+        solver = replace(profile, max_time_in_seconds=min(max_time_iteration, remaining)).create_solver()
+        status = solver.Solve(neighbour, ObjectiveStopCallback(weights.borne, 0.0))
+        new_objective = objective
+        new_terms = (matches, imbalance, travel)
+        accepted = False
+        if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
+            rows = candidates.selected_rows(solver)
+            new_objective = weights.value(candidates, rows)
+            new_terms = weights.terms(candidates, rows)
+            if new_objective >= objective:
+                current = rows
+                accepted = True
+
+        iteration = LnsIteration(len(stats) + 1, name, n_free, solver.StatusName(status), objective,
+                                 new_objective, *new_terms, accepted, time.perf_counter() - iteration_start)
+        stats.append(iteration)
+        logger.debug(f"       - {iteration.numero:3d} {name}: {n_free} matchs libres, {iteration.statut} "
+                     f"en {iteration.duree:.1f}s, matchs {matches} -> {new_terms[0]}, "
+                     f"déséquilibre {imbalance} -> {new_terms[1]}, km {travel} -> {new_terms[2]}"
+                     f"{'' if accepted else ' (rejetée)'}")
+        if accepted:
+            objective = new_objective
+            matches, imbalance, travel = new_terms
+
+    improved = sum(1 for s in stats if s.objectif_apres > s.objectif_avant and s.acceptee)
+    logger.info(f"[OK] LNS: {len(stats)} itérations, {improved} améliorations, "
+                f"{matches}/{target} matchs, déséquilibre dom/ext {imbalance}, déplacements {travel} km "
+                f"en {time.perf_counter() - start:.1f}s")
+    return current, stats
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Cache disque du modèle CP-SAT construit par UfolepMySQLScheduler.build_model.
+
+Le modèle (proto) et les colonnes de la CandidateTable sont enregistrés sous une clé
+calculée à partir des données du loader et des paramètres du scheduler: une nouvelle
+exécution sur des données identiques (ex: seul le temps de résolution change) recharge le
+modèle sans le reconstruire. Le modèle peut aussi être exporté seul (format binaire
+CpModelProto) pour un réglage hors ligne des paramètres du solver.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import date
+from typing import Optional, Tuple
+
+import numpy as np
+import ortools
+from ortools.sat.python import cp_model
+
+from candidates import CandidateTable
+from constraint_index import ConstraintIndex
+
+logger = logging.getLogger(__name__)
+
+# À incrémenter quand la construction du modèle change (invalide les caches existants)
+CACHE_VERSION = 2
+
+# ortools 9.7 relit le proto binaire, les versions récentes (pybind) seulement le format texte
+_BINARY_PROTO = hasattr(cp_model.CpModel().Proto(), 'ParseFromString')
+_MODEL_EXT = '.pb' if _BINARY_PROTO else '.txt'
+
+_COLUMNS = ('match_id', 'home', 'away', 'date_idx', 'week_idx', 'slot', 'gym', 'var_index', 'proto_index')
+
+
+def cache_key(scheduler, valid_dates: list) -> str:
+    """Empreinte des données et paramètres qui déterminent le modèle."""
+    loader = scheduler.db_loader
+    payload = repr((
+        CACHE_VERSION,
+        ortools.__version__,
+        scheduler.competition_codes,
+        valid_dates,
+        [(p.match_id, p.home_team_id, p.away_team_id, p.division.id) for p in scheduler.predefined_matches],
+        scheduler.teams,
+        [(division.id, [team.id for team in division.teams]) for division in scheduler.divisions],
+        sorted((gymnase.id, gymnase.nb_terrains) for gymnase in loader.gymnases.values()),
+        sorted((gym_id, sorted(dates)) for gym_id, dates in loader.blacklist_gymnases.items()),
+        sorted(loader.historique_deplacements.items()),
+        loader.equipes_effectif_commun,
+    ))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def _paths(cache_dir: str, key: str) -> Tuple[str, str]:
+    """Fichiers du modèle et de la CandidateTable pour une clé."""
+    return os.path.join(cache_dir, key + _MODEL_EXT), os.path.join(cache_dir, key + '.npz')
+
+
+def save_model(cache_dir: str, key: str, model: cp_model.CpModel, candidates: CandidateTable) -> None:
+    """Enregistre le modèle et la CandidateTable (écriture atomique, sûre entre processus)."""
+    os.makedirs(cache_dir, exist_ok=True)
+    model_path, table_path = _paths(cache_dir, key)
+    tmp_suffix = f".{os.getpid()}.tmp"
+
+    meta = {
+        'dates': [d.isoformat() for d in candidates.dates],
+        'weeks': [list(week) for week in candidates.weeks],
+        'teams': [team.id for team in candidates.teams],
+        'slots': [ts.id for ts in candidates.slots],
+        'gym_ids': candidates.gym_ids,
+    }
+    tmp_table = table_path + tmp_suffix
+    with open(tmp_table, 'wb') as f:
+        np.savez(f, meta=np.array(json.dumps(meta)), **{col: getattr(candidates, col) for col in _COLUMNS})
+    # L'extension du fichier choisit le format (binaire ou texte) écrit par ExportToFile
+    tmp_model = os.path.join(cache_dir, key + tmp_suffix + _MODEL_EXT)
+    model.ExportToFile(tmp_model)
+    os.replace(tmp_table, table_path)
+    os.replace(tmp_model, model_path)
+
+
+def load_model(cache_dir: str, key: str, scheduler) -> Optional[Tuple[cp_model.CpModel, CandidateTable, ConstraintIndex]]:
+    """Recharge le modèle d'une clé, ou None s'il n'est pas en cache."""
+    model_path, table_path = _paths(cache_dir, key)
+    if not (os.path.exists(model_path) and os.path.exists(table_path)):
+        return None
+
+    start = time.perf_counter()
+    model = cp_model.CpModel()
+    if _BINARY_PROTO:
+        with open(model_path, 'rb') as f:
+            model.Proto().ParseFromString(f.read())
+    else:
+        with open(model_path, 'r', encoding='utf-8') as f:
+            model.Proto().parse_text_format(f.read())
+
+    with np.load(table_path) as table:
+        meta = json.loads(str(table['meta']))
+        columns = {col: table[col] for col in _COLUMNS}
+
+    teams_by_id = {team.id: team for team in scheduler.teams}
+    slots_by_id = {ts.id: ts for team in scheduler.teams for ts in team.time_slots}
+    candidates = CandidateTable(
+        dates=[date.fromisoformat(d) for d in meta['dates']],
+        weeks=[tuple(week) for week in meta['weeks']],
+        teams=[teams_by_id[team_id] for team_id in meta['teams']],
+        slots=[slots_by_id[slot_id] for slot_id in meta['slots']],
+        gym_ids=meta['gym_ids'],
+        **columns
+    )
+    candidates.variables = [model.GetBoolVarFromProtoIndex(i) for i in candidates.proto_index.tolist()]
+    index = ConstraintIndex(candidates)
+    logger.info(f"[INFO] Modèle rechargé depuis le cache {model_path} ({len(candidates)} candidats, "
+                f"{len(model.Proto().constraints)} contraintes, {time.perf_counter() - start:.3f}s)")
+    return model, candidates, index
+
+
+def export_model(model: cp_model.CpModel, filename: str) -> None:
+    """Exporte le modèle pour un réglage hors ligne (binaire, ou texte si filename finit par .txt)."""
+    model.ExportToFile(filename)
+    logger.info(f"[INFO] Modèle exporté: {filename}")
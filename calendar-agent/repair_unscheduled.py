@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+Réparation ciblée des matchs non programmés après la résolution.
+
+Un modèle CP-SAT minuscule ne contient que les matchs non programmés: le calendrier déjà
+obtenu reste fixé et n'intervient que par les ressources qu'il occupe (dates et semaines
+des équipes, terrains des gymnases, effectifs communs, équilibre domicile/extérieur).
+Des relaxations contrôlées élargissent les candidats de ces matchs, chacune avec un coût:
+un second match dans la semaine, un créneau d'une autre équipe du club, un créneau dans
+un gymnase voisin. Le modèle place le plus de matchs possible au moindre coût.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Set, Tuple
+
+from ortools.sat.python import cp_model
+
+from geo import haversine_distance
+
+logger = logging.getLogger(__name__)
+
+# Coût de chaque relaxation (placer un match vaut toujours plus que toutes les relaxations)
+COUT_SECOND_MATCH_SEMAINE = 1
+COUT_CRENEAU_CLUB = 2
+COUT_GYMNASE_VOISIN = 3
+_GAIN_MATCH = 100
+
+
+@dataclass
+class RepairRelaxations:
+    """Relaxations autorisées pour placer les matchs non programmés."""
+    second_weekly_match: bool = True  # Une équipe peut jouer deux fois dans la semaine (jamais le même jour)
+    club_slots: bool = True  # Créneaux des autres équipes du club qui reçoit
+    neighbour_gyms_km: float = 10.0  # Créneaux des gymnases à moins de X km de ceux du club (0 = non)
+    max_time_in_seconds: float = 5.0
+
+
+@dataclass
+class Placement:
+    """Match non programmé placé par la réparation."""
+    unscheduled_index: int
+    home: object  # Team
+    away: object  # Team
+    date: date
+    time_slot: object  # TimeSlot
+    relaxations: List[str]
+
+
+def _slot_options(scheduler, host, relaxations: RepairRelaxations) -> List[Tuple[object, int, str]]:
+    """Créneaux possibles pour une équipe qui reçoit: (créneau, coût, relaxation)."""
+    options = [(ts, 0, None) for ts in host.time_slots]
+    seen = {ts.id for ts in host.time_slots}
+    club_teams = [team for team in scheduler.teams_by_club.get(host.club_id, []) if team.id != host.id]
+    if relaxations.club_slots:
+        for team in club_teams:
+            for ts in team.time_slots:
+                if ts.id not in seen:
+                    options.append((ts, COUT_CRENEAU_CLUB, f"créneau de {team.nom}"))
+                    seen.add(ts.id)
+
+    if relaxations.neighbour_gyms_km > 0:
+        gymnases = scheduler.db_loader.gymnases
+        club_gyms = [gymnases[ts.gymnase_id] for team in [host] + club_teams for ts in team.time_slots
+                     if ts.gymnase_id in gymnases]
+        # Distance calculée une fois par gymnase accueillant des créneaux
+        nearest = {}
+        for gym_id in scheduler.slots_by_gym:
+            gym = gymnases.get(gym_id)
+            if gym is None or gym.lat is None:
+                continue
+            distances = [haversine_distance(g.lat, g.lng, gym.lat, gym.lng) for g in club_gyms if g.lat is not None]
+            if distances and min(distances) <= relaxations.neighbour_gyms_km:
+                nearest[gym_id] = min(distances)
+        for team in scheduler.teams:
+            for ts in team.time_slots:
+                if ts.id in seen or ts.gymnase_id not in nearest:
+                    continue
+                gym = gymnases[ts.gymnase_id]
+                options.append((ts, COUT_GYMNASE_VOISIN, f"gymnase voisin {gym.nom} ({nearest[ts.gymnase_id]:.1f} km)"))
+                seen.add(ts.id)
+    return options
+
+
+def place_unscheduled(scheduler, relaxations: Optional[RepairRelaxations] = None) -> List[Placement]:
+    """Place les matchs de scheduler.unscheduled_matches sans modifier scheduler.matches.
+
+    Args:
+        scheduler: UfolepMySQLScheduler après generate_schedule
+        relaxations: Relaxations autorisées (défaut: toutes)
+
+    Returns:
+        Matchs placés (index dans unscheduled_matches, équipes, date, créneau, relaxations)
+    """
+    start = time.perf_counter()
+    relaxations = relaxations or RepairRelaxations()
+    loader = scheduler.db_loader
+    valid_dates = scheduler._generate_valid_dates()
+
+    # Ressources occupées par le calendrier fixé
+    team_dates: Set[Tuple[str, date]] = set()
+    team_weeks: Dict[Tuple[str, tuple], int] = {}
+    gym_used: Dict[Tuple[str, date], int] = {}
+    home_count: Dict[str, int] = {}
+    away_count: Dict[str, int] = {}
+    for match in scheduler.matches:
+        week = tuple(match.date.isocalendar())[:2]
+        for team in (match.equipe_domicile, match.equipe_exterieur):
+            team_dates.add((team.id, match.date))
+            team_weeks[(team.id, week)] = team_weeks.get((team.id, week), 0) + 1
+        key = (match.time_slot.gymnase_id, match.date)
+        gym_used[key] = gym_used.get(key, 0) + 1
+        home_count[match.equipe_domicile.id] = home_count.get(match.equipe_domicile.id, 0) + 1
+        away_count[match.equipe_exterieur.id] = away_count.get(match.equipe_exterieur.id, 0) + 1
+
+    partners: Dict[str, Set[str]] = {}
+    for e1_id, e2_id, _, _ in loader.get_equipes_avec_effectif_commun():
+        partners.setdefault(e1_id, set()).add(e2_id)
+        partners.setdefault(e2_id, set()).add(e1_id)
+
+    # Candidats des matchs non programmés: (index, domicile, extérieur, date, créneau, coût, relaxations)
+    options = []
+    for i, match in enumerate(scheduler.unscheduled_matches):
+        t1, t2 = match.equipe_domicile, match.equipe_exterieur
+        if t2.id in partners.get(t1.id, ()):
+            continue  # Effectif commun: ne peuvent jamais jouer le même soir
+        hosts = [(t1, t2), (t2, t1)]
+        designated = loader.get_equipe_qui_doit_recevoir(t1.id, t2.id)
+        host_slots = {home.id: _slot_options(scheduler, home, relaxations) for home, _ in hosts}
+        if designated and host_slots[designated]:
+            hosts = [(home, away) for home, away in hosts if home.id == designated]
+
+        for home, away in hosts:
+            for ts, slot_cost, slot_relax in host_slots[home.id]:
+                gymnase = loader.gymnases.get(ts.gymnase_id)
+                if gymnase is None:
+                    continue  # Gymnase inconnu du loader: capacité inconnue
+                closed = loader.blacklist_gymnases.get(ts.gymnase_id, ())
+                for d in valid_dates:
+                    if d.weekday() + 1 != ts.jour_semaine or d in closed:
+                        continue
+                    if (home.id, d) in team_dates or (away.id, d) in team_dates:
+                        continue
+                    if gym_used.get((ts.gymnase_id, d), 0) >= gymnase.nb_terrains:
+                        continue
+                    if any((p, d) in team_dates for team in (home, away) for p in partners.get(team.id, ())):
+                        continue
+                    week = tuple(d.isocalendar())[:2]
+                    cost = slot_cost
+                    relax = [slot_relax] if slot_relax else []
+                    busy = [team for team in (home, away) if team_weeks.get((team.id, week), 0) > 0]
+                    if busy:
+                        if not relaxations.second_weekly_match:
+                            continue
+                        cost += COUT_SECOND_MATCH_SEMAINE * len(busy)
+                        relax.append("2e match de la semaine pour " + ", ".join(team.nom for team in busy))
+                    options.append((i, home, away, d, ts, cost, relax))
+
+    if not options:
+        logger.info(f"[INFO] Réparation des non programmés: aucun candidat pour "
+                    f"{len(scheduler.unscheduled_matches)} matchs")
+        return []
+
+    # Modèle minuscule: uniquement les candidats des matchs non programmés
+    model = cp_model.CpModel()
+    variables = [model.NewBoolVar('') for _ in options]
+    groups: Dict[tuple, list] = {}
+    teams = {}
+    new_home: Dict[str, list] = {}
+    new_away: Dict[str, list] = {}
+    for var, (i, home, away, d, ts, cost, relax) in zip(variables, options):
+        week = tuple(d.isocalendar())[:2]
+        teams[home.id], teams[away.id] = home, away
+        new_home.setdefault(home.id, []).append(var)
+        new_away.setdefault(away.id, []).append(var)
+        groups.setdefault(('match', i), []).append(var)
+        groups.setdefault(('gym', ts.gymnase_id, d), []).append(var)
+        for team in (home, away):
+            groups.setdefault(('date', team.id, d), []).append(var)
+            groups.setdefault(('week', team.id, week), []).append(var)
+            for p in partners.get(team.id, ()):
+                groups.setdefault(('roster', frozenset((team.id, p)), d), []).append(var)
+    for key, group in groups.items():
+        if key[0] == 'gym':
+            model.Add(sum(group) <= loader.gymnases[key[1]].nb_terrains - gym_used.get((key[1], key[2]), 0))
+        else:
+            model.AddAtMostOne(group)
+
+    # Équilibre dom/ext des équipes avec créneaux, calendrier fixé compris
+    for team_id, team in teams.items():
+        if not team.time_slots:
+            continue
+        model.Add(home_count.get(team_id, 0) + sum(new_home.get(team_id, []))
+                  >= away_count.get(team_id, 0) + sum(new_away.get(team_id, [])) - 1)
+
+    model.Maximize(sum(var * (_GAIN_MATCH - option[5]) for var, option in zip(variables, options)))
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = relaxations.max_time_in_seconds
+    status = solver.Solve(model)
+
+    placements = []
+    if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
+        for var, (i, home, away, d, ts, cost, relax) in zip(variables, options):
+            if solver.Value(var):
+                placements.append(Placement(i, home, away, d, ts, relax))
+    logger.info(f"[INFO] Réparation des non programmés: {len(placements)}/{len(scheduler.unscheduled_matches)} "
+                f"matchs placés ({len(options)} candidats, {solver.StatusName(status)}, "
+                f"{time.perf_counter() - start:.3f}s)")
+    return placements
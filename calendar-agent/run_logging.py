@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Journalisation des scripts de génération (console + fichier generation_*.log).
+
+Chaque module écrit dans son logger (logging.getLogger(__name__)); les messages gardent
+leurs préfixes habituels ([INFO], [OK], [ATTENTION], [ERREUR]) et sont émis au niveau
+correspondant. Le détail match par match (calendrier complet, itérations LNS, placements
+de la réparation...) est au niveau DEBUG: il n'est affiché qu'avec verbose=True.
+
+Les messages sont mis en file (QueueHandler) et écrits par un thread dédié
+(QueueListener): la résolution n'attend jamais les écritures console ou fichier. Un
+fichier JSON lines optionnel reçoit les mêmes messages avec leur niveau, leur module,
+leur horodatage et la phase en cours du rapport d'exécution.
+"""
+
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional
+
+from run_report import current_report
+
+# Listener de l'exécution courante (arrêté par shutdown_logging)
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Un objet JSON par message: horodatage, niveau, module, phase, message."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps({
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'phase': getattr(record, 'phase', ''),
+            'message': record.getMessage().strip('\n'),
+        }, ensure_ascii=False)
+
+
+class _PhaseFilter(logging.Filter):
+    """Ajoute aux messages la phase en cours du rapport d'exécution (span)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.phase = current_report().phase
+        return True
+
+
+def setup_logging(log_filename: str, verbose: bool = False, json_filename: Optional[str] = None) -> None:
+    """Configure la journalisation console + fichier de l'exécution.
+
+    Args:
+        log_filename: Fichier texte (écrasé), même contenu que la console
+        verbose: Afficher aussi le détail match par match (niveau DEBUG)
+        json_filename: Fichier JSON lines optionnel (un message par ligne)
+    """
+    global _listener
+    shutdown_logging()
+
+    plain = logging.Formatter('%(message)s')
+    handlers = []
+    for handler in (logging.StreamHandler(sys.stdout), logging.FileHandler(log_filename, 'w', encoding='utf-8')):
+        handler.setFormatter(plain)
+        handlers.append(handler)
+    if json_filename:
+        handler = logging.FileHandler(json_filename, 'w', encoding='utf-8')
+        handler.setFormatter(JsonLinesFormatter())
+        handlers.append(handler)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(_PhaseFilter())
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(logging.DEBUG if verbose else logging.INFO)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Vide la file des messages et ferme les fichiers de log."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+
+@contextmanager
+def quiet():
+    """Masque les messages INFO et DEBUG (reconstruction d'un modèle déjà journalisé...)."""
+    previous = logging.root.manager.disable
+    logging.disable(logging.INFO)
+    try:
+        yield
+    finally:
+        logging.disable(previous)
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+Mesure des phases du pipeline de génération et rapport d'exécution JSON.
+
+Chaque phase (chargement, conversion, candidats, contraintes, résolution, extraction,
+fichier SQL...) est entourée d'un span(nom): sa durée est ajoutée au rapport de
+l'exécution courante, les spans imbriqués étant enregistrés avec leur chemin complet
+(ex: "build_model/constraints"). Le rapport contient aussi la taille du modèle (variables,
+contraintes par famille), le résultat de la résolution et le pic mémoire; il est écrit en
+JSON à côté du fichier generation_*.log.
+
+Le profilage est optionnel: cProfile (statistiques écrites dans un fichier .prof, lisible
+avec pstats ou snakeviz) et tracemalloc (pic mémoire Python exact, plus lent).
+"""
+
+import cProfile
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List
+
+try:
+    import resource  # Unix uniquement: pic mémoire du processus
+except ImportError:
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+class RunReport:
+    """Rapport d'une exécution: durées des phases, taille du modèle, résultat, mémoire."""
+
+    def __init__(self, cprofile: bool = False, trace_memory: bool = False):
+        """Démarre le rapport (et les profileurs demandés).
+
+        Args:
+            cprofile: Profiler l'exécution avec cProfile
+            trace_memory: Suivre les allocations Python avec tracemalloc (pic mémoire exact)
+        """
+        self.started_at = datetime.now()
+        self.start = time.perf_counter()
+        self.phases: List[Dict] = []
+        self.model: Dict = {}
+        self.result: Dict = {}
+        self._stack: List[str] = []
+        self.profiler = cProfile.Profile() if cprofile else None
+        self.trace_memory = trace_memory
+        if trace_memory:
+            tracemalloc.start()
+        if self.profiler:
+            self.profiler.enable()
+
+    @contextmanager
+    def span(self, name: str):
+        """Mesure la durée d'une phase (imbriquable)."""
+        self._stack.append(name)
+        path = "/".join(self._stack)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append({
+                'phase': path,
+                'start': round(start - self.start, 4),
+                'duration': round(time.perf_counter() - start, 4),
+            })
+            self._stack.pop()
+
+    @property
+    def phase(self) -> str:
+        """Chemin de la phase en cours (ex: "generate_schedule/solve"), vide hors span."""
+        return "/".join(self._stack)
+
+    def record_model(self, model, index=None) -> None:
+        """Enregistre la taille du modèle et, s'il vient d'être construit, le détail par famille."""
+        proto = model.Proto()
+        self.model = {
+            'variables': len(proto.variables),
+            'constraints': len(proto.constraints),
+        }
+        if index is not None and index.constraint_counts:
+            self.model['families'] = {
+                family: {
+                    'constraints': index.constraint_counts.get(family),
+                    'seconds': round(seconds, 4),
+                }
+                for family, seconds in index.timings.items()
+            }
+
+    def record_result(self, **values) -> None:
+        """Ajoute des valeurs au résultat (statut, objectif, matchs programmés...)."""
+        self.result.update(values)
+
+    def peak_memory(self) -> Dict:
+        """Pic mémoire: processus (ru_maxrss) et allocations Python (tracemalloc)."""
+        memory = {}
+        if resource is not None:
+            maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            # ru_maxrss est en octets sous macOS, en kilo-octets sous Linux
+            memory['process_peak_mb'] = round(maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+        if self.trace_memory and tracemalloc.is_tracing():
+            memory['python_peak_mb'] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+        return memory
+
+    def write(self, filename: str) -> None:
+        """Arrête les profileurs et écrit le rapport JSON (et le .prof de cProfile)."""
+        if self.profiler:
+            self.profiler.disable()
+            prof_filename = os.path.splitext(filename)[0] + '.prof'
+            self.profiler.dump_stats(prof_filename)
+            logger.info(f"[INFO] Profil cProfile: {prof_filename}")
+
+        report = {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'total_seconds': round(time.perf_counter() - self.start, 3),
+            'python': platform.python_version(),
+            'phases': self.phases,
+            'model': self.model,
+            'result': self.result,
+            'memory': self.peak_memory(),
+        }
+        if self.trace_memory:
+            tracemalloc.stop()
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        logger.info(f"[INFO] Rapport d'exécution: {filename}")
+
+
+# Rapport de l'exécution courante (remplacé par start_report)
+_current = RunReport()
+
+
+def start_report(cprofile: bool = False, trace_memory: bool = False) -> RunReport:
+    """Démarre un nouveau rapport, utilisé par span() et current_report()."""
+    global _current
+    _current = RunReport(cprofile, trace_memory)
+    return _current
+
+
+def current_report() -> RunReport:
+    """Rapport de l'exécution courante."""
+    return _current
+
+
+def span(name: str):
+    """Mesure une phase dans le rapport courant: with span('solve'): ..."""
+    return _current.span(name)
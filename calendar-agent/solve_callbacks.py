@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Callbacks de suivi des résolutions CP-SAT.
+
+L'objectif du scheduler (nombre de matchs programmés) a une borne supérieure connue: le
+nombre de matchs ayant au moins un candidat. ObjectiveStopCallback arrête la recherche dès
+que cette borne (ou un écart relatif toléré) est atteinte, sans attendre la preuve
+d'optimalité, et mesure le temps jusqu'à la première et jusqu'à la meilleure solution.
+CheckpointCallback écrit en plus chaque solution améliorante dans un fichier de reprise,
+pour ne rien perdre si la résolution est interrompue.
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Optional
+
+from ortools.sat.python import cp_model
+
+from candidates import CandidateTable
+
+
+class ObjectiveStopCallback(cp_model.CpSolverSolutionCallback):
+    """Arrête la recherche quand l'objectif atteint la borne connue, à l'écart près."""
+
+    def __init__(self, target: int, gap: float = 0.0):
+        """Initialise le callback.
+
+        Args:
+            target: Borne supérieure de l'objectif (nombre de matchs programmables)
+            gap: Écart relatif toléré (0.02 = arrêt à 98% de la borne)
+        """
+        super().__init__()
+        self.target = target
+        self.threshold = target * (1.0 - gap)
+        self.solutions = 0
+        self.best_objective: Optional[float] = None
+        self.time_to_first: Optional[float] = None
+        self.time_to_best: Optional[float] = None
+        self.reached_target = False
+
+    def OnSolutionCallback(self) -> None:
+        """Appelé par CP-SAT à chaque nouvelle solution."""
+        objective = self.ObjectiveValue()
+        wall_time = self.WallTime()
+        self.solutions += 1
+        if self.time_to_first is None:
+            self.time_to_first = wall_time
+        if self.best_objective is None or objective > self.best_objective:
+            self.best_objective = objective
+            self.time_to_best = wall_time
+            self.on_improvement(objective)
+        if objective >= self.threshold:
+            self.reached_target = True
+            self.StopSearch()
+
+    def on_improvement(self, objective: float) -> None:
+        """Appelé à chaque solution améliorante (à redéfinir dans les sous-classes)."""
+
+    def summary(self) -> str:
+        """Résumé: nombre de solutions, temps jusqu'à la première et la meilleure."""
+        if self.time_to_first is None:
+            return "aucune solution"
+        stop = ", borne atteinte" if self.reached_target else ""
+        return (f"{self.solutions} solutions, première en {self.time_to_first:.1f}s, "
+                f"meilleure ({self.best_objective:.0f}/{self.target}) en {self.time_to_best:.1f}s{stop}")
+
+
+class CheckpointCallback(ObjectiveStopCallback):
+    """ObjectiveStopCallback qui écrit chaque solution améliorante dans un fichier de reprise.
+
+    Le fichier JSON contient les matchs retenus (domicile, extérieur, date, gymnase) plutôt
+    que des index de candidats: il reste utilisable comme indice (voir
+    warm_start.parse_checkpoint_file) même si les données ont changé entre deux exécutions.
+    """
+
+    def __init__(self, target: int, gap: float, candidates: CandidateTable, filename: str):
+        """Initialise le callback.
+
+        Args:
+            target: Borne supérieure de l'objectif (nombre de matchs programmables)
+            gap: Écart relatif toléré (voir ObjectiveStopCallback)
+            candidates: CandidateTable du modèle résolu
+            filename: Fichier de reprise (réécrit à chaque amélioration)
+        """
+        super().__init__(target, gap)
+        self.candidates = candidates
+        self.filename = filename
+        self.checkpoints = 0
+
+    def on_improvement(self, objective: float) -> None:
+        """Écrit la solution courante (écriture atomique: fichier temporaire puis renommage)."""
+        candidates = self.candidates
+        rows = candidates.rows_from_solution(self.Response().solution)
+        checkpoint = {
+            'objective': objective,
+            'wall_time': round(self.WallTime(), 3),
+            'written_at': datetime.now().isoformat(timespec='seconds'),
+            'matches': [
+                [candidates.teams[candidates.home[row]].id,
+                 candidates.teams[candidates.away[row]].id,
+                 candidates.dates[candidates.date_idx[row]].isoformat(),
+                 candidates.gym_ids[candidates.gym[row]]]
+                for row in rows.tolist()
+            ]
+        }
+        tmp_filename = self.filename + '.tmp'
+        with open(tmp_filename, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_filename, self.filename)
+        self.checkpoints += 1
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Profils de paramètres CP-SAT et mode portfolio.
+
+Un SolverProfile regroupe les paramètres de résolution (temps limite, nombre de workers,
+graine, niveau de linéarisation, presolve, écart toléré à la borne de l'objectif). Le mode
+portfolio lance plusieurs profils en parallèle dans des processus locaux, chacun sur une
+part des cœurs, et garde la meilleure solution; dès qu'un profil prouve l'optimalité ou
+atteint la borne, les autres résolutions sont arrêtées.
+"""
+
+import itertools
+import logging
+import multiprocessing
+import os
+from dataclasses import dataclass, replace
+from typing import List, Optional, Tuple
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from candidates import CandidateTable
+from run_logging import quiet
+from solve_callbacks import ObjectiveStopCallback
+from worker_pool import init_worker, picklable_scheduler, worker_scheduler
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SolverProfile:
+    """Paramètres d'une résolution CP-SAT."""
+    nom: str
+    max_time_in_seconds: float = 300.0
+    num_workers: int = 0  # 0 = choix de CP-SAT (tous les cœurs)
+    random_seed: int = 0
+    linearization_level: int = 1
+    cp_model_presolve: bool = True
+    max_presolve_iterations: int = 3
+    log_search_progress: bool = False
+    target_gap: float = 0.0  # Arrêt dès que l'objectif atteint la borne à cet écart relatif près
+
+    def apply(self, solver: cp_model.CpSolver) -> cp_model.CpSolver:
+        """Applique le profil aux paramètres du solver."""
+        parameters = solver.parameters
+        parameters.max_time_in_seconds = self.max_time_in_seconds
+        if self.num_workers:
+            parameters.num_workers = self.num_workers
+        parameters.random_seed = self.random_seed
+        parameters.linearization_level = self.linearization_level
+        parameters.cp_model_presolve = self.cp_model_presolve
+        parameters.max_presolve_iterations = self.max_presolve_iterations
+        parameters.log_search_progress = self.log_search_progress
+        # Ctrl-C: CP-SAT arrête la recherche proprement et retourne la meilleure solution
+        parameters.catch_sigint_signal = True
+        return solver
+
+    def create_solver(self) -> cp_model.CpSolver:
+        """Crée un CpSolver configuré selon le profil."""
+        return self.apply(cp_model.CpSolver())
+
+
+PROFILES = {
+    # Comportement historique: 300s, paramètres par défaut de CP-SAT
+    'defaut': SolverProfile('defaut'),
+    # Aperçu rapide: moins de temps, pas de relaxation linéaire
+    'rapide': SolverProfile('rapide', max_time_in_seconds=60.0, linearization_level=0),
+    # Saison complète soignée: plus de temps, relaxation linéaire complète
+    'approfondi': SolverProfile('approfondi', max_time_in_seconds=600.0, linearization_level=2),
+}
+
+
+def get_profile(nom: str) -> SolverProfile:
+    """Retourne le profil nommé (voir PROFILES)."""
+    if nom not in PROFILES:
+        raise ValueError(f"Profil solveur inconnu: {nom} (disponibles: {', '.join(PROFILES)})")
+    return PROFILES[nom]
+
+
+def portfolio_profiles(base: SolverProfile, size: Optional[int] = None) -> List[SolverProfile]:
+    """Variantes du profil de base (graine, linéarisation, presolve) se partageant les cœurs.
+
+    Args:
+        base: Profil de référence (temps limite, graine de départ)
+        size: Nombre de résolutions en parallèle (défaut: une par tranche de 8 cœurs, au moins 2)
+    """
+    cpu_count = os.cpu_count() or 1
+    size = size or max(2, cpu_count // 8)
+    workers = max(1, cpu_count // size)
+    variants = [(1, True), (2, True), (0, True), (1, False)]  # (linéarisation, presolve)
+    return [
+        replace(base, nom=f"{base.nom}_{i + 1}", num_workers=workers, random_seed=base.random_seed + i,
+                linearization_level=linearization, cp_model_presolve=presolve)
+        for i, (linearization, presolve) in enumerate(itertools.islice(itertools.cycle(variants), size))
+    ]
+
+
+def _solve_profile(profile: SolverProfile) -> tuple:
+    """Construit et résout le modèle avec un profil (exécuté dans un processus du portfolio).
+
+    Returns:
+        (nom du profil, statut, nom du statut, objectif, lignes retenues, résumé, borne atteinte)
+    """
+    scheduler = worker_scheduler()
+    with quiet():
+        model, candidates, index = scheduler.build_model()
+    solver = profile.create_solver()
+    callback = ObjectiveStopCallback(len(index.by_match), profile.target_gap)
+    status = solver.Solve(model, callback)
+    if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
+        return (profile.nom, status, solver.StatusName(status), solver.ObjectiveValue(),
+                candidates.selected_rows(solver).tolist(), callback.summary(), callback.reached_target)
+    return profile.nom, status, solver.StatusName(status), None, [], callback.summary(), False
+
+
+def solve_portfolio(scheduler, profiles: List[SolverProfile]) -> Tuple[CandidateTable, Optional[np.ndarray]]:
+    """Lance les profils en parallèle et garde la meilleure solution.
+
+    Chaque processus reconstruit le même modèle (construction déterministe): les lignes
+    retenues s'appliquent donc directement à la CandidateTable construite ici.
+
+    Returns:
+        (candidates, lignes retenues), lignes à None si aucun profil n'a trouvé de solution
+    """
+    _, candidates, _ = scheduler.build_model()
+    logger.info(f"[INFO] Portfolio: {len(profiles)} résolutions en parallèle "
+                f"({', '.join(f'{p.nom}: {p.num_workers or os.cpu_count()} workers' for p in profiles)})")
+
+    best = None
+    pool = multiprocessing.Pool(processes=len(profiles), initializer=init_worker,
+                                initargs=(picklable_scheduler(scheduler),))
+    try:
+        results = pool.imap_unordered(_solve_profile, profiles)
+        for nom, status, status_name, objective, rows, summary, reached in results:
+            logger.info(f"       - {nom}: {status_name}, {summary}")
+            if objective is not None and (best is None or objective > best[0]):
+                best = (objective, nom, rows)
+            if status == cp_model.OPTIMAL or reached:
+                logger.info(f"[INFO] Portfolio: {nom} {'optimal' if status == cp_model.OPTIMAL else 'à la borne'}, "
+                            f"arrêt des autres résolutions")
+                break
+    finally:
+        pool.terminate()
+        pool.join()
+
+    if best is None:
+        return candidates, None
+    objective, nom, rows = best
+    logger.info(f"[OK] Portfolio: meilleure solution {nom} (objectif {objective})")
+    return candidates, np.array(rows, dtype=np.int64)
+
+
+def parse_solver_args(args: List[str]) -> Tuple[List[str], SolverProfile, bool]:
+    """Extrait les options solveur de la ligne de commande.
+
+    Options reconnues:
+        --profile=NOM   Profil de PROFILES (defaut, rapide, approfondi)
+        --time=S        Temps limite en secondes
+        --workers=N     Nombre de workers CP-SAT
+        --seed=N        Graine aléatoire
+        --gap=X         Arrêt dès que l'objectif est à X (relatif) de la borne, ex: 0.02
+        --portfolio     Course de plusieurs variantes du profil en parallèle
+
+    Returns:
+        (arguments restants, profil, mode portfolio)
+    """
+    profile = PROFILES['defaut']
+    overrides = {}
+    portfolio = False
+    remaining = []
+    for arg in args:
+        option, _, value = arg.partition('=')
+        if option == '--profile':
+            profile = get_profile(value)
+        elif option == '--time':
+            overrides['max_time_in_seconds'] = float(value)
+        elif option == '--workers':
+            overrides['num_workers'] = int(value)
+        elif option == '--seed':
+            overrides['random_seed'] = int(value)
+        elif option == '--gap':
+            overrides['target_gap'] = float(value)
+        elif option == '--portfolio':
+            portfolio = True
+        else:
+            remaining.append(arg)
+    return remaining, replace(profile, **overrides), portfolio
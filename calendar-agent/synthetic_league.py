@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+Générateur de ligues synthétiques pour mesurer le passage à l'échelle, sans BDD.
+
+Produit les mêmes tables que UfolepDatabaseLoader charge depuis MySQL (clubs, gymnases avec
+nb_terrains et GPS, équipes, classements, créneaux, dates de compétition, historique des
+réceptions, effectifs, indisponibilités des gymnases), puis applique les traitements du
+loader (divisions virtuelles, associations, effectifs communs). Le scheduler s'utilise
+ensuite normalement: load_data(), generate_schedule()...
+
+Les valeurs par défaut reproduisent les ordres de grandeur de m/f/mo 2025-2026 (130 équipes,
+35 clubs, 43 gymnases, 154 créneaux, 18 divisions, 18 paires à effectif commun): seul
+n_teams change pour simuler l'élargissement régional (500, 2000 équipes).
+
+Usage:
+    python synthetic_league.py 500          # Résumé d'une ligue de 500 équipes
+"""
+
+import logging
+import math
+import random
+import sys
+from dataclasses import dataclass
+from datetime import date, time, timedelta
+from typing import Dict, List, Tuple
+
+from db_loader_real import (
+    ClassementData, ClubData, CompetitionDates, CreneauData, EquipeData, GymnaseData,
+    UfolepDatabaseLoader,
+)
+from ufolep_mysql_final import UfolepMySQLScheduler
+
+logger = logging.getLogger(__name__)
+
+# Centre de la zone géographique (Bouches-du-Rhône) et rayon moyen par 130 équipes
+_CENTRE_GPS = (43.45, 5.35)
+_RAYON_KM = 30.0
+_KM_PAR_DEGRE = 111.0
+
+# Répartition des créneaux: jours (1=Lundi..5=Vendredi) et heures de début
+_JOURS = [1, 2, 2, 3, 3, 4, 4, 5]
+_HEURES = [time(19, 30), time(20, 0), time(20, 0), time(20, 30), time(20, 30), time(21, 0)]
+
+
+@dataclass
+class LeagueSpec:
+    """Paramètres d'une ligue synthétique (défauts: m/f/mo 2025-2026)."""
+    n_teams: int = 130
+    competition_codes: Tuple[str, ...] = ('m', 'f', 'mo')
+    teams_per_division: int = 8  # Maximum autorisé par le scheduler
+    teams_per_club: float = 3.7
+    teams_per_gym: float = 3.0
+    second_slot_ratio: float = 0.18  # Équipes avec un second créneau de réception
+    shared_roster_pairs_per_team: float = 0.14  # Paires à effectif commun (même club)
+    incomplete_roster_ratio: float = 0.02  # Effectifs incomplets (ignorés pour l'effectif commun)
+    history_ratio: float = 0.33  # Paires d'une même division dont l'historique impose qui reçoit
+    blacklisted_gym_ratio: float = 0.05
+    start_date: date = date(2026, 3, 2)
+    end_date: date = date(2026, 5, 29)
+    seed: int = 0
+
+
+def _point_near(rnd: random.Random, centre: Tuple[float, float], radius_km: float) -> Tuple[float, float]:
+    """Point aléatoire dans un disque de rayon radius_km autour de centre (lat, lng)."""
+    distance = radius_km * math.sqrt(rnd.random())
+    angle = rnd.uniform(0, 2 * math.pi)
+    lat = centre[0] + distance * math.cos(angle) / _KM_PAR_DEGRE
+    lng = centre[1] + distance * math.sin(angle) / (_KM_PAR_DEGRE * math.cos(math.radians(centre[0])))
+    return lat, lng
+
+
+def populate_loader(loader: UfolepDatabaseLoader, spec: LeagueSpec) -> None:
+    """Remplit les tables du loader avec une ligue synthétique puis applique ses traitements.
+
+    Args:
+        loader: Loader vide (aucune connexion n'est ouverte)
+        spec: Paramètres de la ligue
+    """
+    rnd = random.Random(spec.seed)
+    codes = [code for code in spec.competition_codes if code in loader.competition_codes]
+    # La zone s'étend avec la ligue: densité de clubs constante
+    radius_km = _RAYON_KM * math.sqrt(max(1.0, spec.n_teams / 130))
+
+    # Clubs: tailles inégales (quelques gros clubs, beaucoup de petits)
+    n_clubs = max(1, round(spec.n_teams / spec.teams_per_club))
+    club_centres = {}
+    club_weights = []
+    for i in range(1, n_clubs + 1):
+        club_id = str(i)
+        loader.clubs[club_id] = ClubData(id=club_id, nom=f"Club {i}", affiliation_number=f"013{i:05d}",
+                                         email_responsable='', equipes=[])
+        club_centres[club_id] = _point_near(rnd, _CENTRE_GPS, radius_km)
+        club_weights.append(1.0 / math.sqrt(i))
+    club_ids = list(loader.clubs)
+
+    # Gymnases: rattachés à un club (proches de lui), 1 à 3 terrains
+    n_gyms = max(1, round(spec.n_teams / spec.teams_per_gym))
+    club_gyms: Dict[str, List[str]] = {club_id: [] for club_id in club_ids}
+    for i in range(1, n_gyms + 1):
+        gym_id = str(i)
+        # Chaque club a au moins un gymnase, les suivants vont aux clubs les plus gros
+        club_id = club_ids[i - 1] if i <= n_clubs else rnd.choices(club_ids, club_weights)[0]
+        lat, lng = _point_near(rnd, club_centres[club_id], 3.0)
+        loader.gymnases[gym_id] = GymnaseData(id=gym_id, nom=f"Gymnase {i}", adresse='',
+                                              nb_terrains=rnd.choices([1, 2, 3], [6, 3, 1])[0],
+                                              lat=lat, lng=lng)
+        club_gyms[club_id].append(gym_id)
+    gym_ids = list(loader.gymnases)
+    for club_id, gyms in club_gyms.items():
+        if not gyms:  # Moins de gymnases que de clubs: gymnase partagé
+            gyms.append(rnd.choice(gym_ids))
+
+    # Équipes, classements et créneaux: divisions de teams_per_division au plus par compétition
+    per_code = [spec.n_teams // len(codes) + (1 if k < spec.n_teams % len(codes) else 0) for k in range(len(codes))]
+    team_number = 0
+    creneau_number = 0
+    for code, n_code in zip(codes, per_code):
+        n_divisions = math.ceil(n_code / spec.teams_per_division)
+        for d in range(n_divisions):
+            size = n_code // n_divisions + (1 if d < n_code % n_divisions else 0)
+            for _ in range(size):
+                team_number += 1
+                team_id = str(1000 + team_number)
+                club_id = rnd.choices(club_ids, club_weights)[0]
+                loader.equipes[team_id] = EquipeData(id=team_id, nom=f"{loader.clubs[club_id].nom} {code.upper()}{team_number}",
+                                                     club_id=club_id, classement=None, creneaux=[])
+                classement = ClassementData(id=str(team_number), code_competition=code, division=str(d + 1),
+                                            id_equipe=team_id)
+                loader.classements[classement.id] = classement
+                loader.equipes[team_id].classement = classement
+
+                n_slots = 2 if rnd.random() < spec.second_slot_ratio else 1
+                for _ in range(n_slots):
+                    creneau_number += 1
+                    loader.creneaux[str(creneau_number)] = CreneauData(
+                        id=str(creneau_number), equipe_id=team_id, gymnase_id=rnd.choice(club_gyms[club_id]),
+                        jour_semaine=rnd.choice(_JOURS), heure_debut=rnd.choice(_HEURES))
+
+    for code in codes:
+        loader.competition_dates[code] = CompetitionDates(code_competition=code, start_date=spec.start_date,
+                                                          end_date=spec.end_date)
+    loader._build_virtual_divisions()
+    loader._associate_data()
+
+    # Historique: une rencontre aller par paire d'une même division (l'autre équipe doit recevoir)
+    for division in loader.divisions_virtuelles.values():
+        for i, e1 in enumerate(division.equipes):
+            for e2 in division.equipes[i + 1:]:
+                if rnd.random() < spec.history_ratio:
+                    pair = sorted([e1, e2])
+                    dom = rnd.choice(pair)
+                    loader._add_historique(dom, pair[1] if dom == pair[0] else pair[0])
+
+    # Effectifs: 6 à 12 joueurs, et des paires d'un même club qui partagent la majorité de leur effectif
+    sexes = {'f': 'FF', 'm': 'HH', 'mo': 'HF'}
+    loader.equipes_joueurs_details = {}
+    player_number = 0
+    for team_id, equipe in loader.equipes.items():
+        code = equipe.classement.code_competition
+        size = rnd.randint(1, 5) if rnd.random() < spec.incomplete_roster_ratio else rnd.randint(6, 12)
+        details = {'joueurs': set(), 'hommes': set(), 'femmes': set(), 'code_comp': code}
+        for k in range(size):
+            player_number += 1
+            player_id = str(player_number)
+            details['joueurs'].add(player_id)
+            details['hommes' if sexes.get(code, 'HF')[k % 2] == 'H' else 'femmes'].add(player_id)
+        loader.equipes_joueurs_details[team_id] = details
+        loader.equipes_joueurs[team_id] = details['joueurs']
+
+    teams_by_club: Dict[str, List[str]] = {}
+    for team_id, equipe in loader.equipes.items():
+        teams_by_club.setdefault(equipe.club_id, []).append(team_id)
+    multi_team_clubs = [teams for teams in teams_by_club.values() if len(teams) >= 2]
+    for _ in range(round(spec.n_teams * spec.shared_roster_pairs_per_team) if multi_team_clubs else 0):
+        e1, e2 = rnd.sample(rnd.choice(multi_team_clubs), 2)
+        source = loader.equipes_joueurs_details[e1]
+        for player_id in sorted(source['joueurs'])[:max(1, (len(source['joueurs']) * 2) // 3)]:
+            loader.equipes_joueurs[e2].add(player_id)
+            loader.equipes_joueurs_details[e2]['hommes' if player_id in source['hommes'] else 'femmes'].add(player_id)
+    loader._calculate_effectif_commun()
+
+    # Indisponibilités: quelques gymnases fermés 2 ou 3 jours de semaine dans la période
+    n_days = (spec.end_date - spec.start_date).days
+    for gym_id in rnd.sample(gym_ids, round(n_gyms * spec.blacklisted_gym_ratio)):
+        closed = set()
+        n_closed = rnd.randint(2, 3)
+        while len(closed) < n_closed:
+            day = spec.start_date + timedelta(days=rnd.randrange(n_days + 1))
+            if day.weekday() < 5:
+                closed.add(day)
+        loader.blacklist_gymnases[gym_id] = closed
+
+    logger.info(f"[INFO] Ligue synthétique: {len(loader.clubs)} clubs, {len(loader.gymnases)} gymnases, "
+                f"{len(loader.equipes)} équipes, {len(loader.divisions_virtuelles)} divisions, "
+                f"{len(loader.creneaux)} créneaux, {len(loader.equipes_effectif_commun)} paires à effectif commun")
+
+
+class SyntheticDatabaseLoader(UfolepDatabaseLoader):
+    """Loader qui génère une ligue synthétique au lieu d'interroger MySQL."""
+
+    def __init__(self, spec: LeagueSpec, competition_codes: List[str] = None):
+        super().__init__(competition_codes or list(spec.competition_codes))
+        self.spec = spec
+
+    def load_all_data(self) -> bool:
+        """Génère la ligue (même contrat que le chargement MySQL)."""
+        populate_loader(self, self.spec)
+        return True
+
+
+def synthetic_scheduler(spec: LeagueSpec = None) -> UfolepMySQLScheduler:
+    """Scheduler branché sur une ligue synthétique: appeler load_data() comme d'habitude."""
+    spec = spec or LeagueSpec()
+    scheduler = UfolepMySQLScheduler(list(spec.competition_codes))
+    scheduler.db_loader = SyntheticDatabaseLoader(spec, scheduler.competition_codes)
+    return scheduler
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    loader = SyntheticDatabaseLoader(LeagueSpec(n_teams=int(sys.argv[1]) if len(sys.argv) > 1 else 130))
+    loader.load_all_data()
+    for key, value in loader.get_summary().items():
+        if not isinstance(value, dict):
+            logger.info(f"  - {key}: {value}")
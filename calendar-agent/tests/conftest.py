@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""
+Configuration pytest: modules de calendar-agent importables à plat, ligue synthétique.
+
+Usage (depuis calendar-agent/):
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from run_logging import quiet
+from synthetic_league import LeagueSpec, synthetic_scheduler
+
+
+@pytest.fixture
+def scheduler():
+    """Scheduler d'une ligue synthétique m/f/mo (130 équipes), données chargées."""
+    scheduler = synthetic_scheduler(LeagueSpec())
+    with quiet():
+        assert scheduler.load_data()
+    return scheduler
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""Fichier de reprise: écriture par CheckpointCallback, relecture et reprise en indices."""
+
+from ortools.sat.python import cp_model
+
+from greedy import greedy_matches
+from run_logging import quiet
+from solve_callbacks import CheckpointCallback
+from warm_start import parse_checkpoint_file
+
+
+def test_checkpoint_parse_and_resume(scheduler, tmp_path):
+    checkpoint_file = str(tmp_path / "checkpoint.json")
+    with quiet():
+        scheduler.previous_matches = greedy_matches(scheduler)  # Première solution immédiate
+        model, candidates, index = scheduler.build_model()
+    solver = cp_model.CpSolver()
+    solver.parameters.num_workers = 1
+    solver.parameters.max_time_in_seconds = 5.0
+    callback = CheckpointCallback(len(index.by_match), 0.0, candidates, checkpoint_file)
+    status = solver.Solve(model, callback)
+    assert status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    assert callback.checkpoints >= 1
+
+    # Le fichier contient la meilleure solution, match par match
+    with quiet():
+        previous = parse_checkpoint_file(checkpoint_file)
+    rows = candidates.selected_rows(solver)
+    assert len(previous) == len(rows) == int(round(solver.ObjectiveValue()))
+    expected = {(candidates.teams[candidates.home[row]].id, candidates.teams[candidates.away[row]].id,
+                 candidates.dates[candidates.date_idx[row]], candidates.gym_ids[candidates.gym[row]])
+                for row in rows.tolist()}
+    assert {(m.id_equipe_dom, m.id_equipe_ext, m.date_reception, m.id_gymnasium) for m in previous} == expected
+
+    # Reprise: tous les matchs du fichier sont retrouvés parmi les candidats d'un nouveau modèle
+    scheduler.previous_matches = previous
+    with quiet():
+        resumed_model, resumed, _ = scheduler.build_model()
+    hint = resumed_model.Proto().solution_hint
+    assert len(hint.vars) == len(resumed)
+    assert sum(hint.values) == len(previous)
+
+
+def test_unreadable_checkpoint_gives_no_matches(tmp_path):
+    with quiet():
+        assert parse_checkpoint_file(str(tmp_path / "absent.json")) == []
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""Un snapshot écrit par RecordingSource relit exactement les lignes enregistrées."""
+
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+import pytest
+
+from data_sources import DataSource, RecordingSource, SnapshotSource
+from db_loader_real import UfolepDatabaseLoader
+from run_logging import quiet
+
+
+class RowsSource(DataSource):
+    """Source de test: mêmes lignes typées (types renvoyés par mysql-connector) pour chaque requête."""
+
+    description = "lignes de test"
+
+    def fetch(self, name, query):
+        return [
+            {'id': 1, 'nom': f"{name} é", 'jour': date(2026, 3, 2), 'modifie': datetime(2026, 3, 2, 20, 30),
+             'heure': time(20, 30), 'duree': timedelta(hours=20, minutes=30), 'gps': Decimal('43.45'),
+             'vide': None},
+            {'id': 2, 'nom': None, 'jour': None, 'modifie': None, 'heure': None, 'duree': None, 'gps': None,
+             'vide': None},
+        ]
+
+
+@pytest.fixture
+def queries():
+    """Requêtes nommées du loader (noms et SQL réels)."""
+    return UfolepDatabaseLoader(['m', 'f', 'mo'], RowsSource())._queries()
+
+
+def test_snapshot_matches_recording(queries, tmp_path):
+    filename = str(tmp_path / "snapshot.json.gz")
+    recording = RecordingSource(RowsSource())
+    recorded = recording.fetch_all(queries)
+    recording.write_snapshot(filename, ['m', 'f', 'mo'], fingerprint={'clubs': ['2026-03-02 20:30:00', 12]})
+
+    snapshot = SnapshotSource(filename)
+    with quiet():
+        assert snapshot.connect()
+    assert snapshot.competition_codes == ['m', 'f', 'mo']
+    assert snapshot.fingerprint == {'clubs': ['2026-03-02 20:30:00', 12]}
+    assert snapshot.fetch_all(queries) == recorded
+    for name, rows in recorded.items():
+        for row, read in zip(rows, snapshot.fetch(name, queries[name])):
+            assert {column: type(value) for column, value in read.items()} == \
+                   {column: type(value) for column, value in row.items()}
+
+
+def test_snapshot_rejects_changed_query(queries, tmp_path):
+    filename = str(tmp_path / "snapshot.json.gz")
+    recording = RecordingSource(RowsSource())
+    recording.fetch_all(queries)
+    recording.write_snapshot(filename, ['m', 'f', 'mo'])
+
+    snapshot = SnapshotSource(filename)
+    with quiet():
+        assert snapshot.connect()
+    name, query = next(iter(queries.items()))
+    assert snapshot.has(name, "  " + query.replace(" ", "\n  "))  # Espacement indifférent
+    with pytest.raises(KeyError):
+        snapshot.fetch(name, query + " LIMIT 1")
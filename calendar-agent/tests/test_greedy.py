@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""Le calendrier glouton est une solution réalisable du modèle CP-SAT complet."""
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from greedy import greedy_schedule
+from run_logging import quiet
+
+
+def test_greedy_schedule_is_feasible(scheduler):
+    with quiet():
+        model, candidates, _ = scheduler.build_model()
+        rows = greedy_schedule(scheduler, candidates)
+
+    assert len(rows) > 0
+    assert len(np.unique(candidates.match_id[rows])) == len(rows)  # Au plus une ligne par match
+
+    # Toutes les variables fixées au calendrier glouton: le modèle doit rester réalisable
+    chosen = np.zeros(len(candidates), dtype=bool)
+    chosen[rows] = True
+    for var, value in zip(candidates.vars_at(candidates.rows), chosen.tolist()):
+        model.Add(var == int(value))
+    solver = cp_model.CpSolver()
+    solver.parameters.num_workers = 1
+    solver.parameters.max_time_in_seconds = 30.0
+    status = solver.Solve(model)
+
+    assert status in (cp_model.OPTIMAL, cp_model.FEASIBLE), solver.StatusName(status)
+    assert int(round(solver.ObjectiveValue())) == len(rows)
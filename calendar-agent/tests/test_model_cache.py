@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""Aller-retour du modèle et de la CandidateTable par model_cache."""
+
+import numpy as np
+
+from model_cache import _COLUMNS
+from run_logging import quiet
+
+
+def test_model_cache_round_trip(scheduler, tmp_path):
+    scheduler.model_cache_dir = str(tmp_path)
+    with quiet():
+        model, candidates, index = scheduler.build_model()
+        cached_model, cached, cached_index = scheduler.build_model()
+
+    assert cached is not candidates  # Rechargé depuis le disque, pas reconstruit
+    for column in _COLUMNS:
+        assert np.array_equal(getattr(cached, column), getattr(candidates, column)), column
+    assert cached.dates == candidates.dates
+    assert cached.weeks == candidates.weeks
+    assert [team.id for team in cached.teams] == [team.id for team in candidates.teams]
+    assert [ts.id for ts in cached.slots] == [ts.id for ts in candidates.slots]
+    assert cached.gym_ids == candidates.gym_ids
+
+    assert len(cached_model.Proto().variables) == len(model.Proto().variables)
+    assert len(cached_model.Proto().constraints) == len(model.Proto().constraints)
+    assert [var.Index() for var in cached.vars_at(cached.rows)] == cached.proto_index.tolist()
+    assert cached_index.by_match.keys() == index.by_match.keys()
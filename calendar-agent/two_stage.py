@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+Résolution en deux étapes (semaine puis créneau) pour le scheduler UFOLEP.
+
+Étape 1: un modèle réduit choisit pour chaque match la semaine et l'équipe qui reçoit. Une
+variable par (match, équipe qui reçoit, semaine) remplace tous les candidats (date, créneau)
+de la semaine; la capacité des gymnases y est agrégée par semaine (terrains × dates
+disponibles) pour les réceptions qui n'ont qu'un gymnase possible dans la semaine.
+
+Étape 2: chaque semaine est résolue indépendamment (date, créneau et gymnase des matchs
+retenus), en parallèle dans un pool de processus. Une équipe ne joue qu'une fois par
+semaine: seules la capacité gymnase/date et les effectifs communs couplent les matchs
+d'une semaine. Les matchs qu'une semaine n'a pas pu placer sont confiés au modèle complet
+(repair_solution), le reste du calendrier étant fixé.
+"""
+
+import logging
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from candidates import CandidateTable, group_rows
+from constraint_index import ConstraintIndex
+from decomposition import repair_solution
+from run_logging import quiet
+from solve_callbacks import ObjectiveStopCallback
+from solver_profiles import PROFILES, SolverProfile
+from worker_pool import init_worker, picklable_scheduler, worker_scheduler
+
+logger = logging.getLogger(__name__)
+
+# Parts du temps limite du profil: modèle des semaines, puis placement des semaines (le reste
+# va au modèle complet qui replace les matchs des semaines en échec)
+WEEK_MODEL_TIME_SHARE = 0.4
+WEEK_SLOTS_TIME_SHARE = 0.2
+
+
+def week_table(candidates: CandidateTable) -> Tuple[CandidateTable, Dict[Tuple[int, int, int], np.ndarray]]:
+    """Table réduite: une ligne par (match, équipe qui reçoit, semaine).
+
+    La date de chaque ligne est remplacée par sa semaine (les regroupements par date de
+    ConstraintIndex deviennent des regroupements par semaine). Le gymnase est celui de la
+    première ligne du groupe.
+
+    Returns:
+        (table réduite sans variables, {(match, domicile, semaine): lignes de la table complète})
+    """
+    groups = group_rows((candidates.match_id, candidates.home, candidates.week_idx), candidates.rows)
+    first_rows = np.array([rows[0] for rows in groups.values()], dtype=np.int64)
+    table = candidates.select(first_rows)
+    table = replace(table, date_idx=table.week_idx, variables=[], proto_index=None)
+    return table, groups
+
+
+def _add_weekly_gym_capacity(scheduler, model: cp_model.CpModel, candidates: CandidateTable,
+                             index: ConstraintIndex, table: CandidateTable, groups: dict) -> int:
+    """Capacité agrégée (gymnase, semaine) pour les réceptions à un seul gymnase possible.
+
+    Returns:
+        Nombre de contraintes ajoutées
+    """
+    # Capacité de la semaine: terrains × dates où le gymnase a au moins un candidat
+    capacity = {}
+    for gym, date_idx in index.by_gym_date:
+        gymnase = scheduler.db_loader.gymnases.get(candidates.gym_ids[gym])
+        key = (gym, int(candidates.week_idx[index.by_gym_date[(gym, date_idx)][0]]))
+        capacity[key] = capacity.get(key, 0) + gymnase.nb_terrains
+
+    single_gym = np.array([len(np.unique(candidates.gym[rows])) == 1 for rows in groups.values()])
+    rows = np.flatnonzero(single_gym)
+    added = 0
+    for (gym, week), gym_rows in group_rows((table.gym[rows], table.week_idx[rows]), rows).items():
+        if len(gym_rows) > capacity[(gym, week)]:
+            model.Add(cp_model.LinearExpr.Sum(table.vars_at(gym_rows)) <= capacity[(gym, week)])
+            added += 1
+    return added
+
+
+def _solve_week(week: int, table: CandidateTable, global_rows: np.ndarray, profile: SolverProfile) -> tuple:
+    """Place les matchs d'une semaine (exécuté dans un processus du pool).
+
+    Returns:
+        (semaine, statut, lignes retenues de la table complète, durée en secondes)
+    """
+    start = time.perf_counter()
+    scheduler = worker_scheduler()
+    model = cp_model.CpModel()
+    table.create_variables(model)
+    index = ConstraintIndex(table)
+    with quiet():
+        scheduler._add_match_assignment_constraints_flexible(model, index, len(index.by_match))
+        scheduler._add_team_date_constraints(model, index)
+        scheduler._add_gymnasium_capacity_constraints(model, index)
+        scheduler._add_shared_roster_constraints(model, index)
+
+    solver = profile.create_solver()
+    status = solver.Solve(model, ObjectiveStopCallback(len(index.by_match), profile.target_gap))
+    selected = []
+    if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
+        selected = global_rows[table.selected_rows(solver)].tolist()
+    return week, solver.StatusName(status), selected, time.perf_counter() - start
+
+
+def solve_two_stage(scheduler, max_time_week_model: Optional[float] = None, max_time_week: Optional[float] = None,
+                    max_time_repair: Optional[float] = None, max_workers: Optional[int] = None,
+                    profile: SolverProfile = None) -> Tuple[CandidateTable, Optional[np.ndarray]]:
+    """Choisit la semaine et l'équipe qui reçoit de chaque match, puis le créneau semaine par semaine.
+
+    Args:
+        scheduler: UfolepMySQLScheduler dont les données sont chargées (mode round-robin)
+        max_time_week_model: Limite de temps du modèle (match, domicile, semaine) (secondes).
+                             Par défaut, WEEK_MODEL_TIME_SHARE du temps limite du profil
+        max_time_week: Limite de temps du placement de chaque semaine (secondes). Par défaut,
+                       WEEK_SLOTS_TIME_SHARE du temps limite du profil, réparti entre les
+                       vagues de semaines (semaines / processus)
+        max_time_repair: Limite de temps du modèle complet pour les semaines en échec
+                         (secondes). Par défaut, le temps limite du profil moins le temps
+                         déjà passé
+        max_workers: Nombre de processus du pool (par défaut: nombre de cœurs)
+        profile: Profil solveur des trois étapes; son temps limite est le budget total de la
+                 résolution, le nombre de workers est fixé ici
+
+    Returns:
+        (candidates, lignes retenues) de la CandidateTable complète, lignes à None en cas d'échec
+    """
+    start = time.perf_counter()
+    profile = profile or PROFILES['defaut']
+    cpu_count = os.cpu_count() or 1
+    model, candidates, index = scheduler.build_model()
+
+    # Étape 1: semaine et équipe qui reçoit
+    table, groups = week_table(candidates)
+    week_model = cp_model.CpModel()
+    table.create_variables(week_model)
+    week_index = ConstraintIndex(table)
+    with quiet():
+        scheduler._add_match_assignment_constraints_flexible(week_model, week_index, len(week_index.by_match))
+        scheduler._add_weekly_match_limit_constraints(week_model, week_index)
+        scheduler._add_home_balance_constraints(week_model, week_index)
+    capacity_constraints = _add_weekly_gym_capacity(scheduler, week_model, candidates, index, table, groups)
+    logger.info(f"[INFO] Deux étapes: {len(table)} variables (match, domicile, semaine) au lieu de {len(candidates)}, "
+                f"{capacity_constraints} capacités gymnase/semaine")
+
+    if max_time_week_model is None:
+        max_time_week_model = max(1.0, profile.max_time_in_seconds * WEEK_MODEL_TIME_SHARE)
+    solver = replace(profile, max_time_in_seconds=max_time_week_model,
+                     num_workers=profile.num_workers or cpu_count).create_solver()
+    callback = ObjectiveStopCallback(len(week_index.by_match), profile.target_gap)
+    status = solver.Solve(week_model, callback)
+    logger.info(f"[INFO] Étape 1 (semaines): {solver.StatusName(status)} en {solver.WallTime():.1f}s, {callback.summary()}")
+    if status != cp_model.OPTIMAL and status != cp_model.FEASIBLE:
+        return candidates, None
+    week_rows = table.selected_rows(solver)
+
+    # Étape 2: lignes complètes des (match, domicile, semaine) retenus, semaine par semaine
+    keys = zip(table.match_id[week_rows].tolist(), table.home[week_rows].tolist(), table.week_idx[week_rows].tolist())
+    stage_rows = np.concatenate([groups[key] for key in keys]) if len(week_rows) else np.zeros(0, dtype=np.int64)
+    by_week = group_rows((candidates.week_idx[stage_rows],), stage_rows)
+
+    max_workers = max(1, min(max_workers or cpu_count, len(by_week)))
+    if max_time_week is None:
+        waves = max(1, math.ceil(len(by_week) / max_workers))
+        max_time_week = max(1.0, profile.max_time_in_seconds * WEEK_SLOTS_TIME_SHARE / waves)
+    week_profile = replace(profile, max_time_in_seconds=max_time_week,
+                           num_workers=max(1, cpu_count // max_workers))
+    chosen = []
+    failed_matches = []
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker,
+                             initargs=(picklable_scheduler(scheduler),)) as pool:
+        futures = []
+        for week, rows in by_week.items():
+            sub = replace(candidates.select(rows), variables=[], proto_index=None)
+            futures.append(pool.submit(_solve_week, week, sub, rows, week_profile))
+        for future in futures:
+            week, status_name, selected, seconds = future.result()
+            expected = set(candidates.match_id[by_week[week]].tolist())
+            missing = expected - set(candidates.match_id[selected].tolist()) if selected else expected
+            if missing:
+                year, num = candidates.weeks[week]
+                logger.debug(f"       - semaine {year}-S{num:02d}: {status_name}, "
+                             f"{len(expected) - len(missing)}/{len(expected)} matchs en {seconds:.1f}s")
+                failed_matches.extend(missing)
+            chosen.extend(selected)
+    chosen = np.array(sorted(chosen), dtype=np.int64)
+    logger.info(f"[INFO] Étape 2 (créneaux): {len(by_week)} semaines, {len(chosen)} matchs placés, "
+                f"{len(failed_matches)} à replacer en {time.perf_counter() - start:.1f}s")
+
+    if not failed_matches:
+        logger.info(f"[INFO] Total deux étapes: {time.perf_counter() - start:.1f}s")
+        return candidates, chosen
+
+    # Semaines en échec: matchs non placés repris par le modèle complet, le reste fixé
+    failed_rows = np.flatnonzero(np.isin(candidates.match_id, failed_matches))
+    free_teams = np.union1d(candidates.home[failed_rows], candidates.away[failed_rows])
+    if max_time_repair is None:
+        max_time_repair = max(1.0, profile.max_time_in_seconds - (time.perf_counter() - start))
+    selected_rows = repair_solution(model, candidates, index, chosen, free_teams, profile, max_time_repair)
+    logger.info(f"[INFO] Total deux étapes: {time.perf_counter() - start:.1f}s")
+    return candidates, selected_rows
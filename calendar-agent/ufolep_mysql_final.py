@@ -17,16 +17,33 @@ Exemples d'utilisation:
 """
 
 import calendar
-import math
+import logging
 from dataclasses import dataclass
 from datetime import datetime, date, timedelta, time
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 import mysql.connector
+import numpy as np
 from ortools.sat.python import cp_model
 
 from db_config import DB_CONFIG, TABLE_NAMES, COLUMN_MAPPING
-from db_loader_real import UfolepDatabaseLoader
+from data_sources import DataSource
+from db_loader_real import DATACLASS_SLOTS, UfolepDatabaseLoader, pair_key
+from candidates import CandidateMatrix, CandidateTable
+from constraint_index import ConstraintIndex
+from model_cache import cache_key, export_model, load_model, save_model
+from decomposition import solve_decomposed
+from greedy import greedy_matches, greedy_schedule
+from lns import improve_schedule
+from repair_unscheduled import RepairRelaxations, place_unscheduled
+from run_logging import setup_logging, shutdown_logging
+from run_report import current_report, span, start_report
+from two_stage import solve_two_stage
+from solver_profiles import PROFILES, SolverProfile, portfolio_profiles, solve_portfolio
+from warm_start import add_hints, load_previous_matches, parse_checkpoint_file, parse_sql_file
+from solve_callbacks import CheckpointCallback, ObjectiveStopCallback
+
+logger = logging.getLogger(__name__)
 
 # Jours fériés année scolaire 2025-2026
 # Coupes: 19 janvier - 13 février 2026
@@ -57,7 +74,7 @@ VACANCES_ZONE_B = [
     (date(2026, 4, 11), date(2026, 4, 27)),
 ]
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class TimeSlot:
     """Créneau horaire pour un match."""
     id: str
@@ -68,7 +85,7 @@ class TimeSlot:
     club_id: str
     nb_terrains: int = 1
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Team:
     """Équipe avec ses informations complètes."""
     id: str
@@ -80,17 +97,7 @@ class Team:
     lat: float = None
     lng: float = None
 
-def haversine_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
-    """Calcule la distance en km entre deux points GPS (formule Haversine)."""
-    if None in (lat1, lng1, lat2, lng2):
-        return 0
-    R = 6371  # Rayon de la Terre en km
-    dlat = math.radians(lat2 - lat1)
-    dlng = math.radians(lng2 - lng1)
-    a = math.sin(dlat/2)**2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlng/2)**2
-    return R * 2 * math.asin(math.sqrt(a))
-
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Division:
     """Division avec ses équipes."""
     id: str
@@ -99,7 +106,7 @@ class Division:
     division_num: int
     teams: List[Team]
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Match:
     """Match programmé."""
     id: str
@@ -109,7 +116,7 @@ class Match:
     time_slot: TimeSlot
     division: Division
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class PredefinedMatch:
     """Match prédéfini (pour les phases finales)."""
     match_id: str
@@ -121,7 +128,8 @@ class PredefinedMatch:
 class UfolepMySQLScheduler:
     """Générateur de calendrier UFOLEP utilisant les données MySQL réelles."""
     
-    def __init__(self, competition_codes: List[str] = None, predefined_matches: List[PredefinedMatch] = None):
+    def __init__(self, competition_codes: List[str] = None, predefined_matches: List[PredefinedMatch] = None,
+                 data_source: DataSource = None):
         """Initialise le scheduler.
         
         Args:
@@ -129,15 +137,31 @@ class UfolepMySQLScheduler:
                               Par défaut: ['m', 'f', 'mo']
             predefined_matches: Liste de matchs prédéfinis (pour les phases finales).
                                Si fourni, ces matchs sont utilisés au lieu de générer un round-robin.
+            data_source: Source des données du loader (voir data_sources.py). Par défaut: MySQL
         """
         self.competition_codes = competition_codes or ['m', 'f', 'mo']
-        self.db_loader = UfolepDatabaseLoader(self.competition_codes)
+        self.db_loader = UfolepDatabaseLoader(self.competition_codes, data_source)
         self.divisions: List[Division] = []
         self.teams: List[Team] = []
         self.time_slots: List[TimeSlot] = []
         self.matches: List[Match] = []
         self.predefined_matches = predefined_matches or []
         
+        # Index partagés, construits par _convert_data (voir _index_time_slots et _index_teams)
+        self.slots_by_team: Dict[str, List[TimeSlot]] = {}
+        self.slots_by_gym: Dict[str, List[TimeSlot]] = {}
+        self.teams_by_club: Dict[str, List[Team]] = {}
+        
+        # Calendrier précédent transmis au solver comme indices (voir warm_start.py)
+        self.previous_matches = []
+        
+        # Candidats déjà énumérés (calendrier glouton des indices), repris par le prochain build_model
+        self.prebuilt_candidates: Optional[CandidateTable] = None
+        
+        # Cache disque du modèle construit et export pour réglage hors ligne (voir model_cache.py)
+        self.model_cache_dir = None
+        self.model_export_file = None
+        
         # Période de championnat (sera chargée depuis la BDD)
         self.start_date = None
         self.end_date = None
@@ -147,10 +171,12 @@ class UfolepMySQLScheduler:
         
     def load_data(self) -> bool:
         """Charge les données depuis MySQL."""
-        print(f"[INFO] Chargement des données MySQL UFOLEP pour {self.competition_codes}...")
+        logger.info(f"[INFO] Chargement des données MySQL UFOLEP pour {self.competition_codes}...")
         
-        if not self.db_loader.load_all_data():
-            print("[ERREUR] Impossible de charger les données MySQL")
+        with span('mysql'):
+            loaded = self.db_loader.load_all_data()
+        if not loaded:
+            logger.error("[ERREUR] Impossible de charger les données MySQL")
             return False
         
         # Charger les dates de la première compétition depuis la BDD
@@ -160,16 +186,17 @@ class UfolepMySQLScheduler:
             comp_dates = self.db_loader.competition_dates[main_code]
             self.start_date = comp_dates.start_date
             self.end_date = comp_dates.end_date
-            print(f"[OK] Période compétition: {self.start_date} au {self.end_date}")
+            logger.info(f"[OK] Période compétition: {self.start_date} au {self.end_date}")
         else:
-            print(f"[ERREUR] Dates non trouvées pour la compétition '{main_code}'")
+            logger.error(f"[ERREUR] Dates non trouvées pour la compétition '{main_code}'")
             return False
             
-        print(f"[OK] Données chargées: {len(self.db_loader.equipes)} équipes, "
-              f"{len(self.db_loader.divisions_virtuelles)} divisions, "
-              f"{len(self.db_loader.creneaux)} créneaux")
+        logger.info(f"[OK] Données chargées: {len(self.db_loader.equipes)} équipes, "
+                    f"{len(self.db_loader.divisions_virtuelles)} divisions, "
+                    f"{len(self.db_loader.creneaux)} créneaux")
         
-        return self._convert_data()
+        with span('convert_data'):
+            return self._convert_data()
     
     def _convert_data(self) -> bool:
         """Convertit les données MySQL vers les structures du scheduler."""
@@ -192,13 +219,14 @@ class UfolepMySQLScheduler:
                         nb_terrains=gymnase_data.nb_terrains
                     )
                     self.time_slots.append(time_slot)
+            self._index_time_slots()
             
             # Convertir les équipes
             teams_by_division = {}
             for equipe_data in self.db_loader.equipes.values():
                 if equipe_data.classement:
                     # Récupérer les créneaux de cette équipe
-                    equipe_time_slots = [ts for ts in self.time_slots if ts.equipe_id == equipe_data.id]
+                    equipe_time_slots = list(self.slots_by_team.get(equipe_data.id, []))
                     
                     # Récupérer les coordonnées GPS du gymnase principal (premier créneau)
                     lat, lng = None, None
@@ -224,6 +252,7 @@ class UfolepMySQLScheduler:
                     if div_key not in teams_by_division:
                         teams_by_division[div_key] = []
                     teams_by_division[div_key].append(team)
+            self._index_teams()
             
             # Créer les divisions
             for div_data in self.db_loader.divisions_virtuelles.values():
@@ -243,14 +272,28 @@ class UfolepMySQLScheduler:
                     self.divisions.append(division)
             # Compter les équipes dans les divisions retenues
             teams_in_selected_divisions = sum(len(div.teams) for div in self.divisions)
-            print(f"[OK] Conversion terminée: {len(self.divisions)} divisions, "
-                  f"{teams_in_selected_divisions} équipes programmées, {len(self.time_slots)} créneaux")
+            logger.info(f"[OK] Conversion terminée: {len(self.divisions)} divisions, "
+                        f"{teams_in_selected_divisions} équipes programmées, {len(self.time_slots)} créneaux")
             return True
             
         except Exception as e:
-            print(f"[ERREUR] Erreur lors de la conversion des données: {e}")
+            logger.error(f"[ERREUR] Erreur lors de la conversion des données: {e}")
             return False
     
+    def _index_time_slots(self) -> None:
+        """Indexe self.time_slots par équipe et par gymnase (ordre de self.time_slots)."""
+        self.slots_by_team = {}
+        self.slots_by_gym = {}
+        for ts in self.time_slots:
+            self.slots_by_team.setdefault(ts.equipe_id, []).append(ts)
+            self.slots_by_gym.setdefault(ts.gymnase_id, []).append(ts)
+    
+    def _index_teams(self) -> None:
+        """Indexe self.teams par club (ordre de self.teams)."""
+        self.teams_by_club = {}
+        for team in self.teams:
+            self.teams_by_club.setdefault(team.club_id, []).append(team)
+    
     def _is_valid_date(self, date_obj: date) -> bool:
         """Vérifie si une date est valide (pas férié, pas vacances, bon jour semaine)."""
         # Vérifier jour de la semaine (1=Lundi, 7=Dimanche)
@@ -293,176 +336,122 @@ class UfolepMySQLScheduler:
                 # Championnat aller uniquement
                 matches_in_division = n_teams * (n_teams - 1) // 2
                 total_matches += matches_in_division
-                print(f"[INFO] Division {division.code_competition} {division.division_num}: {n_teams} équipes = {matches_in_division} matchs")
+                logger.info(f"[INFO] Division {division.code_competition} {division.division_num}: {n_teams} équipes = {matches_in_division} matchs")
         
         return total_matches
     
-    def _add_match_assignment_constraints_flexible(self, model: cp_model.CpModel, matches_data: list, total_matches: int) -> None:
+    def _add_match_assignment_constraints_flexible(self, model: cp_model.CpModel, index: ConstraintIndex, total_matches: int) -> None:
         """Contrainte flexible : Chaque match programmé 0 ou 1 fois, maximiser les matchs programmés."""
-        matches_by_id = {}
-        for match_data in matches_data:
-            mid = match_data['match_id']
-            if mid not in matches_by_id:
-                matches_by_id[mid] = []
-            matches_by_id[mid].append(match_data['var'])
-        
-        for match_id, vars_list in matches_by_id.items():
-            model.Add(sum(vars_list) <= 1)
-        
-        all_vars = [var for vars_list in matches_by_id.values() for var in vars_list]
-        model.Maximize(sum(all_vars))
+        candidates = index.candidates
+        for match_id, rows in index.by_match.items():
+            model.Add(cp_model.LinearExpr.Sum(candidates.vars_at(rows)) <= 1)
+        
+        model.Maximize(cp_model.LinearExpr.Sum(candidates.vars_at(candidates.rows)))
     
-    def _add_team_date_constraints(self, model: cp_model.CpModel, matches_data: list) -> None:
+    def _add_team_date_constraints(self, model: cp_model.CpModel, index: ConstraintIndex) -> None:
         """Contrainte : Une équipe ne peut jouer qu'un match par date."""
-        team_date_vars = {}
-        for match_data in matches_data:
-            home_team = match_data['home_team']
-            away_team = match_data['away_team']
-            date_obj = match_data['date']
-            var = match_data['var']
-            
-            for team_id in [home_team.id, away_team.id]:
-                key = (team_id, date_obj)
-                if key not in team_date_vars:
-                    team_date_vars[key] = []
-                team_date_vars[key].append(var)
-        
-        for vars_list in team_date_vars.values():
-            model.Add(sum(vars_list) <= 1)
+        candidates = index.candidates
+        for rows in index.by_team_date.values():
+            model.Add(cp_model.LinearExpr.Sum(candidates.vars_at(rows)) <= 1)
     
-    def _add_gymnasium_capacity_constraints(self, model: cp_model.CpModel, matches_data: list) -> None:
+    def _add_gymnasium_capacity_constraints(self, model: cp_model.CpModel, index: ConstraintIndex) -> None:
         """Contrainte : Capacité des gymnases respectée."""
-        gymnasium_date_vars = {}
-        for match_data in matches_data:
-            key = (match_data['time_slot'].gymnase_id, match_data['date'])
-            if key not in gymnasium_date_vars:
-                gymnasium_date_vars[key] = []
-            gymnasium_date_vars[key].append(match_data['var'])
-        
-        for (gym_id, _), vars_list in gymnasium_date_vars.items():
-            gymnase = self.db_loader.gymnases.get(gym_id)
-            model.Add(sum(vars_list) <= gymnase.nb_terrains)
+        candidates = index.candidates
+        for (gym, _), rows in index.by_gym_date.items():
+            gymnase = self.db_loader.gymnases.get(candidates.gym_ids[gym])
+            model.Add(cp_model.LinearExpr.Sum(candidates.vars_at(rows)) <= gymnase.nb_terrains)
     
-    def _add_weekly_match_limit_constraints(self, model: cp_model.CpModel, matches_data: list) -> dict:
+    def _add_weekly_match_limit_constraints(self, model: cp_model.CpModel, index: ConstraintIndex) -> dict:
         """Contrainte : Maximum 1 match par équipe par semaine."""
-        team_week_vars = {}
-        for match_data in matches_data:
-            week_num = match_data['date'].isocalendar()[1]
-            var = match_data['var']
-            
-            for team in [match_data['home_team'], match_data['away_team']]:
-                key = (team.id, week_num)
-                if key not in team_week_vars:
-                    team_week_vars[key] = []
-                team_week_vars[key].append(var)
-        
-        for vars_list in team_week_vars.values():
-            model.Add(sum(vars_list) <= 1)
-        return team_week_vars
+        candidates = index.candidates
+        for rows in index.by_team_week.values():
+            model.Add(cp_model.LinearExpr.Sum(candidates.vars_at(rows)) <= 1)
+        return index.by_team_week
     
-    def _add_home_balance_constraints(self, model: cp_model.CpModel, matches_data: list) -> None:
+    def _add_home_balance_constraints(self, model: cp_model.CpModel, index: ConstraintIndex) -> None:
         """Contrainte : Équipes avec créneaux doivent avoir max 1 match d'écart dom/ext."""
-        teams_with_reception = {team.id for team in self.teams if team.time_slots}
-        
-        team_home_vars = {}
-        team_away_vars = {}
-        
-        for match_data in matches_data:
-            home_id = match_data['home_team'].id
-            away_id = match_data['away_team'].id
-            var = match_data['var']
-            
-            team_home_vars.setdefault(home_id, []).append(var)
-            team_away_vars.setdefault(away_id, []).append(var)
-        
-        for team_id in teams_with_reception:
-            home_vars = team_home_vars.get(team_id, [])
-            away_vars = team_away_vars.get(team_id, [])
-            if home_vars and away_vars:
-                model.Add(sum(home_vars) >= sum(away_vars) - 1)
+        candidates = index.candidates
+        for team_idx, team in enumerate(candidates.teams):
+            if not team.time_slots:
+                continue
+            home_rows = index.by_home.get(team_idx)
+            away_rows = index.by_away.get(team_idx)
+            if home_rows is not None and away_rows is not None:
+                model.Add(cp_model.LinearExpr.Sum(candidates.vars_at(home_rows))
+                          >= cp_model.LinearExpr.Sum(candidates.vars_at(away_rows)) - 1)
     
-    def _add_history_based_home_constraints(self, model: cp_model.CpModel, matches_data: list) -> None:
-        """Contrainte : Alternance domicile/extérieur basée sur l'historique pour TOUTES les paires.
-        
-        Pour chaque paire d'équipes:
-        - Si A a reçu B la dernière fois, alors B doit recevoir A (si B a un créneau)
-        - Sinon: pas de contrainte spécifique sur qui reçoit
-        """
-        teams_by_id = {t.id: t for t in self.teams}
-        teams_with_reception = {team.id for team in self.teams if team.time_slots}
-        
-        # Collecter toutes les paires d'équipes de toutes les divisions
-        all_pairs = []
-        for division in self.divisions:
-            teams = division.teams
-            for i in range(len(teams)):
-                for j in range(i + 1, len(teams)):
-                    t1, t2 = teams[i], teams[j]
-                    all_pairs.append((t1, t2, division))
-        
-        if not all_pairs:
-            return
+    def _static_orientations(self, has_home_candidates: np.ndarray) -> Tuple[list, list, list]:
+        """Orientations (match, domicile, extérieur) à énumérer, règles statiques appliquées.
         
-        # Grouper les variables par paire d'équipes et par qui reçoit
-        pair_home_vars = {}
+        Les règles décidables sans résoudre sont appliquées avant l'énumération des candidats,
+        pour ne jamais créer les variables qu'elles interdiraient:
+        - Alternance historique: pour chaque paire, si A a reçu B la dernière fois, alors B
+          doit recevoir A (si B peut recevoir); l'orientation où A reçoit n'est pas énumérée
+        - Effectif commun: deux équipes qui partagent leur effectif ne peuvent jouer le même
+          soir, leur match ne peut donc jamais être programmé (aucune orientation)
+        En mode prédéfini, seule l'équipe désignée reçoit et aucune règle n'est appliquée.
         
-        for match_data in matches_data:
-            home_id = match_data['home_team'].id
-            away_id = match_data['away_team'].id
-            var = match_data['var']
-            
-            pair = tuple(sorted([home_id, away_id]))
-            if pair not in pair_home_vars:
-                pair_home_vars[pair] = {pair[0]: [], pair[1]: []}
-            
-            pair_home_vars[pair][home_id].append(var)
+        Args:
+            has_home_candidates: Par index d'équipe, True si l'équipe a au moins un candidat
+                                 (créneau, date) pour recevoir
         
-        # Appliquer les contraintes
+        Returns:
+            (match_ids, homes, aways) des orientations retenues
+        """
+        team_index = {team.id: i for i, team in enumerate(self.teams)}
+        match_ids, homes, aways = [], [], []
+        if self.predefined_matches:
+            for mid, match_info in enumerate(self._all_matches_info):
+                match_ids.append(mid)
+                homes.append(team_index[match_info['team1'].id])
+                aways.append(team_index[match_info['team2'].id])
+            return match_ids, homes, aways
+        
+        # Paires repérées par les numéros internes du loader (voir UfolepDatabaseLoader.team_number)
+        team_number = self.db_loader.team_number
+        paires_effectif_commun = {pair_key(team_number(e1_id), team_number(e2_id))
+                                  for e1_id, e2_id, _, _ in self.db_loader.get_equipes_avec_effectif_commun()}
         forced_receptions = 0
         skipped_no_slot = 0
+        pruned_roster = 0
         
-        for t1, t2, division in all_pairs:
-            pair = tuple(sorted([t1.id, t2.id]))
-            if pair not in pair_home_vars:
+        for mid, match_info in enumerate(self._all_matches_info):
+            t1, t2 = match_info['team1'], match_info['team2']
+            i1, i2 = team_index[t1.id], team_index[t2.id]
+            if not has_home_candidates[i1] and not has_home_candidates[i2]:
                 continue
-                
-            vars_t1_home = pair_home_vars[pair].get(t1.id, [])
-            vars_t2_home = pair_home_vars[pair].get(t2.id, [])
-            
-            if not vars_t1_home and not vars_t2_home:
+            if pair_key(team_number(t1.id), team_number(t2.id)) in paires_effectif_commun:
+                pruned_roster += 1
                 continue
             
-            # Vérifier l'historique pour cette paire
+            # Équipe désignée par l'historique: l'autre orientation n'est pas énumérée,
+            # seulement si l'équipe désignée peut recevoir (sinon le match serait perdu)
+            orientations = [(i1, i2), (i2, i1)]
             equipe_qui_doit_recevoir = self.db_loader.get_equipe_qui_doit_recevoir(t1.id, t2.id)
-            
             if equipe_qui_doit_recevoir:
-                # Forcer la réception vers l'équipe désignée par l'historique
-                # MAIS seulement si l'équipe a des dates valides pour recevoir (vars non vide)
-                if equipe_qui_doit_recevoir == t1.id:
-                    if vars_t1_home and t1.id in teams_with_reception:
-                        # Ne pas forcer sum==1 car ça force le match à être programmé
-                        # Juste interdire que t2 reçoive si t1 peut recevoir
-                        if vars_t2_home:
-                            model.Add(sum(vars_t2_home) == 0)
-                        forced_receptions += 1
-                    else:
-                        skipped_no_slot += 1
-                elif equipe_qui_doit_recevoir == t2.id:
-                    if vars_t2_home and t2.id in teams_with_reception:
-                        # Ne pas forcer sum==1 car ça force le match à être programmé
-                        # Juste interdire que t1 reçoive si t2 peut recevoir
-                        if vars_t1_home:
-                            model.Add(sum(vars_t1_home) == 0)
-                        forced_receptions += 1
-                    else:
-                        skipped_no_slot += 1
-        
-        print(f"[INFO] Alternance historique: {forced_receptions} réceptions forcées, {skipped_no_slot} ignorées (pas de créneau/date)")
+                home_idx = i1 if equipe_qui_doit_recevoir == t1.id else i2
+                if has_home_candidates[home_idx]:
+                    orientations = [o for o in orientations if o[0] == home_idx]
+                    forced_receptions += 1
+                else:
+                    skipped_no_slot += 1
+            
+            for home_idx, away_idx in orientations:
+                match_ids.append(mid)
+                homes.append(home_idx)
+                aways.append(away_idx)
+        
+        logger.info(f"[INFO] Alternance historique: {forced_receptions} réceptions forcées, {skipped_no_slot} ignorées (pas de créneau/date)")
+        if pruned_roster:
+            logger.info(f"[INFO] Effectif commun: {pruned_roster} matchs entre équipes à effectif commun non programmables")
+        return match_ids, homes, aways
     
-    def _add_shared_roster_constraints(self, model: cp_model.CpModel, matches_data: list) -> None:
+    def _add_shared_roster_constraints(self, model: cp_model.CpModel, index: ConstraintIndex) -> None:
         """Contrainte optionnelle : Éviter que 2 équipes avec effectif commun jouent le même soir.
         
         Si 2 équipes partagent ≥50% de leur effectif, elles ne doivent pas jouer le même jour.
+        Les paires sont regroupées en cliques maximales (ex: 1H/2H/3H d'un même club) : une seule
+        contrainte AtMostOne par clique et par date remplace une contrainte par paire.
         """
         # Récupérer les paires d'équipes avec effectif commun
         paires_effectif_commun = self.db_loader.get_equipes_avec_effectif_commun()
@@ -470,103 +459,79 @@ class UfolepMySQLScheduler:
         if not paires_effectif_commun:
             return
         
-        # Grouper les matchs par équipe et par date
-        team_date_vars = {}  # {(team_id, date): [vars]}
+        cliques = self.db_loader.get_cliques_effectif_commun()
+        candidates = index.candidates
+        team_index = {team.id: i for i, team in enumerate(candidates.teams)}
         
-        for match_data in matches_data:
-            home_id = match_data['home_team'].id
-            away_id = match_data['away_team'].id
-            date_obj = match_data['date']
-            var = match_data['var']
-            
-            # Les deux équipes sont occupées par ce match
-            for team_id in [home_id, away_id]:
-                key = (team_id, date_obj)
-                if key not in team_date_vars:
-                    team_date_vars[key] = []
-                team_date_vars[key].append(var)
-        
-        # Appliquer les contraintes pour chaque paire avec effectif commun
+        # Appliquer une contrainte par clique et par date
         constraints_added = 0
         
-        for e1_id, e2_id, nb_communs, ratio in paires_effectif_commun:
-            # Pour chaque date, si e1 joue alors e2 ne doit pas jouer
-            dates_with_both = set()
+        for clique in cliques:
+            clique_dates = [index.by_team[team_index[e_id]] for e_id in clique
+                            if team_index.get(e_id) in index.by_team]
+            if len(clique_dates) < 2:
+                continue
             
-            for (team_id, date_obj), vars_list in team_date_vars.items():
-                if team_id == e1_id:
-                    dates_with_both.add(date_obj)
+            # Nombre d'équipes de la clique pouvant jouer à chaque date
+            nb_equipes = {}
+            for team_dates in clique_dates:
+                for date_idx in team_dates:
+                    nb_equipes[date_idx] = nb_equipes.get(date_idx, 0) + 1
             
-            for date_obj in dates_with_both:
-                vars_e1 = team_date_vars.get((e1_id, date_obj), [])
-                vars_e2 = team_date_vars.get((e2_id, date_obj), [])
-                
-                if vars_e1 and vars_e2:
-                    # Au plus une des deux équipes peut jouer ce jour
-                    model.Add(sum(vars_e1) + sum(vars_e2) <= 1)
-                    constraints_added += 1
+            # Seules les dates où au moins deux équipes de la clique peuvent jouer sont concernées
+            for date_idx, nb in nb_equipes.items():
+                if nb < 2:
+                    continue
+                # Un match entre deux équipes de la clique apparaît deux fois: il est interdit,
+                # comme avec l'ancienne contrainte par paire (coefficient 2 <= 1)
+                rows = np.concatenate([team_dates[date_idx] for team_dates in clique_dates
+                                       if date_idx in team_dates])
+                model.AddAtMostOne(candidates.vars_at(rows))
+                constraints_added += 1
         
         if constraints_added > 0:
             # Récupérer les noms pour le log
             teams_by_id = {t.id: t for t in self.teams}
-            print(f"[INFO] Effectif commun: {len(paires_effectif_commun)} paires, {constraints_added} contraintes jour ajoutées")
+            logger.info(f"[INFO] Effectif commun: {len(paires_effectif_commun)} paires en {len(cliques)} cliques, "
+                        f"{constraints_added} contraintes jour ajoutées")
             for e1_id, e2_id, nb_communs, ratio in paires_effectif_commun[:5]:  # Afficher max 5
                 e1_nom = teams_by_id.get(e1_id, type('', (), {'nom': e1_id})()).nom
                 e2_nom = teams_by_id.get(e2_id, type('', (), {'nom': e2_id})()).nom
-                print(f"       - {e1_nom} / {e2_nom}: {nb_communs} joueurs ({int(ratio*100)}%)")
+                logger.debug(f"       - {e1_nom} / {e2_nom}: {nb_communs} joueurs ({int(ratio*100)}%)")
             if len(paires_effectif_commun) > 5:
-                print(f"       ... et {len(paires_effectif_commun) - 5} autres paires")
+                logger.debug(f"       ... et {len(paires_effectif_commun) - 5} autres paires")
         
-    def generate_schedule(self) -> bool:
-        """Génère le calendrier complet avec OR-Tools."""
+    def _prepare_matches(self) -> Tuple[List[date], int]:
+        """Calcule les dates valides et la liste des matchs à planifier (self._all_matches_info).
+        
+        Returns:
+            (dates valides, nombre de matchs)
+        """
         total_matches = self._calculate_matches_needed()
         valid_dates = self._generate_valid_dates()
-
-        # Initialiser le modèle OR-Tools
-        model = cp_model.CpModel()
-        
-        # Variables de décision
-        match_vars = {}
-        matches_data = []
         
         # Index des équipes par ID pour les matchs prédéfinis
         teams_by_id = {team.id: team for team in self.teams}
         
-        # Créer toutes les combinaisons possibles
-        match_id = 0
-        
+        # Liste des matchs à planifier (sert aussi à gérer les non-programmables)
+        self._all_matches_info = []
         if self.predefined_matches:
             # Mode matchs prédéfinis (phases finales)
-            print(f"[INFO] Mode matchs prédéfinis: {len(self.predefined_matches)} matchs")
-            # Inverser l'ordre des dates pour privilégier les dates les plus proches
-            sorted_dates = sorted(valid_dates, reverse=True)
+            logger.info(f"[INFO] Mode matchs prédéfinis: {len(self.predefined_matches)} matchs")
             for predef in self.predefined_matches:
                 team_home = teams_by_id.get(predef.home_team_id)
                 team_away = teams_by_id.get(predef.away_team_id)
                 
                 if not team_home or not team_away:
-                    print(f"[ATTENTION] Match {predef.match_id}: équipe non trouvée (home={predef.home_team_id}, away={predef.away_team_id})")
+                    logger.warning(f"[ATTENTION] Match {predef.match_id}: équipe non trouvée (home={predef.home_team_id}, away={predef.away_team_id})")
                     continue
                 
-                # Seul l'équipe à domicile peut recevoir
-                for date_obj in sorted_dates:
-                    for time_slot in team_home.time_slots:
-                        if date_obj.weekday() + 1 == time_slot.jour_semaine:
-                            if not self.db_loader.is_gymnase_available(time_slot.gymnase_id, date_obj):
-                                continue
-                            var_name = f"match_{predef.match_id}_{date_obj}_{time_slot.id}"
-                            match_var = model.NewBoolVar(var_name)
-                            match_vars[var_name] = match_var
-                            
-                            matches_data.append({
-                                'var': match_var,
-                                'match_id': predef.match_id,
-                                'home_team': team_home,
-                                'away_team': team_away,
-                                'date': date_obj,
-                                'time_slot': time_slot,
-                                'division': predef.division
-                            })
+                self._all_matches_info.append({
+                    'match_id': predef.match_id,
+                    'team1': team_home,
+                    'team2': team_away,
+                    'division': predef.division
+                })
         else:
             # Mode round-robin (championnats/coupes)
             for division in self.divisions:
@@ -577,195 +542,337 @@ class UfolepMySQLScheduler:
                 # Générer tous les matchs de la division (aller uniquement)
                 for i in range(n_teams):
                     for j in range(i + 1, n_teams):
-                        team_home = teams[i]
-                        team_away = teams[j]
-                        # Créer les variables pour chaque date et créneau possible
-                        for date_obj in valid_dates:
-                            # Match à domicile : créneaux de l'équipe à domicile
-                            for time_slot in team_home.time_slots:
-                                if date_obj.weekday() + 1 == time_slot.jour_semaine:
-                                    # Vérifier que le gymnase est disponible à cette date
-                                    if not self.db_loader.is_gymnase_available(time_slot.gymnase_id, date_obj):
-                                        continue
-                                    var_name = f"match_{match_id}_home_{date_obj}_{time_slot.id}"
-                                    match_var = model.NewBoolVar(var_name)
-                                    match_vars[var_name] = match_var
-                                    
-                                    matches_data.append({
-                                        'var': match_var,
-                                        'match_id': match_id,
-                                        'home_team': team_home,
-                                        'away_team': team_away,
-                                        'date': date_obj,
-                                        'time_slot': time_slot,
-                                        'division': division
-                                    })
-                            
-                            # Match à l'extérieur : créneaux de l'équipe à l'extérieur
-                            for time_slot in team_away.time_slots:
-                                if date_obj.weekday() + 1 == time_slot.jour_semaine:
-                                    # Vérifier que le gymnase est disponible à cette date
-                                    if not self.db_loader.is_gymnase_available(time_slot.gymnase_id, date_obj):
-                                        continue
-                                    var_name = f"match_{match_id}_away_{date_obj}_{time_slot.id}"
-                                    match_var = model.NewBoolVar(var_name)
-                                    match_vars[var_name] = match_var
-                                    
-                                    matches_data.append({
-                                        'var': match_var,
-                                        'match_id': match_id,
-                                        'home_team': team_away,  # Inversion !
-                                        'away_team': team_home,  # Inversion !
-                                        'date': date_obj,
-                                        'time_slot': time_slot,
-                                        'division': division
-                                    })
-                        
-                        match_id += 1
-        
-        # Stocker les infos des matchs pour gérer les non-programmables
-        self._all_matches_info = []
-        if self.predefined_matches:
-            for predef in self.predefined_matches:
-                team_home = teams_by_id.get(predef.home_team_id)
-                team_away = teams_by_id.get(predef.away_team_id)
-                if team_home and team_away:
-                    self._all_matches_info.append({
-                        'team1': team_home,
-                        'team2': team_away,
-                        'division': predef.division
-                    })
-        else:
-            for division in self.divisions:
-                teams = division.teams
-                n_teams = len(teams)
-                if n_teams < 3:
-                    continue
-                for i in range(n_teams):
-                    for j in range(i + 1, len(teams)):
                         self._all_matches_info.append({
+                            'match_id': len(self._all_matches_info),
                             'team1': teams[i],
                             'team2': teams[j],
                             'division': division
                         })
+        return valid_dates, len(self._all_matches_info)
+    
+    def build_candidates(self) -> CandidateTable:
+        """Énumère les candidats (match, date, créneau) sans construire le modèle CP-SAT."""
+        valid_dates, match_id = self._prepare_matches()
+        return self._enumerate_candidates(valid_dates, match_id)
+    
+    def build_model(self):
+        """Construit le modèle CP-SAT (candidats, variables, contraintes) sans le résoudre.
         
-        # Application des contraintes SIMPLIFIÉES
-        # 1. Chaque match programmé exactement une fois (si possible)
-        self._add_match_assignment_constraints_flexible(model, matches_data, match_id)
+        Si self.model_cache_dir est défini, le modèle est rechargé depuis le cache quand les
+        données et paramètres sont identiques à une exécution précédente (voir model_cache.py).
+        Si self.prebuilt_candidates est défini (voir greedy_matches), ces candidats sont repris
+        tels quels au lieu de préparer les matchs et de les énumérer à nouveau.
         
-        # 2. Max 1 match par équipe par date
-        self._add_team_date_constraints(model, matches_data)
+        Returns:
+            (model, candidates, index): le modèle, la CandidateTable et le ConstraintIndex
+        """
+        prebuilt, self.prebuilt_candidates = self.prebuilt_candidates, None
+        if prebuilt is not None:
+            valid_dates, match_id = prebuilt.dates, len(self._all_matches_info)
+        else:
+            valid_dates, match_id = self._prepare_matches()
+        
+        cached = None
+        if self.model_cache_dir:
+            key = cache_key(self, valid_dates)
+            with span('model_cache'):
+                cached = load_model(self.model_cache_dir, key, self)
+        if cached:
+            model, candidates, index = cached
+        else:
+            model, candidates, index = self._build_constraints(valid_dates, match_id, prebuilt)
+            if self.model_cache_dir:
+                with span('model_cache'):
+                    save_model(self.model_cache_dir, key, model, candidates)
+        current_report().record_model(model, index)
         
-        # 3. Capacité gymnases
-        self._add_gymnasium_capacity_constraints(model, matches_data)
+        if self.model_export_file:
+            export_model(model, self.model_export_file)
         
-        # 4. Max 1 match par équipe par semaine (sauf pour matchs prédéfinis où chaque équipe ne joue qu'un match)
-        if not self.predefined_matches:
-            self._add_weekly_match_limit_constraints(model, matches_data)
+        # Démarrage à chaud: le calendrier précédent sert d'indice au solver
+        if self.previous_matches:
+            found = add_hints(model, candidates, self.previous_matches)
+            logger.info(f"[INFO] Démarrage à chaud: {found}/{len(self.previous_matches)} matchs précédents en indice")
         
-        # 5. Équilibre dom/ext pour équipes avec créneaux (sauf pour matchs prédéfinis)
+        return model, candidates, index
+    
+    def _enumerate_candidates(self, valid_dates: List[date], match_id: int) -> CandidateTable:
+        """Énumère les candidats des matchs de self._all_matches_info (variables non créées)."""
+        # Candidats (match, date, créneau) énumérés en bloc depuis la matrice de disponibilité.
+        # Seule l'équipe à domicile fournit le créneau; les orientations interdites par une
+        # règle statique (historique, effectif commun) ne sont pas énumérées.
+        matrix = CandidateMatrix(valid_dates, self.teams, self.db_loader.blacklist_gymnases)
+        home_candidates = matrix.candidates_per_team()
+        match_ids, homes, aways = self._static_orientations(home_candidates > 0)
+        candidates = matrix.enumerate(match_ids, homes, aways)
         if not self.predefined_matches:
-            self._add_home_balance_constraints(model, matches_data)
+            # Candidats des deux orientations de chaque match, avant élagage
+            team_index = {team.id: i for i, team in enumerate(self.teams)}
+            unpruned = sum(int(home_candidates[team_index[m['team1'].id]] + home_candidates[team_index[m['team2'].id]])
+                           for m in self._all_matches_info)
+            logger.info(f"[INFO] Élagage statique: {unpruned - len(candidates)} candidats écartés sur {unpruned}")
+        logger.info(f"[INFO] {len(candidates)} combinaisons possibles pour {match_id} matchs")
+        return candidates
+    
+    def _build_constraints(self, valid_dates: List[date], match_id: int,
+                           candidates: Optional[CandidateTable] = None):
+        """Énumère les candidats des matchs de self._all_matches_info et ajoute les contraintes.
         
-        # 6. Alternance dom/ext basée sur l'historique (sauf pour matchs prédéfinis où dom/ext est déjà fixé)
-        if not self.predefined_matches:
-            self._add_history_based_home_constraints(model, matches_data)
+        Args:
+            candidates: Candidats déjà énumérés (variables non créées), sinon énumérés ici
         
-        # 7. Éviter que 2 équipes avec effectif commun jouent le même soir (sauf pour matchs prédéfinis)
-        if not self.predefined_matches:
-            self._add_shared_roster_constraints(model, matches_data)
+        Returns:
+            (model, candidates, index)
+        """
+        # Initialiser le modèle OR-Tools
+        model = cp_model.CpModel()
+        if candidates is None:
+            with span('candidates'):
+                candidates = self._enumerate_candidates(valid_dates, match_id)
+        
+        # Variables de décision, créées uniquement pour les candidats valides
+        with span('variables'):
+            candidates.create_variables(model)
+        
+        # Regroupements partagés par toutes les familles de contraintes
+        index = ConstraintIndex(candidates)
+        
+        with span('constraints'):
+            # Application des contraintes SIMPLIFIÉES
+            # 1. Chaque match programmé exactement une fois (si possible)
+            with index.timed('match_assignment', model):
+                self._add_match_assignment_constraints_flexible(model, index, match_id)
+            
+            # 2. Max 1 match par équipe par date
+            with index.timed('team_date', model):
+                self._add_team_date_constraints(model, index)
+            
+            # 3. Capacité gymnases
+            with index.timed('gymnasium_capacity', model):
+                self._add_gymnasium_capacity_constraints(model, index)
+            
+            # Contraintes 4 à 7 ignorées pour les matchs prédéfinis (chaque équipe ne joue qu'un match, dom/ext déjà fixé)
+            if not self.predefined_matches:
+                # 4. Max 1 match par équipe par semaine
+                with index.timed('weekly_limit', model):
+                    self._add_weekly_match_limit_constraints(model, index)
+            
+                # 5. Équilibre dom/ext pour équipes avec créneaux
+                with index.timed('home_balance', model):
+                    self._add_home_balance_constraints(model, index)
+            
+                # 6. Alternance dom/ext basée sur l'historique: appliquée à l'énumération
+                #    (voir _static_orientations)
+            
+                # 7. Éviter que 2 équipes avec effectif commun jouent le même soir
+                with index.timed('shared_roster', model):
+                    self._add_shared_roster_constraints(model, index)
         
-        # Résoudre
-        solver = cp_model.CpSolver()
-        solver.parameters.max_time_in_seconds = 300.0
-        solver.parameters.log_search_progress = False
+        index.print_timings()
         
         # Pour les matchs prédéfinis, utiliser une stratégie de recherche qui privilégie les dates proches
         if self.predefined_matches:
             # Trier les variables par date croissante pour que le solver les essaie en premier
-            sorted_vars = sorted(matches_data, key=lambda x: x['date'])
-            decision_vars = [d['var'] for d in sorted_vars]
+            by_date = np.argsort(candidates.date_idx, kind='stable')
+            decision_vars = candidates.vars_at(by_date)
             model.AddDecisionStrategy(decision_vars, cp_model.CHOOSE_FIRST, cp_model.SELECT_MAX_VALUE)
         
-        status = solver.Solve(model)
+        return model, candidates, index
+    
+    def generate_schedule(self, decompose: bool = False, max_workers: int = None,
+                          profile: SolverProfile = None, portfolio: bool = False,
+                          checkpoint_file: str = None, two_stage: bool = False,
+                          greedy: bool = False, lns_budget: float = None,
+                          repair: bool = False, share_gyms: bool = False) -> bool:
+        """Génère le calendrier complet avec OR-Tools.
         
-        if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
-            
-            # Extraire les matchs programmés
-            self.matches = []
-            programmed_pairs = set()  # Pour identifier les matchs programmés
-            
-            for match_data in matches_data:
-                if solver.Value(match_data['var']) == 1:
-                    match = Match(
-                        id=f"match_{len(self.matches)}",
-                        equipe_domicile=match_data['home_team'],
-                        equipe_exterieur=match_data['away_team'],
-                        date=match_data['date'],
-                        time_slot=match_data['time_slot'],
-                        division=match_data['division']
-                    )
-                    self.matches.append(match)
-                    # Enregistrer la paire d'équipes programmée
-                    pair = tuple(sorted([match_data['home_team'].id, match_data['away_team'].id]))
-                    programmed_pairs.add((pair, match_data['division'].id))
+        Args:
+            decompose: Résoudre chaque division dans son propre modèle (pool de processus),
+                       puis réparer les conflits gymnase/effectif commun (voir decomposition.py).
+                       Ignoré en mode matchs prédéfinis.
+            max_workers: Nombre de processus du pool en mode décomposé (défaut: nombre de cœurs)
+            profile: Paramètres CP-SAT (voir solver_profiles.py), par défaut PROFILES['defaut']
+            portfolio: Lancer plusieurs variantes du profil en parallèle et garder la meilleure
+            checkpoint_file: Fichier de reprise où écrire chaque solution améliorante
+                             (résolution du modèle complet uniquement)
+            two_stage: Choisir d'abord la semaine et l'équipe qui reçoit, puis le créneau
+                       semaine par semaine (voir two_stage.py). Ignoré en mode matchs prédéfinis.
+            greedy: Calendrier glouton sans CP-SAT (aperçu en moins d'une seconde, voir
+                    greedy.py). Ignoré en mode matchs prédéfinis.
+            lns_budget: Améliorer ensuite le calendrier par LNS pendant lns_budget secondes
+                        (voir lns.py)
+            repair: Placer ensuite les matchs non programmés avec des relaxations contrôlées
+                    (voir repair_unscheduled.py). Ignoré en mode matchs prédéfinis.
+            share_gyms: En mode décomposé, résoudre ensemble les divisions qui reçoivent dans un
+                        même gymnase (moins de conflits de capacité à réparer, sous-modèles plus gros)
+        """
+        profile = profile or PROFILES['defaut']
+        if greedy and not self.predefined_matches:
+            with span('greedy'):
+                candidates = self.build_candidates()
+                selected_rows = greedy_schedule(self, candidates)
+        elif decompose and not self.predefined_matches:
+            with span('decomposition'):
+                candidates, selected_rows = solve_decomposed(self, max_workers=max_workers, profile=profile,
+                                                           share_gyms=share_gyms)
+            if selected_rows is None:
+                logger.warning("[ATTENTION] Réparation impossible, résolution du modèle complet")
+                return self.generate_schedule(max_workers=max_workers, profile=profile, portfolio=portfolio,
+                                              checkpoint_file=checkpoint_file, lns_budget=lns_budget,
+                                              repair=repair)
+        elif two_stage and not self.predefined_matches:
+            with span('two_stage'):
+                candidates, selected_rows = solve_two_stage(self, max_workers=max_workers, profile=profile)
+            if selected_rows is None:
+                logger.warning("[ATTENTION] Résolution en deux étapes impossible, résolution du modèle complet")
+                return self.generate_schedule(max_workers=max_workers, profile=profile, portfolio=portfolio,
+                                              checkpoint_file=checkpoint_file, lns_budget=lns_budget,
+                                              repair=repair)
+        elif portfolio:
+            with span('portfolio'):
+                candidates, selected_rows = solve_portfolio(self, portfolio_profiles(profile))
+            if selected_rows is None:
+                logger.error("\n[ÉCHEC] Impossible de trouver une solution (portfolio)")
+                return False
+        else:
+            with span('build_model'):
+                model, candidates, index = self.build_model()
             
-            # Créer les matchs non programmés (sans date)
-            self.unscheduled_matches = []
-            for match_info in self._all_matches_info:
-                pair = tuple(sorted([match_info['team1'].id, match_info['team2'].id]))
-                key = (pair, match_info['division'].id)
-                if key not in programmed_pairs:
-                    # Match non programmé - créer sans date
-                    # Déterminer qui reçoit (équipe avec créneaux prioritaire)
-                    if match_info['team1'].time_slots:
-                        home_team, away_team = match_info['team1'], match_info['team2']
-                    elif match_info['team2'].time_slots:
-                        home_team, away_team = match_info['team2'], match_info['team1']
-                    else:
-                        home_team, away_team = match_info['team1'], match_info['team2']
-                    
-                    match = Match(
-                        id=f"unscheduled_{len(self.unscheduled_matches)}",
-                        equipe_domicile=home_team,
-                        equipe_exterieur=away_team,
-                        date=None,  # Pas de date
-                        time_slot=None,  # Pas de créneau
-                        division=match_info['division']
-                    )
-                    self.unscheduled_matches.append(match)
+            # Résoudre (arrêt anticipé dès que tous les matchs programmables le sont)
+            solver = profile.create_solver()
+            if checkpoint_file:
+                callback = CheckpointCallback(len(index.by_match), profile.target_gap, candidates, checkpoint_file)
+            else:
+                callback = ObjectiveStopCallback(len(index.by_match), profile.target_gap)
             
-            print(f"[OK] {len(self.matches)} matchs programmés")
-            if self.unscheduled_matches:
-                print(f"[ATTENTION] {len(self.unscheduled_matches)} matchs non programmés (sans date)")
-            return True
+            # Ctrl-C pendant la résolution: CP-SAT s'arrête et retourne la meilleure solution
+            with span('solve'):
+                status = solver.Solve(model, callback)
+            logger.info(f"[INFO] Solver: {solver.StatusName(status)} en {solver.WallTime():.1f}s, {callback.summary()}")
+            current_report().record_result(status=solver.StatusName(status), objective_bound=callback.target,
+                                           objective=solver.ObjectiveValue(), solutions=callback.solutions,
+                                           wall_time=round(solver.WallTime(), 3))
+            if checkpoint_file and callback.checkpoints:
+                logger.info(f"[INFO] {callback.checkpoints} points de reprise écrits dans {checkpoint_file}")
+            if (status == cp_model.FEASIBLE and not callback.reached_target
+                    and solver.WallTime() < profile.max_time_in_seconds - 1):
+                logger.warning("[ATTENTION] Recherche interrompue avant la limite de temps: meilleure solution conservée")
             
-        else:
-            print(f"\n[ÉCHEC] Impossible de trouver une solution. Status: {solver.StatusName(status)}")
-            return False
+            if status != cp_model.OPTIMAL and status != cp_model.FEASIBLE:
+                logger.error(f"\n[ÉCHEC] Impossible de trouver une solution. Status: {solver.StatusName(status)}")
+                return False
+            selected_rows = candidates.selected_rows(solver)
+        
+        if lns_budget:
+            with span('lns'):
+                selected_rows, _ = improve_schedule(self, selected_rows, lns_budget, profile=profile)
+        
+        with span('extract_solution'):
+            self._extract_solution(candidates, selected_rows)
+        if repair and self.unscheduled_matches and not self.predefined_matches:
+            with span('repair_unscheduled'):
+                self.repair_unscheduled()
+        current_report().record_result(matches=len(self.matches), unscheduled=len(self.unscheduled_matches))
+        
+        logger.info(f"[OK] {len(self.matches)} matchs programmés")
+        if self.unscheduled_matches:
+            logger.warning(f"[ATTENTION] {len(self.unscheduled_matches)} matchs non programmés (sans date)")
+        return True
+    
+    def _extract_solution(self, candidates: CandidateTable, selected_rows: np.ndarray) -> None:
+        """Construit self.matches et self.unscheduled_matches à partir des lignes retenues."""
+        # Extraire les matchs programmés
+        self.matches = []
+        for row in selected_rows.tolist():
+            match_info = self._all_matches_info[candidates.match_id[row]]
+            match = Match(
+                id=f"match_{len(self.matches)}",
+                equipe_domicile=candidates.teams[candidates.home[row]],
+                equipe_exterieur=candidates.teams[candidates.away[row]],
+                date=candidates.dates[candidates.date_idx[row]],
+                time_slot=candidates.slots[candidates.slot[row]],
+                division=match_info['division']
+            )
+            self.matches.append(match)
+        
+        # Identifier les matchs programmés
+        programmed_ids = set(candidates.match_id[selected_rows].tolist())
+        
+        # Créer les matchs non programmés (sans date)
+        self.unscheduled_matches = []
+        for mid, match_info in enumerate(self._all_matches_info):
+            if mid not in programmed_ids:
+                # Match non programmé - créer sans date
+                # Déterminer qui reçoit (équipe avec créneaux prioritaire)
+                if match_info['team1'].time_slots:
+                    home_team, away_team = match_info['team1'], match_info['team2']
+                elif match_info['team2'].time_slots:
+                    home_team, away_team = match_info['team2'], match_info['team1']
+                else:
+                    home_team, away_team = match_info['team1'], match_info['team2']
+                
+                match = Match(
+                    id=f"unscheduled_{len(self.unscheduled_matches)}",
+                    equipe_domicile=home_team,
+                    equipe_exterieur=away_team,
+                    date=None,  # Pas de date
+                    time_slot=None,  # Pas de créneau
+                    division=match_info['division']
+                )
+                self.unscheduled_matches.append(match)
+    
+    def repair_unscheduled(self, relaxations: RepairRelaxations = None) -> int:
+        """Place les matchs non programmés, le reste du calendrier étant fixé.
+        
+        Args:
+            relaxations: Relaxations autorisées (second match dans la semaine, créneaux du
+                         club, gymnases voisins), par défaut toutes
+        
+        Returns:
+            Nombre de matchs placés
+        """
+        placements = place_unscheduled(self, relaxations)
+        for placement in placements:
+            unscheduled = self.unscheduled_matches[placement.unscheduled_index]
+            self.matches.append(Match(
+                id=f"match_{len(self.matches)}",
+                equipe_domicile=placement.home,
+                equipe_exterieur=placement.away,
+                date=placement.date,
+                time_slot=placement.time_slot,
+                division=unscheduled.division
+            ))
+            relaxations_str = ", ".join(placement.relaxations) if placement.relaxations else "sans relaxation"
+            logger.debug(f"       - {placement.home.nom} vs {placement.away.nom} le {placement.date}: {relaxations_str}")
+        
+        placed = {placement.unscheduled_index for placement in placements}
+        self.unscheduled_matches = [match for i, match in enumerate(self.unscheduled_matches) if i not in placed]
+        return len(placements)
     
     def print_schedule(self):
         """Affiche le calendrier généré."""
         if not self.matches:
-            print("[INFO] Aucun match programmé")
+            logger.info("[INFO] Aucun match programmé")
             return
         
-        print("\n" + "="*80)
-        print("CALENDRIER")
-        print("="*80)
-        
-        sorted_matches = sorted(self.matches, key=lambda m: (m.date, m.time_slot.heure_debut))
-        current_date = None
-        
-        for match in sorted_matches:
-            if current_date != match.date:
-                current_date = match.date
-                day_name = ['Lundi', 'Mardi', 'Mercredi', 'Jeudi', 'Vendredi', 'Samedi', 'Dimanche'][match.date.weekday()]
-                print(f"\n{day_name} {match.date.strftime('%d/%m/%Y')}")
-                print("-" * 50)
+        # Calendrier match par match: niveau DEBUG (affiché en mode verbose)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("\n" + "="*80)
+            logger.debug("CALENDRIER")
+            logger.debug("="*80)
+            
+            sorted_matches = sorted(self.matches, key=lambda m: (m.date, m.time_slot.heure_debut))
+            current_date = None
             
-            print(f"  {match.time_slot.heure_debut.strftime('%H:%M')} | {match.division.nom}")
-            print(f"    {match.equipe_domicile.nom} vs {match.equipe_exterieur.nom}")
+            for match in sorted_matches:
+                if current_date != match.date:
+                    current_date = match.date
+                    day_name = ['Lundi', 'Mardi', 'Mercredi', 'Jeudi', 'Vendredi', 'Samedi', 'Dimanche'][match.date.weekday()]
+                    logger.debug(f"\n{day_name} {match.date.strftime('%d/%m/%Y')}")
+                    logger.debug("-" * 50)
+                
+                logger.debug(f"  {match.time_slot.heure_debut.strftime('%H:%M')} | {match.division.nom}")
+                logger.debug(f"    {match.equipe_domicile.nom} vs {match.equipe_exterieur.nom}")
         
         self._print_statistics()
     
@@ -777,12 +884,12 @@ class UfolepMySQLScheduler:
             div_name = match.division.nom
             matches_by_division[div_name] = matches_by_division.get(div_name, 0) + 1
         
-        print("\n" + "="*80)
-        print("MATCHS PAR DIVISION")
-        print("="*80)
+        logger.info("\n" + "="*80)
+        logger.info("MATCHS PAR DIVISION")
+        logger.info("="*80)
         for div_name, count in sorted(matches_by_division.items()):
-            print(f"  {div_name}: {count} matchs")
-        print(f"\nTotal: {len(self.matches)} matchs programmés")
+            logger.info(f"  {div_name}: {count} matchs")
+        logger.info(f"\nTotal: {len(self.matches)} matchs programmés")
         
         # Stats par équipe (dom/ext)
         team_stats = {}
@@ -798,14 +905,14 @@ class UfolepMySQLScheduler:
             team_stats[home_name]['dom'] += 1
             team_stats[away_name]['ext'] += 1
         
-        print("\n" + "="*80)
-        print("RÉCEPTIONS / DÉPLACEMENTS PAR ÉQUIPE")
-        print("="*80)
-        print(f"{'Équipe':<30} | {'Dom':>3} | {'Ext':>3} | {'Total':>5}")
-        print("-" * 50)
+        logger.debug("\n" + "="*80)
+        logger.debug("RÉCEPTIONS / DÉPLACEMENTS PAR ÉQUIPE")
+        logger.debug("="*80)
+        logger.debug(f"{'Équipe':<30} | {'Dom':>3} | {'Ext':>3} | {'Total':>5}")
+        logger.debug("-" * 50)
         for team_name, stats in sorted(team_stats.items()):
             total = stats['dom'] + stats['ext']
-            print(f"{team_name:<30} | {stats['dom']:>3} | {stats['ext']:>3} | {total:>5}")
+            logger.debug(f"{team_name:<30} | {stats['dom']:>3} | {stats['ext']:>3} | {total:>5}")
     
     def validate_gymnasium_capacity(self) -> bool:
         """Valide que la contrainte de capacité des gymnases est respectée."""
@@ -821,7 +928,7 @@ class UfolepMySQLScheduler:
                 violations += 1
         
         if violations:
-            print(f"\n[ERREUR] {violations} violations de capacité gymnase")
+            logger.error(f"\n[ERREUR] {violations} violations de capacité gymnase")
         return violations == 0
     
     def validate_home_balance(self):
@@ -838,14 +945,14 @@ class UfolepMySQLScheduler:
                         and team_stats[tid]['home'] < team_stats[tid]['away'] - 1)
         
         if violations:
-            print(f"\n[ATTENTION] {violations} équipes avec déséquilibre dom/ext")
+            logger.warning(f"\n[ATTENTION] {violations} équipes avec déséquilibre dom/ext")
 
     def validate_club_capacity(self) -> tuple[bool, set]:
         """Valide que chaque club respecte la règle: nb_équipes <= 2 x nb_terrains_semaine.
         Retourne (all_valid, valid_club_ids)"""
-        print("\n" + "="*80)
-        print("VALIDATION DES CONTRAINTES CLUBS (DONNÉES D'ENTRÉE)")
-        print("="*80)
+        logger.info("\n" + "="*80)
+        logger.info("VALIDATION DES CONTRAINTES CLUBS (DONNÉES D'ENTRÉE)")
+        logger.info("="*80)
         
         violations = []
         club_stats = {}
@@ -857,7 +964,7 @@ class UfolepMySQLScheduler:
             club_name = club_data.nom
             
             # Compter les équipes du club (dans les divisions retenues)
-            club_teams = [team for team in self.teams if team.club_id == club_id]
+            club_teams = self.teams_by_club.get(club_id, [])
             nb_equipes = len(club_teams)
             
             # Calculer la capacité théorique du club
@@ -908,47 +1015,47 @@ class UfolepMySQLScheduler:
         
         # Rapport de validation
         if violations:
-            print(f"[WARNING] VIOLATIONS DETECTEES: {len(violations)} clubs en surcharge")
-            print(f"[OK] CLUBS CONFORMES: {len(valid_club_ids)} clubs respectent les contraintes")
-            print("\nDétail des violations:")
+            logger.warning(f"[WARNING] VIOLATIONS DETECTEES: {len(violations)} clubs en surcharge")
+            logger.info(f"[OK] CLUBS CONFORMES: {len(valid_club_ids)} clubs respectent les contraintes")
+            logger.info("\nDétail des violations:")
             
             for i, club_info in enumerate(violations, 1):
-                print(f"\n{i}. Club: {club_info['nom']} (IGNORÉ)")
-                print(f"   Équipes inscrites: {club_info['nb_equipes']}")
-                print(f"   Capacité autorisée: {club_info['max_autorise']} équipes")
-                print(f"   DÉPASSEMENT: +{club_info['nb_equipes'] - club_info['max_autorise']} équipes")
-                print(f"   Terrains x créneaux/semaine: {club_info['terrains_semaine']}")
+                logger.debug(f"\n{i}. Club: {club_info['nom']} (IGNORÉ)")
+                logger.debug(f"   Équipes inscrites: {club_info['nb_equipes']}")
+                logger.debug(f"   Capacité autorisée: {club_info['max_autorise']} équipes")
+                logger.debug(f"   DÉPASSEMENT: +{club_info['nb_equipes'] - club_info['max_autorise']} équipes")
+                logger.debug(f"   Terrains x créneaux/semaine: {club_info['terrains_semaine']}")
                 
-                print("   Gymnases utilisés:")
+                logger.debug("   Gymnases utilisés:")
                 for gym_id, gym_info in club_info['gymnases'].items():
                     nb_creneaux = len(gym_info['creneaux_semaine'])
                     capacite_gym = gym_info['nb_terrains'] * nb_creneaux
-                    print(f"     - {gym_info['nom']}: {gym_info['nb_terrains']} terrains x {nb_creneaux} créneaux = {capacite_gym}")
+                    logger.debug(f"     - {gym_info['nom']}: {gym_info['nb_terrains']} terrains x {nb_creneaux} créneaux = {capacite_gym}")
                 
-                print("   Équipes IGNORÉES:")
+                logger.debug("   Équipes IGNORÉES:")
                 for team in club_info['teams']:
-                    print(f"     - {team.nom} (Division {team.division_id})")
+                    logger.debug(f"     - {team.nom} (Division {team.division_id})")
             
-            print("\n[INFO] STRATEGIE: Generation du calendrier avec les clubs conformes uniquement.")
-            print(f"   - Clubs inclus: {len(valid_club_ids)}")
-            print(f"   - Clubs ignorés: {len(violations)}")
+            logger.info("\n[INFO] STRATEGIE: Generation du calendrier avec les clubs conformes uniquement.")
+            logger.info(f"   - Clubs inclus: {len(valid_club_ids)}")
+            logger.info(f"   - Clubs ignorés: {len(violations)}")
             
             return False, valid_club_ids
         else:
-            print("[OK] TOUTES LES CONTRAINTES CLUBS RESPECTEES")
-            print("Aucune surcharge détectée.")
+            logger.info("[OK] TOUTES LES CONTRAINTES CLUBS RESPECTEES")
+            logger.info("Aucune surcharge détectée.")
             
             # Statistiques des clubs
-            print("\nStatistiques des clubs:")
+            logger.info("\nStatistiques des clubs:")
             sorted_clubs = sorted(club_stats.items(), 
                                 key=lambda x: x[1]['nb_equipes'], reverse=True)
             
-            print("\nTop clubs par nombre d'équipes:")
+            logger.info("\nTop clubs par nombre d'équipes:")
             for club_id, stats in sorted_clubs[:10]:
                 if stats['nb_equipes'] > 0:
                     utilization = (stats['nb_equipes'] / stats['max_autorise']) * 100 if stats['max_autorise'] > 0 else 0
-                    print(f"  {stats['nom']}: {stats['nb_equipes']}/{stats['max_autorise']} équipes "
-                          f"({utilization:.1f}% de la capacité)")
+                    logger.info(f"  {stats['nom']}: {stats['nb_equipes']}/{stats['max_autorise']} équipes "
+                                f"({utilization:.1f}% de la capacité)")
             
             return True, valid_club_ids
     
@@ -981,17 +1088,17 @@ class UfolepMySQLScheduler:
             cursor.close()
             connection.close()
             
-            print(f"[INFO] {deleted_count} matchs existants supprimés de la base de données")
+            logger.info(f"[INFO] {deleted_count} matchs existants supprimés de la base de données")
             return True
             
         except mysql.connector.Error as e:
-            print(f"[ERREUR] Impossible de supprimer les matchs existants: {e}")
+            logger.error(f"[ERREUR] Impossible de supprimer les matchs existants: {e}")
             return False
     
     def save_matches_to_database(self) -> bool:
         """Sauvegarde tous les matchs générés dans la base de données."""
         if not self.matches:
-            print("[INFO] Aucun match à sauvegarder")
+            logger.info("[INFO] Aucun match à sauvegarder")
             return True
             
         try:
@@ -1040,18 +1147,18 @@ class UfolepMySQLScheduler:
             cursor.close()
             connection.close()
             
-            print(f"[SUCCÈS] {inserted_count} matchs sauvegardés dans la base de données")
+            logger.info(f"[SUCCÈS] {inserted_count} matchs sauvegardés dans la base de données")
             return True
             
         except mysql.connector.Error as e:
-            print(f"[ERREUR] Impossible de sauvegarder les matchs: {e}")
+            logger.error(f"[ERREUR] Impossible de sauvegarder les matchs: {e}")
             return False
     
     def save_schedule_to_database(self) -> bool:
         """Sauvegarde complète: supprime les anciens matchs et insère les nouveaux."""
-        print("\n" + "="*60)
-        print("SAUVEGARDE DU CALENDRIER EN BASE DE DONNÉES")
-        print("="*60)
+        logger.info("\n" + "="*60)
+        logger.info("SAUVEGARDE DU CALENDRIER EN BASE DE DONNÉES")
+        logger.info("="*60)
         
         # Étape 1: Supprimer les matchs existants
         if not self.clear_existing_matches():
@@ -1061,7 +1168,7 @@ class UfolepMySQLScheduler:
         if not self.save_matches_to_database():
             return False
         
-        print("[SUCCÈS] Calendrier sauvegardé avec succès dans la base MySQL!")
+        logger.info("[SUCCÈS] Calendrier sauvegardé avec succès dans la base MySQL!")
         return True
     
     def generate_sql_file(self, filename: str = "insert_matches.sql", filter_competition: str = None) -> bool:
@@ -1080,7 +1187,7 @@ class UfolepMySQLScheduler:
             competition_codes_for_delete = self.competition_codes
         
         if not matches_to_export:
-            print("[ERREUR] Aucun match à exporter")
+            logger.error("[ERREUR] Aucun match à exporter")
             return False
         
         try:
@@ -1166,30 +1273,57 @@ class UfolepMySQLScheduler:
                 for div, count in sorted(divisions_count.items()):
                     f.write(f"-- Division {div}: {count} matchs\n")
             
-            print(f"[SUCCES] Fichier SQL genere: {filename}")
-            print(f"[INFO] Ce fichier utilise exactement la même logique que la sauvegarde directe")
-            print(f"[INFO] Vous pouvez maintenant:")
-            print(f"[INFO] 1. Ouvrir phpMyAdmin")
-            print(f"[INFO] 2. Sélectionner votre base de données")
-            print(f"[INFO] 3. Aller dans l'onglet 'SQL'")
-            print(f"[INFO] 4. Copier-coller le contenu de {filename}")
-            print(f"[INFO] 5. Exécuter la requête")
+            logger.info(f"[SUCCES] Fichier SQL genere: {filename}")
+            logger.info(f"[INFO] Ce fichier utilise exactement la même logique que la sauvegarde directe")
+            logger.info(f"[INFO] Vous pouvez maintenant:")
+            logger.info(f"[INFO] 1. Ouvrir phpMyAdmin")
+            logger.info(f"[INFO] 2. Sélectionner votre base de données")
+            logger.info(f"[INFO] 3. Aller dans l'onglet 'SQL'")
+            logger.info(f"[INFO] 4. Copier-coller le contenu de {filename}")
+            logger.info(f"[INFO] 5. Exécuter la requête")
             return True
             
         except Exception as e:
-            print(f"[ERREUR] Impossible de générer le fichier SQL: {e}")
+            logger.error(f"[ERREUR] Impossible de générer le fichier SQL: {e}")
             return False
 
-def main(competition_codes: List[str] = None):
+def main(competition_codes: List[str] = None, decompose: bool = False,
+         profile: SolverProfile = None, portfolio: bool = False,
+         warm_start: bool = False, warm_start_file: str = None,
+         checkpoint: bool = False, resume: bool = False,
+         use_model_cache: bool = False, export_model_file: str = None,
+         two_stage: bool = False, greedy: bool = False, greedy_hints: bool = False,
+         lns_budget: float = None, repair: bool = False, share_gyms: bool = False,
+         cprofile: bool = False, trace_memory: bool = False,
+         verbose: bool = False, log_json: bool = False, data_source: DataSource = None):
     """Fonction principale.
     
     Args:
         competition_codes: Liste des codes de compétition (ex: ['c', 'kh'], ['m', 'f', 'mo'])
                           Par défaut: ['m', 'f', 'mo']
+        decompose: Résolution décomposée par division en parallèle (voir decomposition.py)
+        profile: Paramètres CP-SAT (voir solver_profiles.py)
+        portfolio: Course de plusieurs variantes du profil en parallèle
+        warm_start: Partir des matchs NOT_CONFIRMED déjà en BDD (indices du solver)
+        warm_start_file: Partir d'un fichier insert_matches_*.sql exporté précédemment
+        checkpoint: Écrire chaque solution améliorante dans checkpoint_<codes>.json
+        resume: Partir de la meilleure solution de checkpoint_<codes>.json
+        use_model_cache: Recharger le modèle depuis model_cache/ si les données n'ont pas changé
+        export_model_file: Exporter le modèle construit (réglage hors ligne du solver)
+        two_stage: Résolution en deux étapes semaine puis créneau (voir two_stage.py)
+        greedy: Aperçu glouton sans CP-SAT (voir greedy.py)
+        greedy_hints: Partir du calendrier glouton (indices du solver) à défaut d'un
+                      calendrier précédent
+        lns_budget: Temps d'amélioration LNS après la première résolution (secondes)
+        repair: Placer les matchs non programmés avec des relaxations (voir repair_unscheduled.py)
+        share_gyms: En mode décomposé, regrouper les divisions qui partagent un gymnase
+        cprofile: Profiler l'exécution avec cProfile (generation_<codes>_report.prof)
+        trace_memory: Mesurer le pic mémoire Python avec tracemalloc
+        verbose: Journaliser aussi le détail match par match (niveau DEBUG)
+        log_json: Écrire aussi les messages en JSON lines (generation_<codes>.jsonl)
+        data_source: Source des données (snapshot, SQLite); par défaut la base MySQL
     """
-    import sys
     import os
-    from io import StringIO
     
     codes = competition_codes or ['m', 'f', 'mo']
     
@@ -1197,75 +1331,90 @@ def main(competition_codes: List[str] = None):
     script_dir = os.path.dirname(os.path.abspath(__file__))
     codes_suffix = "_".join(codes)
     log_filename = os.path.join(script_dir, f"generation_{codes_suffix}.log")
+    report_filename = os.path.join(script_dir, f"generation_{codes_suffix}_report.json")
+    report = start_report(cprofile=cprofile, trace_memory=trace_memory)
     
-    # Classe pour dupliquer la sortie vers fichier et console
-    class TeeOutput:
-        def __init__(self, filename):
-            self.terminal = sys.stdout
-            self.log = open(filename, 'w', encoding='utf-8')
-        def write(self, message):
-            self.terminal.write(message)
-            self.log.write(message)
-        def flush(self):
-            self.terminal.flush()
-            self.log.flush()
-        def close(self):
-            self.log.close()
+    json_filename = os.path.join(script_dir, f"generation_{codes_suffix}.jsonl") if log_json else None
+    setup_logging(log_filename, verbose=verbose, json_filename=json_filename)
     
-    tee = TeeOutput(log_filename)
-    sys.stdout = tee
+    logger.info("GÉNÉRATEUR DE CALENDRIER UFOLEP - VERSION MYSQL FINALE")
+    logger.info(f"Compétitions: {codes}")
+    logger.info(f"Fichier log: {log_filename}")
+    logger.info("="*60)
     
-    print("GÉNÉRATEUR DE CALENDRIER UFOLEP - VERSION MYSQL FINALE")
-    print(f"Compétitions: {codes}")
-    print(f"Fichier log: {log_filename}")
-    print("="*60)
-    
-    scheduler = UfolepMySQLScheduler(codes)
+    scheduler = UfolepMySQLScheduler(codes, data_source=data_source)
+    if use_model_cache:
+        scheduler.model_cache_dir = os.path.join(script_dir, "model_cache")
+    scheduler.model_export_file = export_model_file
     
     # Charger les données
-    if not scheduler.load_data():
+    with span('load_data'):
+        loaded = scheduler.load_data()
+    if not loaded:
+        report.write(report_filename)
+        shutdown_logging()
         return
     
+    # Fichier de reprise (solutions améliorantes d'une exécution précédente)
+    checkpoint_file = os.path.join(script_dir, f"checkpoint_{codes_suffix}.json")
+    
+    # Calendrier précédent (avant tout remplacement des matchs NOT_CONFIRMED)
+    with span('warm_start'):
+        if resume and os.path.exists(checkpoint_file):
+            scheduler.previous_matches = parse_checkpoint_file(checkpoint_file)
+        elif warm_start_file:
+            scheduler.previous_matches = parse_sql_file(warm_start_file)
+        elif warm_start:
+            scheduler.previous_matches = load_previous_matches(codes)
+        elif greedy_hints and not greedy:
+            scheduler.previous_matches = greedy_matches(scheduler)
+    
     # Afficher les équipes sans créneaux de réception (info seulement, pas de filtrage)
     teams_with_reception = [t for t in scheduler.teams if t.time_slots]
     teams_without_reception = [t for t in scheduler.teams if not t.time_slots]
     
-    print(f"\n[INFO] ANALYSE DES CRÉNEAUX:")
-    print(f"   - Équipes avec créneaux de réception: {len(teams_with_reception)}")
-    print(f"   - Équipes sans créneaux (joueront toujours à l'extérieur): {len(teams_without_reception)}")
+    logger.info(f"\n[INFO] ANALYSE DES CRÉNEAUX:")
+    logger.info(f"   - Équipes avec créneaux de réception: {len(teams_with_reception)}")
+    logger.info(f"   - Équipes sans créneaux (joueront toujours à l'extérieur): {len(teams_without_reception)}")
     
     if teams_without_reception:
-        print("\n[INFO] ÉQUIPES SANS CRÉNEAUX:")
+        logger.info("\n[INFO] ÉQUIPES SANS CRÉNEAUX:")
         for team in teams_without_reception:
-            print(f"   - {team.nom} (Division {team.division_id})")
+            logger.debug(f"   - {team.nom} (Division {team.division_id})")
     
     # # Validation des données d'entrée (contraintes clubs)
     # all_clubs_valid, valid_club_ids = scheduler.validate_club_capacity()
     #
     # if not all_clubs_valid:
-    #     print("\n[WARNING] CLUBS NON-CONFORMES DETECTES: Filtrage en cours...")
+    #     logger.warning("\n[WARNING] CLUBS NON-CONFORMES DETECTES: Filtrage en cours...")
     #     scheduler.filter_teams_by_valid_clubs(valid_club_ids)
     #
     #     if len(scheduler.teams) == 0:
-    #         print("\n[ERROR] ERREUR: Aucune equipe restante apres filtrage!")
-    #         print("Tous les clubs ont des violations. Impossible de générer un calendrier.")
+    #         logger.error("\n[ERROR] ERREUR: Aucune equipe restante apres filtrage!")
+    #         logger.error("Tous les clubs ont des violations. Impossible de générer un calendrier.")
     #         return
     #
-    #     print(f"\n[OK] FILTRAGE TERMINE: Generation avec {len(scheduler.teams)} equipes conformes.")
+    #     logger.info(f"\n[OK] FILTRAGE TERMINE: Generation avec {len(scheduler.teams)} equipes conformes.")
     
     # Générer le calendrier
-    if scheduler.generate_schedule():
+    with span('generate_schedule'):
+        generated = scheduler.generate_schedule(decompose=decompose, profile=profile, portfolio=portfolio,
+                                                checkpoint_file=checkpoint_file if checkpoint else None,
+                                                two_stage=two_stage, greedy=greedy, lns_budget=lns_budget,
+                                                repair=repair, share_gyms=share_gyms)
+    if generated:
         scheduler.print_schedule()
         
-        # Validation des contraintes gymnases
-        scheduler.validate_gymnasium_capacity()
-        
-        # Validation de l'équilibre dom/ext
-        scheduler.validate_home_balance()
+        with span('validation'):
+            # Validation des contraintes gymnases
+            scheduler.validate_gymnasium_capacity()
+            
+            # Validation de l'équilibre dom/ext
+            scheduler.validate_home_balance()
         
         # Génération automatique du fichier SQL
-        print("\n" + "="*60)
-        print("GÉNÉRATION DU FICHIER SQL...")
+        logger.info("\n" + "="*60)
+        logger.info("GÉNÉRATION DU FICHIER SQL...")
         
         # Nom de fichier basé sur les compétitions (dans le même dossier que le script)
         import os
@@ -1273,21 +1422,24 @@ def main(competition_codes: List[str] = None):
         codes_suffix = "_".join(codes)
         filename = os.path.join(script_dir, f"insert_matches_{codes_suffix}.sql")
         
-        if scheduler.generate_sql_file(filename):
-            print("\n[OK] FICHIER SQL GENERE AVEC SUCCES!")
-            print(f"Fichier: {filename}")
+        with span('generate_sql_file'):
+            sql_generated = scheduler.generate_sql_file(filename)
+        if sql_generated:
+            logger.info("\n[OK] FICHIER SQL GENERE AVEC SUCCES!")
+            logger.info(f"Fichier: {filename}")
             if hasattr(scheduler, 'unscheduled_matches') and scheduler.unscheduled_matches:
-                print(f"[ATTENTION] {len(scheduler.unscheduled_matches)} matchs non programmes inclus (sans date)")
-            print("Vous pouvez maintenant l'utiliser dans phpMyAdmin.")
+                logger.warning(f"[ATTENTION] {len(scheduler.unscheduled_matches)} matchs non programmes inclus (sans date)")
+            logger.info("Vous pouvez maintenant l'utiliser dans phpMyAdmin.")
         else:
-            print("\n[ERREUR] Impossible de generer le fichier SQL.")
+            logger.error("\n[ERREUR] Impossible de generer le fichier SQL.")
     else:
-        print("[ERREUR] Échec de la génération du calendrier")
+        logger.error("[ERREUR] Échec de la génération du calendrier")
+    
+    report.write(report_filename)
     
     # Fermer le fichier de log
-    sys.stdout = tee.terminal
-    tee.close()
-    print(f"\n[INFO] Log sauvegardé dans: {log_filename}")
+    logger.info(f"\n[INFO] Log sauvegardé dans: {log_filename}")
+    shutdown_logging()
 
 if __name__ == "__main__":
     main()
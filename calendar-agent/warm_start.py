@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+Démarrage à chaud du scheduler à partir d'un calendrier précédent.
+
+Le calendrier précédent (matchs NOT_CONFIRMED en BDD, fichier insert_matches_*.sql exporté
+par generate_sql_file, ou fichier de reprise écrit par CheckpointCallback) est transmis à
+CP-SAT sous forme d'indices (hints) sur les variables des candidats correspondants: une
+re-génération après une petite modification des données converge plus vite et reste
+proche du calendrier déjà diffusé aux clubs.
+"""
+
+import json
+import logging
+import re
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import List, Optional
+
+import mysql.connector
+import numpy as np
+from ortools.sat.python import cp_model
+
+from candidates import CandidateTable
+from db_config import DB_CONFIG, TABLE_NAMES, COLUMN_MAPPING
+
+logger = logging.getLogger(__name__)
+
+# Ligne VALUES d'un match programmé dans un fichier généré par generate_sql_file
+_SQL_VALUES = re.compile(
+    r"\('([^']*)', '([^']*)', '([^']*)', '([^']*)', '([^']*)', '(\d{4}-\d{2}-\d{2})', '[A-Z_]+', '([^']*)'\)"
+)
+
+
+@dataclass
+class PreviousMatch:
+    """Match d'un calendrier précédent."""
+    id_equipe_dom: str
+    id_equipe_ext: str
+    date_reception: date
+    id_gymnasium: Optional[str]
+
+
+def load_previous_matches(competition_codes: List[str]) -> List[PreviousMatch]:
+    """Charge les matchs NOT_CONFIRMED datés des compétitions depuis la BDD."""
+    try:
+        connection = mysql.connector.connect(**DB_CONFIG)
+        cursor = connection.cursor(dictionary=True)
+
+        codes_str = ", ".join(f"'{c}'" for c in competition_codes)
+        query = f"""
+        SELECT
+            {COLUMN_MAPPING['matches']['id_equipe_dom']},
+            {COLUMN_MAPPING['matches']['id_equipe_ext']},
+            {COLUMN_MAPPING['matches']['date_reception']},
+            {COLUMN_MAPPING['matches']['id_gymnasium']}
+        FROM {TABLE_NAMES['matchs']}
+        WHERE {COLUMN_MAPPING['matches']['code_competition']} IN ({codes_str})
+        AND {COLUMN_MAPPING['matches']['match_status']} = 'NOT_CONFIRMED'
+        AND {COLUMN_MAPPING['matches']['date_reception']} IS NOT NULL
+        """
+
+        cursor.execute(query)
+        rows = cursor.fetchall()
+
+        matches = []
+        for row in rows:
+            date_val = row['date_reception']
+            if isinstance(date_val, datetime):
+                date_val = date_val.date()
+
+            matches.append(PreviousMatch(
+                id_equipe_dom=str(row['id_equipe_dom']),
+                id_equipe_ext=str(row['id_equipe_ext']),
+                date_reception=date_val,
+                id_gymnasium=str(row['id_gymnasium']) if row['id_gymnasium'] else None
+            ))
+
+        cursor.close()
+        connection.close()
+
+        logger.info(f"[OK] {len(matches)} matchs NOT_CONFIRMED chargés pour le démarrage à chaud")
+        return matches
+
+    except mysql.connector.Error as e:
+        logger.error(f"[ERREUR] Impossible de charger le calendrier précédent: {e}")
+        return []
+
+
+def parse_sql_file(filename: str) -> List[PreviousMatch]:
+    """Lit les matchs programmés d'un fichier insert_matches_*.sql (matchs sans date ignorés)."""
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except OSError as e:
+        logger.error(f"[ERREUR] Impossible de lire {filename}: {e}")
+        return []
+
+    matches = [
+        PreviousMatch(
+            id_equipe_dom=dom,
+            id_equipe_ext=ext,
+            date_reception=datetime.strptime(date_str, '%Y-%m-%d').date(),
+            id_gymnasium=gym or None
+        )
+        for code, comp, div, dom, ext, date_str, gym in _SQL_VALUES.findall(content)
+    ]
+    logger.info(f"[OK] {len(matches)} matchs lus depuis {filename} pour le démarrage à chaud")
+    return matches
+
+
+def parse_checkpoint_file(filename: str) -> List[PreviousMatch]:
+    """Lit la meilleure solution d'un fichier de reprise écrit par CheckpointCallback."""
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"[ERREUR] Impossible de lire le fichier de reprise {filename}: {e}")
+        return []
+
+    matches = [
+        PreviousMatch(
+            id_equipe_dom=dom,
+            id_equipe_ext=ext,
+            date_reception=date.fromisoformat(date_str),
+            id_gymnasium=gym
+        )
+        for dom, ext, date_str, gym in checkpoint['matches']
+    ]
+    logger.info(f"[OK] Reprise de {filename}: {len(matches)} matchs (objectif {checkpoint['objective']:.0f}, "
+                f"écrit le {checkpoint['written_at']})")
+    return matches
+
+
+def add_hints(model: cp_model.CpModel, candidates: CandidateTable, previous: List[PreviousMatch]) -> int:
+    """Ajoute un indice sur chaque variable: 1 pour le candidat du calendrier précédent, 0 sinon.
+
+    Le candidat retenu est celui de même (domicile, extérieur, date) dans le même gymnase,
+    ou à défaut le premier créneau de ce jour-là si le gymnase a changé.
+
+    Returns:
+        Nombre de matchs précédents retrouvés parmi les candidats
+    """
+    team_index = {team.id: i for i, team in enumerate(candidates.teams)}
+    date_index = {d: i for i, d in enumerate(candidates.dates)}
+
+    rows_by_key = {}
+    for row, key in enumerate(zip(candidates.home.tolist(), candidates.away.tolist(), candidates.date_idx.tolist())):
+        rows_by_key.setdefault(key, []).append(row)
+
+    hinted = np.zeros(len(candidates), dtype=bool)
+    found = 0
+    for match in previous:
+        key = (team_index.get(match.id_equipe_dom), team_index.get(match.id_equipe_ext),
+               date_index.get(match.date_reception))
+        rows = rows_by_key.get(key)
+        if not rows:
+            continue
+        same_gym = [row for row in rows if candidates.gym_ids[candidates.gym[row]] == match.id_gymnasium]
+        hinted[(same_gym or rows)[0]] = True
+        found += 1
+
+    for var, value in zip(candidates.vars_at(candidates.rows), hinted.tolist()):
+        model.AddHint(var, value)
+    return found
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+État partagé des processus de résolution (décomposition par division, portfolio).
+
+Le scheduler, sans sa source de données, est transmis une seule fois à chaque processus via
+l'initializer du pool; les tâches ne transmettent ensuite que leurs propres paramètres.
+"""
+
+import copy
+
+# Scheduler complet du processus courant (initialisé par init_worker)
+_worker_scheduler = None
+
+
+def picklable_scheduler(scheduler):
+    """Copie superficielle du scheduler sans sa source de données (transmissible au pool)."""
+    worker = copy.copy(scheduler)
+    worker.db_loader = copy.copy(scheduler.db_loader)
+    worker.db_loader.source = None
+    return worker
+
+
+def init_worker(scheduler) -> None:
+    """Initialise un processus du pool avec le scheduler complet."""
+    global _worker_scheduler
+    _worker_scheduler = scheduler
+
+
+def worker_scheduler():
+    """Scheduler transmis au processus courant par init_worker."""
+    return _worker_scheduler